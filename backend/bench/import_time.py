@@ -0,0 +1,111 @@
+"""
+Startup import-time benchmark.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the cumulative import cost of the target module plus the heaviest
+dependencies it pulls in. Use it to keep worker boot and test collection fast:
+
+    python -m backend.bench.import_time
+    python -m backend.bench.import_time --module backend.main --runs 5 --json
+    python -m backend.bench.import_time --max-ms 800   # non-zero exit if slower
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Modules that should only be imported on first use, never at startup
+LAZY_MODULES = ["google.genai", "groq", "bs4", "lxml", "requests", "numpy"]
+
+
+def _run_once(module: str) -> Dict[str, int]:
+    """Import `module` in a fresh interpreter; return cumulative microseconds per imported module."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(PROJECT_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative[parts[2].strip()] = int(parts[1].strip())
+        except ValueError:
+            continue
+    return cumulative
+
+
+def measure(module: str, runs: int = 3, top: int = 10) -> dict:
+    samples: List[Dict[str, int]] = [_run_once(module) for _ in range(runs)]
+    totals_ms = [s.get(module, 0) / 1000 for s in samples]
+
+    # Median cumulative time per dependency across runs
+    names = set().union(*samples)
+    per_module = {
+        name: statistics.median(s.get(name, 0) for s in samples) / 1000
+        for name in names
+    }
+    heaviest = sorted(
+        ((name, ms) for name, ms in per_module.items() if name != module and "." not in name),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals_ms), 2),
+        "min_ms": round(min(totals_ms), 2),
+        "max_ms": round(max(totals_ms), 2),
+        "heaviest_top_level": [{"module": name, "ms": round(ms, 2)} for name, ms in heaviest],
+        "eager_lazy_modules": sorted(name for name in LAZY_MODULES if name in names),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure startup import time of a backend module")
+    parser.add_argument("--module", default="backend.services.llm_service")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the median exceeds this")
+    args = parser.parse_args()
+
+    report = measure(args.module, args.runs, args.top)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"[Bench] import {report['module']}: median {report['median_ms']} ms "
+              f"(min {report['min_ms']}, max {report['max_ms']}, {report['runs']} runs)")
+        for entry in report["heaviest_top_level"]:
+            print(f"[Bench]   {entry['module']:<24} {entry['ms']:>9.2f} ms")
+        if report["eager_lazy_modules"]:
+            print(f"[Bench] Warning: imported eagerly: {', '.join(report['eager_lazy_modules'])}")
+
+    if args.max_ms is not None and report["median_ms"] > args.max_ms:
+        print(f"[Bench] FAILED: {report['median_ms']} ms exceeds budget of {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
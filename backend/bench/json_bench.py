@@ -0,0 +1,138 @@
+"""
+JSON serialization benchmark.
+
+Times the ways a curriculum response can become bytes, and the ways LLM
+output is parsed, on a representative DailyCurriculum:
+
+- fastapi:  what a `response_model` route does with the default JSONResponse
+            (dump, re-validate, serialize to a dict, then stdlib json.dumps)
+- orjson:   the same route with ORJSONResponse as the default response class
+- direct:   a route returning ORJSONResponse(model); pydantic-core writes bytes
+
+    python -m backend.bench.json_bench
+    python -m backend.bench.json_bench --runs 5 --number 2000 --json
+"""
+
+import argparse
+import json
+import statistics
+import timeit
+from typing import Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from ..models import Activity, DailyCurriculum, Resource, Sankalpa
+from ..util import fastjson
+from ..util.responses import ORJSONResponse
+
+CATEGORIES = ["MATH", "ART", "SPIRITUALITY", "BONDING"]
+
+
+def sample_curriculum() -> DailyCurriculum:
+    """A typical generated day: four activities with a few resources each."""
+    activities = []
+    for i, category in enumerate(CATEGORIES):
+        activities.append(Activity(
+            id=f"week12-{category.lower()}-{i}",
+            category=category,
+            title=f"{category.title()} practice for a calm afternoon",
+            description="A gentle activity to share with your baby. " * 4,
+            durationMinutes=15 + 5 * i,
+            content=("Sit comfortably, breathe slowly and follow along step by step. " * 12).strip(),
+            solution="Count the petals in pairs: 2, 4, 6, 8." if category == "MATH" else None,
+            resources=[
+                Resource(title=f"Guided video {j}", url=f"https://www.youtube.com/watch?v=vid{i}{j}abcde",
+                         description="A short guided session that matches today's theme.")
+                for j in range(3)
+            ],
+        ))
+    return DailyCurriculum(
+        sankalpa=Sankalpa(virtue="Patience", description="Today we practise patience with ourselves. " * 3,
+                          mantra="ॐ शान्तिः शान्तिः शान्तिः"),
+        activities=activities,
+    )
+
+
+def _drive(coro):
+    """Run a coroutine that never actually suspends, without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def serializers(curriculum: DailyCurriculum) -> Dict[str, Callable[[], bytes]]:
+    field = create_model_field(name="Response_get_curriculum", type_=DailyCurriculum, mode="serialization")
+
+    def route_content():
+        return _drive(serialize_response(field=field, response_content=curriculum))
+
+    return {
+        "fastapi": lambda: JSONResponse(route_content()).body,
+        "orjson": lambda: ORJSONResponse(route_content()).body,
+        "direct": lambda: ORJSONResponse(curriculum).body,
+    }
+
+
+def _time(fn: Callable, runs: int, number: int) -> float:
+    """Median microseconds per call."""
+    samples = timeit.repeat(fn, repeat=runs, number=number)
+    return statistics.median(samples) / number * 1e6
+
+
+def measure(runs: int = 5, number: int = 1000) -> dict:
+    curriculum = sample_curriculum()
+    encoders = serializers(curriculum)
+    bodies = {name: fn() for name, fn in encoders.items()}
+    for name, body in bodies.items():
+        if json.loads(body) != json.loads(bodies["fastapi"]):
+            raise AssertionError(f"{name} serializes the curriculum differently")
+    serialize_us = {name: round(_time(fn, runs, number), 2) for name, fn in encoders.items()}
+
+    # LLM output arrives pretty-printed text; the stdlib parses str, fastjson takes it as-is
+    llm_output = curriculum.model_dump_json(indent=2)
+    parse_us = {
+        "json.loads": round(_time(lambda: json.loads(llm_output), runs, number), 2),
+        "fastjson.loads": round(_time(lambda: fastjson.loads(llm_output), runs, number), 2),
+    }
+
+    baseline = serialize_us["fastapi"]
+    return {
+        "orjson_available": fastjson.HAS_ORJSON,
+        "response_bytes": len(bodies["direct"]),
+        "runs": runs,
+        "number": number,
+        "serialize_us": serialize_us,
+        "saved_per_response_us": {name: round(baseline - us, 2) for name, us in serialize_us.items() if name != "fastapi"},
+        "speedup": {name: round(baseline / us, 2) for name, us in serialize_us.items() if name != "fastapi"},
+        "parse_us": parse_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON serialization paths for a curriculum response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--number", type=int, default=1000, help="Calls per timing run")
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    args = parser.parse_args()
+
+    report = measure(args.runs, args.number)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    backend = "orjson" if report["orjson_available"] else "stdlib fallback"
+    print(f"[Bench] curriculum response: {report['response_bytes']} bytes, fastjson using {backend}")
+    for name, us in report["serialize_us"].items():
+        saved = report["saved_per_response_us"].get(name)
+        suffix = f"  saves {saved:.1f} us ({report['speedup'][name]}x)" if saved is not None else ""
+        print(f"[Bench]   {name:<8} {us:>9.2f} us/response{suffix}")
+    for name, us in report["parse_us"].items():
+        print(f"[Bench]   {name:<15} {us:>9.2f} us/parse")
+
+
+if __name__ == "__main__":
+    main()
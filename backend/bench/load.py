@@ -0,0 +1,848 @@
+"""
+End-to-end load test.
+
+Starts the real app (uvicorn, in a subprocess) against local stand-ins for
+Gemini, Groq and YouTube, drives a weighted mix of requests across the /api/*
+routes at each concurrency level of a sweep, and reports throughput and
+p50/p99 latency per route. Nothing leaves the machine, so runs cost no quota
+and can be compared across commits:
+
+    python -m backend.bench.load
+    python -m backend.bench.load --concurrency 1,8,32 --duration 20 --output load.json
+    python -m backend.bench.load --provider groq --gemini-latency 2.0 --error-rate 0.05
+    python -m backend.bench.load --mix curriculum=50,dad-joke=0 --json
+
+The stand-ins build their answers from the request itself:
+
+- structured output follows the responseSchema (or, for Groq, the JSON schema
+  in the system prompt); batched prompts get one entry per "- ID:" line and
+  names start with the requested letter
+- grounded searches link to article pages the stand-in serves, and YouTube
+  searches come back as grounding redirects to youtube.com watch URLs
+- YouTube results pages embed ytInitialData the way youtube.com does, and
+  oEmbed answers for any video
+
+Each service has its own latency (jittered +/-30%) and error rate; a share
+of errors can be quota errors (429) instead of 500s. The app is restarted for
+every concurrency level (unless --reuse-app) so each level starts cold, with
+empty caches, name/resource indexes, content store and no warm-restart snapshot.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import re
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# ============= Stand-in providers =============
+
+WORDS = ("calm breath gentle light growth love protection rhythm mantra nature peace "
+         "mother baby heart joy balance music story colour morning evening river").split()
+SYLLABLES = ["ra", "va", "sha", "ni", "ya", "dhi", "ka", "ma", "ti", "ru", "an", "esh", "ika", "av"]
+# Structured output field -> words of filler text
+TEXT_LENGTHS = {"title": 4, "virtue": 1, "mantra": 6, "origin": 1, "meaning": 4,
+                "description": 20, "content": 40, "interpretation": 60, "affirmation": 12}
+SCHEMA_MARKER = "Respond with a JSON object matching this JSON schema:\n"
+
+
+@dataclass
+class ServiceProfile:
+    latency: float  # seconds per call, jittered +/-30%
+    error_rate: float = 0.0
+    quota_share: float = 0.0  # fraction of errors that are quota errors (429)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count)).capitalize()
+
+
+def _video_id(seed: str) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(seed.encode("utf-8")).digest()).decode("ascii")
+    return digest[:11]
+
+
+def _name(rng: random.Random, letter: Optional[str]) -> str:
+    stem = "".join(rng.choice(SYLLABLES) for _ in range(2))
+    return (letter + stem if letter else stem).capitalize()
+
+
+class FakeContext:
+    """What the fake answer should respect: ids and starting letters asked for, list sizes."""
+
+    def __init__(self, rng: random.Random, prompt: str, base_url: str, defs: Optional[dict] = None):
+        self.rng = rng
+        self.base_url = base_url
+        self.defs = defs or {}
+        self.ids = re.findall(r"^- ID: (\S+)", prompt, re.MULTILINE)
+        self.letters = {}
+        for block in re.split(r"^- ID: ", prompt, flags=re.MULTILINE)[1:]:
+            match = re.search(r"start with the letter (\w+)", block)
+            self.letters[block.split(None, 1)[0]] = match.group(1) if match else None
+        match = re.search(r"starting letter is provided \((\w+)\)", prompt)
+        self.letter = match.group(1) if match and match.group(1) != "None" else None
+        match = re.search(r"(?:Generate|exactly) (\d+)", prompt)
+        self.count = int(match.group(1)) if match else 3
+
+    def for_id(self, item_id: str) -> "FakeContext":
+        item = FakeContext.__new__(FakeContext)
+        item.__dict__.update(self.__dict__, ids=[], letter=self.letters.get(item_id, self.letter), count=5)
+        return item
+
+
+def _deref(schema: dict, defs: dict) -> dict:
+    while isinstance(schema, dict) and "$ref" in schema:
+        schema = defs.get(schema["$ref"].rsplit("/", 1)[-1], {})
+    return schema
+
+
+def fake_from_schema(schema: dict, ctx: FakeContext, field: str = "") -> Any:
+    """A value matching a Gemini responseSchema (upper-case types) or a JSON schema ($defs/$ref/anyOf)."""
+    schema = _deref(schema, ctx.defs)
+    if "anyOf" in schema:
+        options = [_deref(option, ctx.defs) for option in schema["anyOf"]]
+        schema = next((o for o in options if str(o.get("type", "")).lower() != "null"), options[0])
+    if schema.get("enum"):
+        return ctx.rng.choice(schema["enum"])
+
+    kind = str(schema.get("type") or ("object" if "properties" in schema else "string")).lower()
+    rng = ctx.rng
+    if kind == "object":
+        return {key: fake_from_schema(sub, ctx, key) for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        item_schema = _deref(schema.get("items", {}), ctx.defs)
+        if ctx.ids and "id" in item_schema.get("properties", {}):
+            # One answer per batched request, keyed by its id
+            return [dict(fake_from_schema(item_schema, ctx.for_id(item_id)), id=item_id) for item_id in ctx.ids]
+        return [fake_from_schema(item_schema, ctx, field) for _ in range(ctx.count)]
+    if kind == "integer":
+        if field == "bpm":
+            return rng.randint(60, 120)
+        if field == "count":
+            return rng.choice([11, 21, 108])
+        return rng.randint(5, 30)
+    if kind == "number":
+        return round(rng.uniform(1, 10), 2)
+    if kind == "boolean":
+        return False
+
+    if field == "name":
+        return _name(rng, ctx.letter)
+    if field == "id":
+        return f"{rng.choice(WORDS)}_{rng.randint(100, 999)}"
+    if field == "url":
+        return f"{ctx.base_url}/articles/{rng.choice(WORDS)}-{rng.randint(1000, 9999)}"
+    if field == "duration":
+        return f"{rng.randint(2, 15):02d}:{rng.randint(0, 59):02d}"
+    if field == "jokes":
+        return f"Why did the {rng.choice(WORDS)} smile? It was {rng.choice(WORDS)} all along!"
+    return _words(rng, TEXT_LENGTHS.get(field, 8))
+
+
+def fake_unstructured(prompt: str, ctx: FakeContext) -> dict:
+    """JSON-mode answers without a schema (the streaming routes): the shape the prompt asks for."""
+    if "recorded this dream" in prompt:
+        return {"interpretation": _words(ctx.rng, 60), "affirmation": _words(ctx.rng, 12)}
+    if '"names"' in prompt:
+        return {"names": [{"name": _name(ctx.rng, ctx.letter), "meaning": _words(ctx.rng, 4),
+                           "origin": "Sanskrit", "significance": _words(ctx.rng, 10)} for _ in range(ctx.count)]}
+    return {"text": _words(ctx.rng, 40)}
+
+
+def _resource(ctx: FakeContext) -> dict:
+    return {"title": _words(ctx.rng, 4), "url": fake_from_schema({"type": "string"}, ctx, "url"),
+            "description": _words(ctx.rng, 12)}
+
+
+def fake_grounded(prompt: str, ctx: FakeContext) -> Tuple[str, List[dict]]:
+    """Text and grounding chunks for a Google Search grounded call."""
+    query = re.search(r'Search YouTube for: "([^"]*)"', prompt)
+    if query:
+        ids = [_video_id(f"{query.group(1)}:{i}") for i in range(3)]
+        text = "\n".join(f"URL: https://www.youtube.com/watch?v={video_id}\nTitle: {_words(ctx.rng, 5)}"
+                         for video_id in ids)
+        chunks = [{"web": {"uri": f"{ctx.base_url}/grounding-api-redirect/{video_id}", "title": "youtube.com"}}
+                  for video_id in ids]
+        return text, chunks
+    if ctx.ids:
+        needed = {item_id: int(n) for item_id, n in re.findall(r"^- ID: (\S+)(?:(?!^- ID:).)*?Needed: (\d+)",
+                                                              prompt, re.MULTILINE | re.DOTALL)}
+        data = {"activities": {item_id: [_resource(ctx) for _ in range(needed.get(item_id, 3))]
+                               for item_id in ctx.ids}}
+    elif "EXACTLY ONE" in prompt:
+        data = _resource(ctx)
+    else:
+        data = {"resources": [_resource(ctx) for _ in range(3)]}
+    # Grounded calls can't use JSON mode, and the model tends to fence its JSON
+    return f"```json\n{json.dumps(data)}\n```", []
+
+
+def _pcm_tone(seconds: float, rate: int = 24000) -> bytes:
+    samples = int(seconds * rate)
+    return b"".join(struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * i / rate))) for i in range(samples))
+
+
+def _png(size: int = 64) -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + bytes((200, 170, 220)) * size for _ in range(size))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+def youtube_results_page(query: str, count: int = 20, padding_kb: int = 300) -> bytes:
+    """A results page shaped like youtube.com's: a big head, then ytInitialData with videoRenderers."""
+    renderers = []
+    for i in range(count):
+        video_id = _video_id(f"{query}:{i}")
+        renderers.append({"videoRenderer": {
+            "videoId": video_id,
+            "title": {"runs": [{"text": f"{query} ({i + 1})"}]},
+            "ownerText": {"runs": [{"text": "Stand-in Channel"}]},
+            "lengthText": {"simpleText": f"{3 + i}:{(7 * i) % 60:02d}"},
+            "navigationEndpoint": {"commandMetadata": {"webCommandMetadata": {"url": f"/watch?v={video_id}"}}},
+        }})
+    data = {"contents": {"sectionListRenderer": {"contents": [{"itemSectionRenderer": {"contents": renderers}}]}}}
+    head = "<!DOCTYPE html><html><head><script>" + "/* player config */" * (padding_kb * 1024 // 19) + "</script>"
+    return f"{head}<script>var ytInitialData = {json.dumps(data)};</script></body></html>".encode("utf-8")
+
+
+class StandInServer:
+    """Gemini, Groq and YouTube stand-ins on one local port, with call counts per endpoint."""
+
+    def __init__(self, profiles: Dict[str, ServiceProfile], seed: int = 0, page_kb: int = 300):
+        self.profiles = profiles
+        self.page_kb = page_kb
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-ins", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self):
+        with self._lock:
+            self.calls, self.errors = {}, {}
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"calls": dict(sorted(self.calls.items())), "errors": dict(sorted(self.errors.items()))}
+
+    def rng(self) -> random.Random:
+        with self._lock:
+            return random.Random(self._rng.random())
+
+    def admit(self, service: str, endpoint: str) -> Tuple[float, Optional[str]]:
+        """Record a call; return its latency and the injected failure ("quota" / "error"), if any."""
+        profile = self.profiles[service]
+        with self._lock:
+            key = f"{service}:{endpoint}"
+            self.calls[key] = self.calls.get(key, 0) + 1
+            latency = profile.latency * self._rng.uniform(0.7, 1.3)
+            failure = None
+            if self._rng.random() < profile.error_rate:
+                failure = "quota" if self._rng.random() < profile.quota_share else "error"
+                self.errors[key] = self.errors.get(key, 0) + 1
+        return latency, failure
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0  # of the call being answered, spent before the response starts
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def standin(self) -> StandInServer:
+        return self.server.standin
+
+    # ----- plumbing -----
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("content-length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw else {}
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None):
+        time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Any):
+        self._send(status, json.dumps(data).encode("utf-8"))
+
+    def _stream(self, events: List[bytes]):
+        """Server-sent events: the first after ~30% of the latency, the rest spread over the remainder."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        time.sleep(self.latency * 0.3)
+        gap = self.latency * 0.7 / max(len(events), 1)
+        for i, event in enumerate(events):
+            if i:
+                time.sleep(gap)
+            self.wfile.write(event)
+            self.wfile.flush()
+
+    def _fail(self, service: str, failure: str):
+        if service == "groq":
+            status, message = (429, "Rate limit reached") if failure == "quota" else (500, "Internal server error")
+            self._send_json(status, {"error": {"message": message, "type": "stand_in",
+                                               "code": "rate_limit_exceeded" if status == 429 else "internal"}})
+        elif service == "gemini":
+            status, state = (429, "RESOURCE_EXHAUSTED") if failure == "quota" else (500, "INTERNAL")
+            self._send_json(status, {"error": {"code": status, "status": state,
+                                               "message": "Resource has been exhausted (e.g. check quota)."
+                                               if status == 429 else "Internal error encountered."}})
+        else:
+            self._send(500, b"stand-in error", "text/plain")
+
+    def _route(self) -> Optional[Tuple[str, str, Callable[[], None]]]:
+        path = urlparse(self.path).path
+        if path.startswith("/v1beta/"):
+            action = path.rsplit(":", 1)[-1] if ":" in path else path.split("/")[2]
+            return "gemini", action, lambda: self._gemini(path, action)
+        if path == "/openai/v1/chat/completions":
+            return "groq", "chat.completions", self._groq
+        if path == "/results":
+            return "youtube", "results", self._youtube_results
+        if path == "/oembed":
+            return "youtube", "oembed", self._oembed
+        if path.startswith("/grounding-api-redirect/"):
+            return "youtube", "grounding-redirect", self._grounding_redirect
+        if path.startswith("/articles/"):
+            return "youtube", "article", self._article
+        return None
+
+    def _handle(self):
+        route = self._route()
+        if route is None:
+            self._send_json(404, {"error": {"code": 404, "message": f"No stand-in for {self.path}"}})
+            return
+        service, endpoint, respond = route
+        self.latency, failure = self.standin.admit(service, endpoint)
+        if failure:
+            self.latency *= 0.3  # errors come back sooner than answers
+            self._fail(service, failure)
+            return
+        respond()
+
+    do_GET = do_HEAD = do_POST = do_DELETE = _handle
+
+    # ----- Gemini -----
+
+    def _gemini(self, path: str, action: str):
+        body = self._body() if self.command == "POST" else {}
+        rng = self.standin.rng()
+        if path.startswith("/v1beta/cachedContents"):
+            if self.command == "POST":
+                name = f"cachedContents/{hashlib.sha1(json.dumps(body).encode()).hexdigest()[:12]}"
+                self._send_json(200, {"name": name, "model": body.get("model"),
+                                      "expireTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 3600))})
+            else:
+                self._send_json(200, {})
+            return
+        if action == "predict":
+            image = base64.b64encode(_png()).decode("ascii")
+            self._send_json(200, {"predictions": [{"bytesBase64Encoded": image, "mimeType": "image/png"}]})
+            return
+
+        prompt = "\n".join(part.get("text", "") for content in body.get("contents", [])
+                           for part in content.get("parts", []))
+        config = body.get("generationConfig", {})
+        ctx = FakeContext(rng, prompt, self.standin.url)
+        usage = {"promptTokenCount": len(prompt) // 4}
+
+        if "AUDIO" in config.get("responseModalities", []):
+            audio = base64.b64encode(_pcm_tone(min(len(prompt) * 0.06, 20.0))).decode("ascii")
+            parts = [{"inlineData": {"mimeType": "audio/L16;codec=pcm;rate=24000", "data": audio}}]
+            self._send_json(200, {"candidates": [{"content": {"role": "model", "parts": parts}, "finishReason": "STOP"}],
+                                  "usageMetadata": usage})
+            return
+
+        chunks = []
+        if any("googleSearch" in tool for tool in body.get("tools", [])):
+            text, chunks = fake_grounded(prompt, ctx)
+        elif config.get("responseSchema") or config.get("responseJsonSchema"):
+            schema = config.get("responseSchema") or config.get("responseJsonSchema")
+            ctx.defs = schema.get("$defs", {})
+            text = json.dumps(fake_from_schema(schema, ctx))
+        elif config.get("responseMimeType") == "application/json":
+            text = json.dumps(fake_unstructured(prompt, ctx))
+        else:
+            text = _words(rng, 40)
+
+        usage.update(candidatesTokenCount=len(text) // 4, totalTokenCount=(len(prompt) + len(text)) // 4)
+        candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}
+        if chunks:
+            candidate["groundingMetadata"] = {"groundingChunks": chunks}
+        if action != "streamGenerateContent":
+            self._send_json(200, {"candidates": [candidate], "usageMetadata": usage, "modelVersion": path.split("/")[3]})
+            return
+
+        pieces = [text[i:i + 48] for i in range(0, len(text), 48)] or [""]
+        events = []
+        for i, piece in enumerate(pieces):
+            event = {"candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}]}
+            if i == len(pieces) - 1:
+                event["candidates"][0]["finishReason"] = "STOP"
+                event["usageMetadata"] = usage
+            events.append(f"data: {json.dumps(event)}\r\n\r\n".encode("utf-8"))
+        self._stream(events)
+
+    # ----- Groq (OpenAI-compatible) -----
+
+    def _groq(self):
+        body = self._body()
+        rng = self.standin.rng()
+        system = "\n".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "system")
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "user")
+        ctx = FakeContext(rng, prompt, self.standin.url)
+        if SCHEMA_MARKER in system:
+            schema = json.loads(system.split(SCHEMA_MARKER, 1)[1].split("\n", 1)[0])
+            ctx.defs = schema.get("$defs", {})
+            text = json.dumps(fake_from_schema(schema, ctx))
+        elif body.get("response_format", {}).get("type") == "json_object" or body.get("stream"):
+            text = json.dumps(fake_unstructured(prompt, ctx))
+        else:
+            text = _words(rng, 40)
+
+        completion_id = f"chatcmpl-{rng.getrandbits(48):012x}"
+        base = {"id": completion_id, "created": int(time.time()), "model": body.get("model", "stand-in")}
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4,
+                 "total_tokens": (len(prompt) + len(text)) // 4}
+        if not body.get("stream"):
+            self._send_json(200, {**base, "object": "chat.completion", "usage": usage, "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}]})
+            return
+
+        events = []
+        pieces = [text[i:i + 48] for i in range(0, len(text), 48)]
+        for piece in pieces:
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            events.append(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        final = {**base, "object": "chat.completion.chunk", "x_groq": {"usage": usage},
+                 "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        events.append(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+        events.append(b"data: [DONE]\n\n")
+        self._stream(events)
+
+    # ----- YouTube and the web -----
+
+    def _youtube_results(self):
+        query = parse_qs(urlparse(self.path).query).get("search_query", [""])[0]
+        self._send(200, youtube_results_page(query, padding_kb=self.standin.page_kb), "text/html; charset=utf-8")
+
+    def _oembed(self):
+        video_url = parse_qs(urlparse(self.path).query).get("url", [""])[0]
+        self._send_json(200, {"type": "video", "title": f"Stand-in video {video_url[-11:]}",
+                              "author_name": "Stand-in Channel", "provider_name": "YouTube"})
+
+    def _grounding_redirect(self):
+        video_id = urlparse(self.path).path.rsplit("/", 1)[-1]
+        self._send(302, b"", "text/html", {"Location": f"https://www.youtube.com/watch?v={video_id}"})
+
+    def _article(self):
+        title = urlparse(self.path).path.rsplit("/", 1)[-1]
+        self._send(200, f"<html><head><title>{title}</title></head><body>{'<p>Lorem ipsum.</p>' * 200}</body></html>"
+                   .encode("utf-8"), "text/html; charset=utf-8")
+
+
+# ============= The app under test =============
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class AppProcess:
+    """The real app under uvicorn, wired to the stand-ins and to throwaway data files."""
+
+    def __init__(self, standin_url: str, provider: str, workers: int = 1, extra_env: Optional[Dict[str, str]] = None):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._dir = tempfile.TemporaryDirectory(prefix="garbhveda-load-")
+        data = Path(self._dir.name)
+        (data / "config.json").write_text(json.dumps({"model_provider": provider}))
+        self.log_path = data / "app.log"
+        self.env = dict(os.environ)
+        self.env.update({
+            "PYTHONPATH": str(PROJECT_ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""),
+            "NO_PROXY": "127.0.0.1,localhost",
+            "VITE_GEMINI_API_KEY": "stand-in",
+            "GROQ_API_KEY": "stand-in",
+            "GOOGLE_GEMINI_BASE_URL": standin_url,
+            "GROQ_BASE_URL": standin_url,
+            "YOUTUBE_BASE_URL": standin_url,
+            "GARBHVEDA_CONFIG_FILE": str(data / "config.json"),
+            "GARBHVEDA_NAME_INDEX": str(data / "name_index.json"),
+            "GARBHVEDA_RESOURCE_INDEX": str(data / "resource_index.json"),
+            "GARBHVEDA_CONTENT_STORE": str(data / "content_store.json"),
+            "GARBHVEDA_CACHE_BACKEND": "memory",
+            # Written on shutdown but never shared between apps, so every level starts cold
+            "GARBHVEDA_SNAPSHOT_PATH": str(data / "warm_snapshot.bin"),
+        })
+        for name in ("API_ACCESS_KEY", "TENANT_API_KEYS"):
+            self.env.pop(name, None)  # admin endpoints are open with no keys configured
+        self.env.update(extra_env or {})
+        self.workers = workers
+        self._proc: Optional[subprocess.Popen] = None
+        self._log = None
+
+    def start(self, timeout: float = 60.0) -> "AppProcess":
+        import httpx
+
+        self._log = open(self.log_path, "wb")
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning", "--no-access-log"],
+            cwd=PROJECT_ROOT, env=self.env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                raise RuntimeError(f"App exited during startup:\n{self.log_path.read_text()[-2000:]}")
+            try:
+                if httpx.get(f"{self.url}/", timeout=1.0).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"App did not come up within {timeout:.0f}s")
+
+    def stop(self):
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        if self._log is not None:
+            self._log.close()
+        self._dir.cleanup()
+
+
+# ============= Request mix =============
+
+DREAMS = [
+    "I was floating on a calm river holding a lotus.",
+    "A golden bird sang to me from an old banyan tree.",
+    "I kept losing my keys in a house full of doors.",
+    "My baby was laughing and speaking in Sanskrit.",
+]
+AFFIRMATIONS = ["My body knows how to nurture this life.", "With every breath I feel calm and strong.",
+                "Om shanti, peace to my baby and me."]
+IMAGE_PROMPTS = ["A mother under a peepal tree at dawn", "Lotus pond with a rainbow", "Baby krishna with a flute"]
+MOODS = [None, None, "Happy", "Tired", "Anxious", "Calm"]
+LETTERS = [None, None, "A", "S", "K", "V", "R", "M"]
+THEMES = [None, "Modern", "Traditional", "Nature", "Spiritual", "Royal"]
+RHYTHM_IDS = ["table_of_2", "waltz_of_threes", "prime_pulse", "fibonacci_tabla"]
+
+Request = Tuple[str, str, Dict[str, Any]]  # method, path, httpx kwargs
+
+
+def _names_body(rng: random.Random) -> dict:
+    return {"gender": rng.choice(["boy", "girl", "unisex"]), "starting_letter": rng.choice(LETTERS),
+            "preference": rng.choice(THEMES)}
+
+
+# route -> (default weight, whether it streams, request builder)
+ROUTES: Dict[str, Tuple[float, bool, Callable[[random.Random], Request]]] = {
+    "curriculum": (25, False, lambda rng: ("GET", f"/api/curriculum/{rng.randint(4, 40)}",
+                                           {"params": {k: v for k, v in {"mood": rng.choice(MOODS)}.items() if v}})),
+    "dream": (8, False, lambda rng: ("POST", "/api/dream/interpret", {"json": {"dreamText": rng.choice(DREAMS)}})),
+    "dream-stream": (4, True, lambda rng: ("POST", "/api/dream/interpret/stream",
+                                           {"json": {"dreamText": rng.choice(DREAMS)},
+                                            "headers": {"Accept": "text/event-stream"}})),
+    "audio": (4, False, lambda rng: ("POST", "/api/generate/audio", {"json": {"text": rng.choice(AFFIRMATIONS)}})),
+    "image": (2, False, lambda rng: ("POST", "/api/generate/image", {"json": {"prompt": rng.choice(IMAGE_PROMPTS)}})),
+    "financial-wisdom": (5, False, lambda rng: ("GET", "/api/financial-wisdom", {})),
+    "rhythmic-math": (5, False, lambda rng: ("GET", "/api/rhythmic-math", {})),
+    "rhythm-audio": (5, False, lambda rng: ("GET", f"/api/rhythmic-math/{rng.choice(RHYTHM_IDS)}/audio",
+                                            {"params": {"bpm": rng.randint(60, 120), "duration": rng.choice([30, 60])}})),
+    "raaga-recommendations": (4, False, lambda rng: ("GET", "/api/raaga-recommendations", {})),
+    "raagas-defaults": (3, False, lambda rng: ("GET", "/api/raagas/defaults", {})),
+    "mantras-defaults": (3, False, lambda rng: ("GET", "/api/mantras/defaults", {})),
+    "dad-joke": (10, False, lambda rng: ("GET", "/api/dad-joke", {})),
+    "names": (10, False, lambda rng: ("POST", "/api/vedic-names", {"json": _names_body(rng)})),
+    "names-stream": (5, True, lambda rng: ("POST", "/api/vedic-names/stream", {"json": _names_body(rng)})),
+    "config": (3, False, lambda rng: ("GET", "/api/config", {})),
+    "cache-stats": (2, False, lambda rng: ("GET", "/api/cache/stats", {})),
+}
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """Default weights, overridden by "route=weight,..." (weight 0 drops a route)."""
+    weights = {route: weight for route, (weight, _, _) in ROUTES.items()}
+    for item in filter(None, (spec or "").split(",")):
+        route, _, weight = item.partition("=")
+        if route.strip() not in ROUTES:
+            raise SystemExit(f"Unknown route '{route}' in --mix; choose from {', '.join(ROUTES)}")
+        weights[route.strip()] = float(weight)
+    return {route: weight for route, weight in weights.items() if weight > 0}
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int  # 0 for timeouts and connection errors
+    seconds: float
+    first_byte_seconds: float
+    size: int
+
+
+async def _issue(client, route: str, rng: random.Random) -> Sample:
+    import httpx
+
+    _, streams, build = ROUTES[route]
+    method, path, kwargs = build(rng)
+    start = time.perf_counter()
+    first_byte, size, status, tail = None, 0, 0, b""
+    try:
+        async with client.stream(method, path, **kwargs) as response:
+            status = response.status_code
+            async for chunk in response.aiter_bytes():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+                size += len(chunk)
+                tail = (tail + chunk)[-512:]
+            if streams and b'"error"' in tail:
+                status = 599  # the stream ended with an error frame instead of {"done": true}
+    except httpx.HTTPError:
+        status = 0
+    elapsed = time.perf_counter() - start
+    return Sample(route, status, elapsed, first_byte if first_byte is not None else elapsed, size)
+
+
+async def run_level(base_url: str, weights: Dict[str, float], concurrency: int, duration: float,
+                    timeout: float, seed: int) -> Tuple[List[Sample], float]:
+    """Closed loop: `concurrency` clients each send their next request as soon as the last one finishes."""
+    import httpx
+
+    routes, cumulative = list(weights), list(weights.values())
+    samples: List[Sample] = []
+    stop_at = time.perf_counter() + duration
+
+    async def client_loop(client, rng: random.Random):
+        while time.perf_counter() < stop_at:
+            route = rng.choices(routes, weights=cumulative)[0]
+            samples.append(await _issue(client, route, rng))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits, trust_env=False) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, random.Random(seed * 1000 + i)) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+
+# ============= Report =============
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    if not values:
+        return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    def pick(q: float) -> float:
+        return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 1)
+
+    return {"p50_ms": pick(0.5), "p90_ms": pick(0.9), "p99_ms": pick(0.99), "max_ms": round(values[-1] * 1000, 1)}
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    def block(group: List[Sample]) -> Dict[str, Any]:
+        errors = sum(1 for s in group if not 200 <= s.status < 400)
+        return {
+            "requests": len(group),
+            "throughput_rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+            "latency": _percentiles([s.seconds for s in group]),
+        }
+
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+    routes = {}
+    for route in sorted({s.route for s in samples}):
+        group = [s for s in samples if s.route == route]
+        routes[route] = block(group)
+        if ROUTES[route][1]:
+            routes[route]["first_byte"] = _percentiles([s.first_byte_seconds for s in group])
+        routes[route]["avg_bytes"] = round(sum(s.size for s in group) / len(group))
+    return {**block(samples), "elapsed_s": round(elapsed, 2), "statuses": dict(sorted(statuses.items())),
+            "routes": routes}
+
+
+def _app_stats(base_url: str) -> Dict[str, Any]:
+    """Admission, prefetch and event loop stall counters from the app itself."""
+    import httpx
+
+    stats = {}
+    try:
+        cache = httpx.get(f"{base_url}/api/cache/stats", timeout=10, trust_env=False).json()
+        stats.update({key: cache[key] for key in ("admission", "prefetch") if key in cache})
+        stalls = httpx.get(f"{base_url}/api/admin/loop-stalls", timeout=10, trust_env=False)
+        if stalls.status_code == 200:
+            loop = stalls.json()
+            stats["loop"] = {key: loop.get(key) for key in ("stalls", "stall_seconds", "max_stall_seconds", "lag")}
+            stats["loop"]["top_sites"] = [{k: site[k] for k in ("site", "count", "seconds")}
+                                          for site in loop.get("top_sites", [])[:5]]
+    except (httpx.HTTPError, ValueError) as e:
+        stats["error"] = str(e)
+    return stats
+
+
+def _git_commit() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        proc = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+        return proc.stdout.strip() if proc.returncode == 0 else ""
+
+    return {"commit": git("rev-parse", "HEAD") or None, "subject": git("log", "-1", "--format=%s") or None,
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    profiles = {
+        "gemini": ServiceProfile(args.gemini_latency, args.error_rate, args.quota_share),
+        "groq": ServiceProfile(args.groq_latency, args.error_rate, args.quota_share),
+        "youtube": ServiceProfile(args.youtube_latency, args.error_rate, 0.0),
+    }
+    weights = parse_mix(args.mix)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    extra_env = dict(item.split("=", 1) for item in args.app_env)
+    standins = StandInServer(profiles, seed=args.seed, page_kb=args.youtube_page_kb).start()
+
+    report = {
+        "git": _git_commit(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "settings": {
+            "provider": args.provider, "workers": args.workers, "duration_s": args.duration,
+            "timeout_s": args.timeout, "seed": args.seed, "reuse_app": args.reuse_app,
+            "profiles": {name: asdict(profile) for name, profile in profiles.items()},
+            "mix": weights, "app_env": extra_env,
+        },
+        "levels": [],
+    }
+    app = None
+    try:
+        for i, concurrency in enumerate(levels):
+            if app is None or not args.reuse_app:
+                if app is not None:
+                    app.stop()
+                app = AppProcess(standins.url, args.provider, args.workers, extra_env).start()
+            standins.reset_counts()
+            if not args.json:
+                print(f"[Bench] Concurrency {concurrency}: running for {args.duration:g}s...")
+            samples, elapsed = asyncio.run(run_level(app.url, weights, concurrency, args.duration,
+                                                     args.timeout, args.seed + i))
+            level = {"concurrency": concurrency, **summarize(samples, elapsed),
+                     "upstream": standins.counts(), "app": _app_stats(app.url)}
+            report["levels"].append(level)
+            if not args.json:
+                _print_level(level)
+    finally:
+        if app is not None:
+            app.stop()
+        standins.stop()
+    return report
+
+
+def _print_level(level: Dict[str, Any]):
+    latency = level["latency"]
+    print(f"[Bench] c={level['concurrency']}: {level['requests']} requests, {level['throughput_rps']} req/s, "
+          f"p50 {latency['p50_ms']} ms, p99 {latency['p99_ms']} ms, errors {level['error_rate']:.1%} "
+          f"{level['statuses']}")
+    for route, stats in level["routes"].items():
+        print(f"[Bench]   {route:<22} {stats['requests']:>6} req  {stats['throughput_rps']:>7} req/s  "
+              f"p50 {stats['latency']['p50_ms']:>8} ms  p99 {stats['latency']['p99_ms']:>8} ms  "
+              f"errors {stats['error_rate']:.1%}")
+    upstream = sum(level["upstream"]["calls"].values())
+    print(f"[Bench]   upstream calls: {upstream} ({round(upstream / max(level['requests'], 1), 2)} per request)")
+    stalls = level["app"].get("loop", {})
+    if stalls:
+        print(f"[Bench]   event loop stalls: {stalls.get('stalls')} ({stalls.get('stall_seconds')}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the app against local provider stand-ins")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per level")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout per request")
+    parser.add_argument("--provider", choices=["gemini", "groq"], default="gemini")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--mix", default=None, help='Route weights, e.g. "curriculum=50,dad-joke=0"')
+    parser.add_argument("--gemini-latency", type=float, default=1.5)
+    parser.add_argument("--groq-latency", type=float, default=0.5)
+    parser.add_argument("--youtube-latency", type=float, default=0.15)
+    parser.add_argument("--youtube-page-kb", type=int, default=300, help="Size of the head of a results page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream calls that fail")
+    parser.add_argument("--quota-share", type=float, default=0.5, help="Fraction of failures that are 429s")
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the app (repeatable)")
+    parser.add_argument("--reuse-app", action="store_true", help="Keep one warm app across levels")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        if not args.json:
+            print(f"[Bench] Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
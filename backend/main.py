@@ -1,42 +1,274 @@
-from fastapi import FastAPI, HTTPException, Security, Query, status
+from fastapi import FastAPI, HTTPException, Security, Depends, Query, Request, status
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from .models import DailyCurriculum, DreamInterpretationRequest, DreamInterpretationResponse, AudioGenerationRequest, ImageGenerationRequest, FinancialWisdomResponse, RhythmicMathResponse, RaagaResponse, MantraResponse, AppConfig, ConfigUpdateRequest
 from .services import llm_service
+from .services.config_store import ConfigStore, DEFAULT_TENANT, DEFAULT_CONFIG_FILE
+from .services.content_store import WEEKS, get_content_store, normalize_mood
+from .services.context_cache import get_context_cache
+from .services.jobs import JobManager
+from .services.prefetch import PrefetchScheduler
+from .util.admission import AdmissionLimiter, AdmissionMiddleware
+from .util.cache import cache_stats, inflight_computations, restore_snapshot, save_snapshot
+from .util import fastjson
+from .util.deadline import deadline, set_deadline
+from .util.responses import ORJSONResponse
+from .util.http_cache import HTTPOptimizationMiddleware
+from .util.loop_watchdog import LoopWatchdog
+from .util.profiling import ProfilingMiddleware, list_profiles, profile_path
+from .util.snapshot import DEFAULT_SNAPSHOT_PATH
 import uvicorn
+import asyncio
 import os
-import json
 from pathlib import Path
-from fastapi.responses import Response
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from fastapi.responses import FileResponse, Response, StreamingResponse, JSONResponse
+from .util.env import load_env
 
-# Load env variables from parent directory if .env.local exists there
-# Or just load from environment (assuming uvicorn loads them or we load manually)
-load_dotenv(Path(__file__).parent.parent / ".env.local")
+# Load env variables from .env / the project root .env.local (once per process)
+load_env()
 
 # Security Scheme
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
+TENANT_HEADER_NAME = "X-Tenant-ID"
+
+def _tenant_api_keys() -> dict:
+    """Parse TENANT_API_KEYS ("tenant_a:key1,tenant_b:key2") into {key: tenant}."""
+    keys = {}
+    for entry in os.getenv("TENANT_API_KEYS", "").split(","):
+        tenant_id, _, key = entry.strip().partition(":")
+        if tenant_id and key:
+            keys[key] = tenant_id
+    return keys
+
 async def get_api_key(api_key_header: str = Security(api_key_header)):
     # In production, use os.getenv("API_ACCESS_KEY")
     # specific value for verification
     SERVER_API_KEY = os.getenv("API_ACCESS_KEY")
+    tenant_keys = _tenant_api_keys()
     
     # If no key configured on server, skip auth (dev mode fallback)
-    if not SERVER_API_KEY:
+    if not SERVER_API_KEY and not tenant_keys:
         return None
         
-    if api_key_header == SERVER_API_KEY:
+    if api_key_header and (api_key_header == SERVER_API_KEY or api_key_header in tenant_keys):
         return api_key_header
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="Could not validate credentials",
     )
 
-# Apply global security if key is present
-app = FastAPI(dependencies=[Security(get_api_key)])
+def _is_admin(headers) -> bool:
+    """The operator key (API_ACCESS_KEY) is admin; tenant keys never are. Dev mode (no keys) is open."""
+    server_key = os.getenv("API_ACCESS_KEY")
+    if not server_key:
+        return not _tenant_api_keys()
+    return headers.get(API_KEY_NAME) == server_key
+
+async def require_admin(request: Request):
+    if not _is_admin(request.headers):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+
+def resolve_tenant(request: Request) -> str:
+    """A tenant-specific API key wins; otherwise the X-Tenant-ID header; otherwise the default tenant."""
+    tenant_id = _tenant_api_keys().get(request.headers.get(API_KEY_NAME, ""))
+    if tenant_id:
+        return tenant_id
+    header = request.headers.get(TENANT_HEADER_NAME, "").strip()
+    if header and len(header) <= 64 and header.replace("-", "").replace("_", "").isalnum():
+        return header
+    return DEFAULT_TENANT
+
+async def bind_tenant_config(request: Request):
+    """Resolve the caller's tenant and bind its model configuration to this request."""
+    tenant_id = resolve_tenant(request)
+    request.state.tenant_id = tenant_id
+    config = config_store.get(tenant_id)
+    llm_service.use_model_config(config.model_provider, config.model_name, config.groq_api_key)
+
+# Time budget per route, longest matching prefix first. Stages check what is
+# left and return partial results (fallback links, fewer repairs) instead of
+# running past it. 0 means no deadline (streams report progress as they go).
+DEFAULT_REQUEST_BUDGET = float(os.getenv("REQUEST_BUDGET_SECONDS", "30"))
+ROUTE_BUDGETS = [
+    ("/api/dream/interpret/stream", 0.0),
+    ("/api/vedic-names/stream", 0.0),
+    ("/api/curriculum/", float(os.getenv("CURRICULUM_BUDGET_SECONDS", "25"))),
+    ("/api/raaga-recommendations", 20.0),
+    ("/api/raagas/defaults", 20.0),
+    ("/api/mantras/defaults", 20.0),
+    ("/api/jobs/", 0.0),
+]
+# Background jobs aren't holding a connection open, so they get longer
+JOB_BUDGET_SECONDS = float(os.getenv("JOB_BUDGET_SECONDS", "120"))
+
+def route_budget(path: str) -> float:
+    for prefix, budget in ROUTE_BUDGETS:
+        if path.startswith(prefix):
+            return budget
+    return DEFAULT_REQUEST_BUDGET
+
+async def bind_deadline(request: Request):
+    """Start this request's deadline (see util.deadline)."""
+    budget = route_budget(request.url.path)
+    set_deadline(budget if budget > 0 else None)
+
+# Reports synchronous calls that block the event loop (see util/loop_watchdog.py)
+loop_watchdog = LoopWatchdog(threshold=float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100")) / 1000)
+LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG", "on").lower() not in ("0", "off", "false")
+
+# Long-running generations can run as background jobs (opt in with `Prefer: respond-async`)
+job_manager = JobManager(
+    max_workers=int(os.getenv("JOB_WORKERS", "4")),
+    result_ttl=float(os.getenv("JOB_RESULT_TTL_SECONDS", "900")),
+)
+
+# Warm restarts: the in-memory caches and warm LLM wrappers are snapshotted on
+# graceful shutdown and restored lazily by the next process (see util/snapshot.py)
+WARM_SNAPSHOT_ENABLED = os.getenv("WARM_SNAPSHOT", "on").lower() not in ("0", "off", "false")
+WARM_SNAPSHOT_PATH = Path(os.getenv("GARBHVEDA_SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH)
+# How long shutdown waits for generations already under way
+SHUTDOWN_DRAIN_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "20"))
+
+async def _prewarm_wrappers(keys: list):
+    groq_keys = [config.groq_api_key for config in config_store.snapshot().values() if config.groq_api_key]
+    warmed = await asyncio.to_thread(llm_service.prewarm_wrappers, keys, groq_keys)
+    print(f"[Snapshot] Prewarmed {warmed} of {len(keys)} LLM wrappers")
+
+async def _drain_generations(timeout: float):
+    """Let jobs, running prefetches and in-flight cache fills finish, so their results make the snapshot."""
+    computations = inflight_computations()
+    waits = [job_manager.drain(timeout), prefetcher.drain(timeout)]
+    if computations:
+        print(f"[Snapshot] Waiting for {len(computations)} in-flight generations")
+        waits.append(asyncio.wait(computations, timeout=timeout))
+    await asyncio.gather(*waits, return_exceptions=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Provider clients are built here rather than at import time so that
+    # importing the app (tests, tooling, worker boot) stays cheap.
+    default_config = config_store.get(DEFAULT_TENANT)
+    llm_service.set_model_config(default_config.model_provider, default_config.model_name)
+    if default_config.groq_api_key:
+        llm_service.set_groq_api_key(default_config.groq_api_key)
+    llm_service.init_clients()
+    prewarm = None
+    if WARM_SNAPSHOT_ENABLED:
+        snapshot = restore_snapshot(WARM_SNAPSHOT_PATH)
+        if snapshot is not None and snapshot.meta.get("wrappers"):
+            prewarm = asyncio.create_task(_prewarm_wrappers(snapshot.meta["wrappers"]))
+    job_manager.start()
+    prefetcher.start()
+    if LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    yield
+    # Requests have finished by now; background generations may not have
+    await _drain_generations(SHUTDOWN_DRAIN_SECONDS)
+    if prewarm is not None:
+        prewarm.cancel()
+    await loop_watchdog.stop()
+    await prefetcher.stop()
+    await job_manager.stop()
+    if WARM_SNAPSHOT_ENABLED:
+        try:
+            save_snapshot(WARM_SNAPSHOT_PATH, meta={"wrappers": llm_service.warm_wrapper_keys()})
+        except Exception as e:
+            print(f"[Snapshot] Could not write {WARM_SNAPSHOT_PATH}: {e}")
+
+# Apply global security if key is present; every request gets its tenant's config and a deadline
+app = FastAPI(dependencies=[Security(get_api_key), Depends(bind_tenant_config), Depends(bind_deadline)],
+              default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Cache-Control per route prefix for GET responses (routes can set their own).
+# Responses are per tenant, so nothing is public; everything else revalidates
+# with its ETag (see util/http_cache.py).
+CACHE_POLICIES = [
+    ("/api/curriculum/", "private, max-age=300"),
+    ("/api/raagas/defaults", "private, max-age=3600"),
+    ("/api/mantras/defaults", "private, max-age=3600"),
+    ("/api/dad-joke", "no-store"),
+    ("/api/jobs/", "no-store"),
+    ("/api/config", "no-store"),
+    ("/api/cache/stats", "no-store"),
+    ("/api/admin/", "no-store"),
+]
+
+# Added before CORS so 304s still get CORS headers
+app.add_middleware(
+    HTTPOptimizationMiddleware,
+    policies=CACHE_POLICIES,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_BYTES", "1024")),
+)
+
+# On-demand profiling: `X-Profile: 1` from an admin, or a sampled fraction of
+# requests, is run under cProfile (see util/profiling.py). Outside the
+# compression middleware so that shows up too; PROFILING=off removes it.
+if os.getenv("PROFILING", "on").lower() not in ("0", "off", "false"):
+    app.add_middleware(
+        ProfilingMiddleware,
+        is_admin=_is_admin,
+        sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+    )
+
+# Admission control: how many requests of each class run at once, how many
+# more may wait (and for how long) before the rest get 503 + Retry-After.
+# Expensive routes call an LLM or TTS provider; first matching prefix wins.
+ADMISSION_LIMITERS = {
+    "expensive": AdmissionLimiter(
+        "expensive",
+        limit=int(os.getenv("ADMISSION_EXPENSIVE_CONCURRENCY", "8")),
+        queue=int(os.getenv("ADMISSION_EXPENSIVE_QUEUE", "16")),
+        wait=float(os.getenv("ADMISSION_EXPENSIVE_WAIT_SECONDS", "10")),
+    ),
+    "cheap": AdmissionLimiter(
+        "cheap",
+        limit=int(os.getenv("ADMISSION_CHEAP_CONCURRENCY", "64")),
+        queue=int(os.getenv("ADMISSION_CHEAP_QUEUE", "256")),
+        wait=float(os.getenv("ADMISSION_CHEAP_WAIT_SECONDS", "2")),
+    ),
+}
+ADMISSION_ROUTES = [
+    ("/api/rhythmic-math/", "cheap"),  # locally synthesized audio
+    ("/api/curriculum/", "expensive"),
+    ("/api/dream/interpret", "expensive"),
+    ("/api/generate/", "expensive"),
+    ("/api/financial-wisdom", "expensive"),
+    ("/api/rhythmic-math", "expensive"),
+    ("/api/raaga-recommendations", "expensive"),
+    ("/api/raagas/defaults", "expensive"),
+    ("/api/mantras/defaults", "expensive"),
+    ("/api/dad-joke", "expensive"),
+    ("/api/vedic-names", "expensive"),
+    ("/api/jobs/", None),  # job status streams stay open while the job runs
+]
+
+def _under_load() -> bool:
+    """Expensive routes are queueing or at least half busy: no room for speculative work."""
+    expensive = ADMISSION_LIMITERS["expensive"]
+    return expensive.waiting > 0 or expensive.active >= max(1, expensive.limit // 2)
+
+# Next week's curriculum is generated in the background after this week's is
+# served (or the week is changed in the config), using spare capacity only
+PREFETCH_ENABLED = os.getenv("PREFETCH", "on").lower() not in ("0", "off", "false")
+prefetcher = PrefetchScheduler(
+    busy=_under_load,
+    quota_backoff=llm_service.quota_backoff_remaining,
+    concurrency=int(os.getenv("PREFETCH_CONCURRENCY", "1")),
+    max_per_hour=int(os.getenv("PREFETCH_MAX_PER_HOUR", "30")),
+    budget_seconds=JOB_BUDGET_SECONDS,
+)
+
+app.add_middleware(
+    AdmissionMiddleware,
+    limiters=ADMISSION_LIMITERS,
+    routes=ADMISSION_ROUTES,
+    default_class="cheap",
+    max_body_bytes=int(os.getenv("MAX_REQUEST_BODY_BYTES", str(64 * 1024))),
+)
 
 # Configure CORS
 origins = [
@@ -59,12 +291,73 @@ def read_root():
 
 from typing import Optional
 
+def _wants_async(request: Request) -> bool:
+    return "respond-async" in request.headers.get("prefer", "").lower()
+
+def _submit_job(request: Request, kind: str, params: tuple, produce, failure_detail: str) -> JSONResponse:
+    """
+    Queue `produce()` as a background job and answer 202 with where to fetch it.
+    Identical pending work for the same tenant and model is shared.
+    """
+    model = llm_service.get_current_model_config()
+    key = (request.state.tenant_id, model["provider"], model["model_name"]) + params
+
+    async def run():
+        # The job outlives the request that queued it; give it its own budget
+        with deadline(JOB_BUDGET_SECONDS, inherit=False):
+            result = await produce()
+        if not result:
+            raise RuntimeError(failure_detail)
+        return result.model_dump(mode="json")
+
+    try:
+        job = job_manager.submit(kind, key, run)
+    except OverflowError:
+        raise HTTPException(status_code=503, detail="Too many pending jobs", headers={"Retry-After": "10"})
+    status_url = f"/api/jobs/{job.id}"
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status, "status_url": status_url},
+        headers={"Location": status_url, "Preference-Applied": "respond-async"},
+    )
+
+def _curriculum_key(request: Request, week: int, mood: Optional[str]) -> tuple:
+    model = llm_service.get_current_model_config()
+    return (request.state.tenant_id, model["provider"], model["model_name"], week, normalize_mood(mood))
+
+async def _prefetch_curriculum(request: Request, week: int, mood: Optional[str] = None):
+    """Warm the curriculum cache for (week, mood) in the background, unless it's already served from somewhere."""
+    if not PREFETCH_ENABLED or week not in WEEKS:
+        return
+    store = get_content_store()
+    if (store and store.variants(week, mood)) or await llm_service.is_curriculum_cached(week, mood):
+        return
+    if prefetcher.schedule(_curriculum_key(request, week, mood),
+                           lambda: llm_service.generate_daily_curriculum(week, mood)):
+        print(f"[Prefetch] Queued curriculum for week {week}, mood: {mood}")
+
 @app.get("/api/curriculum/{week}", response_model=DailyCurriculum)
-async def get_curriculum(week: int, mood: Optional[str] = None):
+async def get_curriculum(request: Request, week: int, mood: Optional[str] = None):
+    # Precomputed variants (python -m backend.precompute) first; live generation on a miss
+    store = get_content_store()
+    curriculum = store.pick(week, mood) if store else None
+    if curriculum:
+        await _prefetch_curriculum(request, week + 1, mood)
+        # Already a validated DailyCurriculum: serialize it straight to bytes
+        return ORJSONResponse(curriculum)
+    # A prefetch of this very curriculum is now wanted for real: don't shed it
+    prefetcher.claim(_curriculum_key(request, week, mood))
+    if _wants_async(request):
+        response = _submit_job(request, "curriculum", (week, normalize_mood(mood)),
+                               lambda: llm_service.generate_daily_curriculum(week, mood),
+                               "Failed to generate curriculum")
+        await _prefetch_curriculum(request, week + 1, mood)
+        return response
     curriculum = await llm_service.generate_daily_curriculum(week, mood)
     if not curriculum:
         raise HTTPException(status_code=500, detail="Failed to generate curriculum")
-    return curriculum
+    await _prefetch_curriculum(request, week + 1, mood)
+    return ORJSONResponse(curriculum)
 
 @app.post("/api/dream/interpret", response_model=DreamInterpretationResponse)
 async def interpret_dream(request: DreamInterpretationRequest):
@@ -73,13 +366,44 @@ async def interpret_dream(request: DreamInterpretationRequest):
         raise HTTPException(status_code=500, detail="Failed to interpret dream")
     return interpretation
 
+def _stream_events(request: Request, events) -> StreamingResponse:
+    """
+    Stream (path, value) events as NDJSON, or as Server-Sent Events when the
+    client asks for text/event-stream. A final {"done": true} (or {"error": ...})
+    line tells the client the stream ended normally.
+    """
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+
+    def frame(payload: dict) -> str:
+        line = fastjson.dumps_str(payload)
+        return f"data: {line}\n\n" if use_sse else f"{line}\n"
+
+    async def body():
+        try:
+            async for path, value in events:
+                yield frame({"path": list(path), "value": value})
+            yield frame({"done": True})
+        except Exception as e:
+            print(f"[Stream] Error while streaming: {e}")
+            yield frame({"error": str(e)})
+
+    return StreamingResponse(body(), media_type="text/event-stream" if use_sse else "application/x-ndjson")
+
+@app.post("/api/dream/interpret/stream")
+async def interpret_dream_stream(request: DreamInterpretationRequest, http_request: Request):
+    return _stream_events(http_request, llm_service.stream_dream_interpretation(request.dreamText))
+
 @app.post("/api/generate/audio")
-async def generate_audio(request: AudioGenerationRequest):
-    audio_bytes = await llm_service.generate_audio(request.text)
+async def generate_audio(request: AudioGenerationRequest, http_request: Request):
+    # 16-bit PCM WAV by default; `Accept: audio/vnd.wave;codec=7` (or audio/basic) gets 8-bit mu-law, half the size
+    from .services.audio import MEDIA_TYPES, negotiate_encoding
+
+    encoding = negotiate_encoding(http_request.headers.get("accept"))
+    audio_bytes = await llm_service.generate_audio(request.text, encoding=encoding)
     if not audio_bytes:
         raise HTTPException(status_code=500, detail="Failed to generate audio")
     
-    return Response(content=audio_bytes, media_type="audio/wav") # Assuming WAV or MP3, browser usually handles it
+    return Response(content=audio_bytes, media_type=MEDIA_TYPES[encoding], headers={"Vary": "Accept"})
 
 @app.post("/api/generate/image")
 async def generate_image(request: ImageGenerationRequest):
@@ -102,15 +426,41 @@ async def get_rhythmic_math():
         raise HTTPException(status_code=500, detail="Failed to generate rhythmic math")
     return math_activities
 
+@app.get("/api/rhythmic-math/{activity_id}/audio")
+def get_rhythmic_math_audio(
+    activity_id: str,
+    bpm: int = Query(..., ge=30, le=240),
+    duration: float = Query(60.0, gt=0, le=600, description="seconds"),
+    beats: Optional[int] = Query(None, ge=1, le=8, description="beats per bar; derived from the activity id if omitted"),
+    pattern: str = Query("counting", pattern="^(click|counting)$"),
+):
+    """Click track for a rhythmic math activity, synthesized locally (16-bit PCM WAV)."""
+    # numpy is only loaded once audio is actually requested
+    from .services.audio import beats_for_activity, rhythm_wav
+
+    beats = beats or beats_for_activity(activity_id)
+    audio_bytes = rhythm_wav(bpm, duration, beats, pattern)
+    # The parameters fully determine the audio, so they make a strong validator without hashing it
+    etag = f'"rhythm-{pattern}-{bpm}-{duration:g}-{beats}"'
+    return Response(content=audio_bytes, media_type="audio/wav", headers={"Cache-Control": "public, max-age=86400", "ETag": etag})
+
 @app.get("/api/raaga-recommendations", response_model=RaagaResponse)
-async def get_raaga_recommendations():
+async def get_raaga_recommendations(request: Request):
+    if _wants_async(request):
+        return _submit_job(request, "raaga_recommendations", (),
+                           llm_service.generate_raaga_recommendations,
+                           "Failed to generate raaga recommendations")
     raagas = await llm_service.generate_raaga_recommendations()
     if not raagas:
         raise HTTPException(status_code=500, detail="Failed to generate raaga recommendations")
     return raagas
 
 @app.get("/api/raagas/defaults", response_model=RaagaResponse)
-async def get_initial_raagas():
+async def get_initial_raagas(request: Request):
+    if _wants_async(request):
+        return _submit_job(request, "initial_raagas", (),
+                           llm_service.get_initial_raagas,
+                           "Failed to fetch initial raagas")
     raagas = await llm_service.get_initial_raagas()
     if not raagas:
         raise HTTPException(status_code=500, detail="Failed to fetch initial raagas")
@@ -118,9 +468,14 @@ async def get_initial_raagas():
 
 @app.get("/api/mantras/defaults", response_model=MantraResponse)
 async def get_initial_mantras(
+    request: Request,
     api_key: str = Security(get_api_key),
     exclude: list[str] = Query(default=[])
 ):
+    if _wants_async(request):
+        return _submit_job(request, "initial_mantras", tuple(sorted(exclude)),
+                           lambda: llm_service.get_initial_mantras(exclude_urls=exclude),
+                           "Failed to fetch initial mantras (service returned empty)")
     try:
         if exclude:
             print(f"[API] Received request to exclude {len(exclude)} URLs from refresh")
@@ -143,9 +498,9 @@ async def get_dad_joke():
     return {"jokes": jokes}
 
 class NameRequest(BaseModel):
-    gender: str
-    starting_letter: Optional[str] = None
-    preference: Optional[str] = None
+    gender: str = Field(max_length=16)
+    starting_letter: Optional[str] = Field(default=None, max_length=8)
+    preference: Optional[str] = Field(default=None, max_length=200)
 
 @app.post("/api/vedic-names")
 async def get_vedic_names(request: NameRequest):
@@ -155,93 +510,114 @@ async def get_vedic_names(request: NameRequest):
         return {"names": []}
     return {"names": names}
 
-# Config Persistence
-CONFIG_FILE = Path(__file__).parent / "backend_config.json"
+@app.post("/api/vedic-names/stream")
+async def get_vedic_names_stream(request: NameRequest, http_request: Request):
+    return _stream_events(
+        http_request,
+        llm_service.stream_vedic_names(request.gender, request.starting_letter, request.preference)
+    )
 
-def load_config_from_file() -> AppConfig:
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                data = json.load(f)
-            print(f"[Config] Loaded config from file: provider={data.get('model_provider')}")
-            return AppConfig(**data)
-        except Exception as e:
-            print(f"[Config] Failed to load config file: {e}")
-    return AppConfig()
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, request: Request, wait: float = Query(default=0, ge=0, le=30)):
+    """
+    Status (and, once done, the result) of a background job.
+    `?wait=N` long-polls up to N seconds; `Accept: text/event-stream` streams
+    status updates until the job finishes.
+    """
+    job = job_manager.get(job_id)
+    # Job IDs are scoped to the tenant that submitted them
+    if job is None or job.key[0] != request.state.tenant_id:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-def save_config_to_file(config: AppConfig):
-    try:
-        with open(CONFIG_FILE, "w") as f:
-            # Use .dict() method from Pydantic models
-            json.dump(config.dict(), f, indent=2)
-        print(f"[Config] Persistent config saved to {CONFIG_FILE.name}")
-    except Exception as e:
-        print(f"[Config] Failed to save config: {e}")
+    if "text/event-stream" in request.headers.get("accept", ""):
+        async def events():
+            yield f"data: {fastjson.dumps_str(job.to_dict())}\n\n"
+            while not job.is_finished:
+                await job_manager.wait(job, timeout=15)
+                if await request.is_disconnected():
+                    return
+                # Comment lines keep proxies from closing an idle stream
+                yield f"data: {fastjson.dumps_str(job.to_dict())}\n\n" if job.is_finished else ": keepalive\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    if wait and not job.is_finished:
+        await job_manager.wait(job, timeout=wait)
+    return job.to_dict()
+
+@app.get("/api/admin/profiles", dependencies=[Depends(require_admin)])
+def get_profiles(limit: int = Query(50, ge=1, le=500)):
+    """Stored request profiles, newest first"""
+    return {"profiles": list_profiles(limit=limit)}
 
-# Initialize config from file on startup
-_app_config = load_config_from_file()
+@app.get("/api/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str, format: str = Query("json", pattern="^(json|pstats)$")):
+    """One profile: its summary with the top functions, or the raw pstats file"""
+    path = profile_path(profile_id, ".prof" if format == "pstats" else ".json")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "pstats":
+        return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+    return Response(path.read_bytes(), media_type="application/json")
 
-# Apply loaded config to service immediately
-llm_service.set_model_config(_app_config.model_provider, _app_config.model_name)
-if _app_config.groq_api_key:
-    llm_service.set_groq_api_key(_app_config.groq_api_key)
+@app.get("/api/admin/loop-stalls", dependencies=[Depends(require_admin)])
+async def get_loop_stalls(limit: int = Query(10, ge=1, le=50)):
+    """Event loop stalls: count, duration histogram, lag percentiles and the call sites that blocked"""
+    return loop_watchdog.stats(limit)
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Shared cache backend and per-namespace hit/miss counters for this worker, plus provider context caching"""
+    return {
+        **cache_stats(),
+        "context_cache": get_context_cache().stats(),
+        "name_batching": llm_service.get_name_batching_stats(),
+        "admission": {name: limiter.stats() for name, limiter in ADMISSION_LIMITERS.items()},
+        "prefetch": prefetcher.stats(),
+    }
+
+# Config Persistence (per tenant, see services/config_store.py)
+config_store = ConfigStore(Path(os.getenv("GARBHVEDA_CONFIG_FILE") or DEFAULT_CONFIG_FILE),
+                           max_tenants=int(os.getenv("MAX_TENANTS", "100")))
+
+def _public_config(config: AppConfig) -> AppConfig:
+    # Never send the API key back
+    return config.model_copy(update={"groq_api_key": None})
 
 @app.get("/api/config", response_model=AppConfig)
-async def get_config():
-    """Get current application configuration"""
-    # Don't return the API key for security
-    config_copy = AppConfig(
-        model_provider=_app_config.model_provider,
-        model_name=_app_config.model_name,
-        groq_api_key=None,  # Never send API key back
-        mother_name=_app_config.mother_name,
-        father_name=_app_config.father_name,
-        pregnancy_week=_app_config.pregnancy_week
-    )
-    return config_copy
+async def get_config(request: Request):
+    """Get the calling tenant's application configuration"""
+    return _public_config(config_store.get(request.state.tenant_id))
 
 @app.post("/api/config", response_model=AppConfig)
-async def update_config(request: ConfigUpdateRequest):
-    """Update application configuration"""
-    global _app_config
+async def update_config(request: ConfigUpdateRequest, http_request: Request):
+    """Update the calling tenant's application configuration"""
+    tenant_id = http_request.state.tenant_id
     
-    print(f"[Config API] Received update request: provider={request.model_provider}, model={request.model_name}, has_api_key={request.groq_api_key is not None and len(request.groq_api_key or '') > 0}")
+    print(f"[Config API] Received update request for tenant {tenant_id}: provider={request.model_provider}, model={request.model_name}, has_api_key={request.groq_api_key is not None and len(request.groq_api_key or '') > 0}")
     
-    if request.model_provider is not None:
-        _app_config.model_provider = request.model_provider
-    if request.model_name is not None:
-        _app_config.model_name = request.model_name
-    if request.groq_api_key is not None:
-        # If empty string sent, clear it? Or just update. 
-        # Assuming empty string means clear or update.
-        _app_config.groq_api_key = request.groq_api_key
-        # Update the llm_service with the new API key
-        llm_service.set_groq_api_key(request.groq_api_key)
-        
-    # User details updates
-    if request.mother_name is not None:
-        _app_config.mother_name = request.mother_name
-    if request.father_name is not None:
-        _app_config.father_name = request.father_name
-    if request.pregnancy_week is not None:
-        _app_config.pregnancy_week = request.pregnancy_week
-    
-    # Update model provider in llm_service
-    llm_service.set_model_config(_app_config.model_provider, _app_config.model_name)
-    
-    # Save to file
-    save_config_to_file(_app_config)
+    # Copy-on-write: other requests keep reading the previous snapshot until the swap.
+    # The save rewrites the config file, so it runs off the event loop.
+    try:
+        config = await asyncio.to_thread(config_store.update, tenant_id, request)
+    except OverflowError:
+        # X-Tenant-ID is unauthenticated, so the number of stored tenants is capped (MAX_TENANTS)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Tenant limit reached")
+
+    if tenant_id == DEFAULT_TENANT:
+        # Keep the process defaults (used outside requests) in line with the default tenant
+        llm_service.set_model_config(config.model_provider, config.model_name)
+        if request.groq_api_key is not None:
+            llm_service.set_groq_api_key(request.groq_api_key)
     
-    print(f"[Config API] Config updated and saved: provider={_app_config.model_provider}, model={_app_config.model_name}")
+    print(f"[Config API] Config updated and saved: tenant={tenant_id}, provider={config.model_provider}, model={config.model_name}")
+
+    if request.pregnancy_week is not None:
+        # The app opens the new week next; prefetch it (and the one after) with the updated model
+        llm_service.use_model_config(config.model_provider, config.model_name, config.groq_api_key)
+        await _prefetch_curriculum(http_request, config.pregnancy_week)
+        await _prefetch_curriculum(http_request, config.pregnancy_week + 1)
     
-    return AppConfig(
-        model_provider=_app_config.model_provider,
-        model_name=_app_config.model_name,
-        groq_api_key=None,  # Never send API key back
-        mother_name=_app_config.mother_name,
-        father_name=_app_config.father_name,
-        pregnancy_week=_app_config.pregnancy_week
-    )
+    return _public_config(config)
 
 if __name__ == "__main__":
     uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True)
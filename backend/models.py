@@ -1,6 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
 
+# Caps on free text sent to the LLM / TTS providers (422 beyond these)
+MAX_DREAM_CHARS = 4000
+MAX_SPEECH_CHARS = 5000
+MAX_PROMPT_CHARS = 2000
+
 class Resource(BaseModel):
     title: str
     url: str
@@ -27,17 +32,36 @@ class DailyCurriculum(BaseModel):
     activities: List[Activity]
 
 class DreamInterpretationRequest(BaseModel):
-    dreamText: str
+    dreamText: str = Field(min_length=1, max_length=MAX_DREAM_CHARS)
 
 class DreamInterpretationResponse(BaseModel):
     interpretation: str
     affirmation: str
 
+class DadJokesResponse(BaseModel):
+    jokes: List[str]
+
+class VedicName(BaseModel):
+    name: str
+    meaning: str
+    origin: str
+    significance: str
+
+class VedicNamesResponse(BaseModel):
+    names: List[VedicName]
+
+class VedicNamesBatchItem(BaseModel):
+    id: str
+    names: List[VedicName]
+
+class VedicNamesBatchResponse(BaseModel):
+    results: List[VedicNamesBatchItem]
+
 class AudioGenerationRequest(BaseModel):
-    text: str
+    text: str = Field(min_length=1, max_length=MAX_SPEECH_CHARS)
 
 class ImageGenerationRequest(BaseModel):
-    prompt: str
+    prompt: str = Field(min_length=1, max_length=MAX_PROMPT_CHARS)
 
 class FinancialTip(BaseModel):
     id: str
@@ -0,0 +1,241 @@
+"""
+Offline curriculum precompute.
+
+Generates and resource-resolves a curriculum for every week x mood pair,
+several variants each, and writes them to the content store that
+/api/curriculum serves from. Each finished curriculum is committed on its own,
+so an interrupted run picks up where it stopped:
+
+    python -m backend.precompute
+    python -m backend.precompute --weeks 1-12 --moods CALM,TIRED --variants 2 --concurrency 4
+    python -m backend.precompute --dry-run       # show what is still missing
+
+With --names it instead fills the Vedic name index, generating names for
+every gender x theme x starting letter bucket below --names-target:
+
+    python -m backend.precompute --names --letters A-F --concurrency 2
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .services.content_store import DEFAULT_STORE_PATH, MOODS, WEEKS, ContentStore, normalize_mood
+from .services.name_index import DEFAULT_INDEX_PATH, GENDERS, LETTERS, THEMES, NameIndex, normalize_theme
+
+Job = Tuple[int, str, int]
+
+
+def parse_weeks(spec: str) -> List[int]:
+    weeks = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            weeks.update(range(int(start), int(end) + 1))
+        else:
+            weeks.add(int(part))
+    invalid = [w for w in weeks if w not in WEEKS]
+    if invalid:
+        raise argparse.ArgumentTypeError(f"Weeks must be within 1-40: {sorted(invalid)}")
+    return sorted(weeks)
+
+
+def parse_moods(spec: str) -> List[str]:
+    moods = []
+    for part in spec.split(","):
+        mood = normalize_mood("" if part.strip().lower() == "none" else part)
+        if mood not in MOODS:
+            raise argparse.ArgumentTypeError(f"Unknown mood '{part}'; expected one of {', '.join(m or 'none' for m in MOODS)}")
+        moods.append(mood)
+    return moods
+
+
+def parse_letters(spec: str) -> List[str]:
+    letters = set()
+    for part in spec.upper().split(","):
+        part = part.strip()
+        if len(part) == 3 and part[1] == "-":
+            letters.update(chr(c) for c in range(ord(part[0]), ord(part[2]) + 1))
+        elif part:
+            letters.add(part)
+    invalid = [letter for letter in letters if letter not in LETTERS]
+    if invalid:
+        raise argparse.ArgumentTypeError(f"Letters must be A-Z: {sorted(invalid)}")
+    return sorted(letters)
+
+
+def parse_themes(spec: str) -> List[str]:
+    themes = [normalize_theme("" if part.strip().lower() in ("any", "none") else part) for part in spec.split(",")]
+    invalid = [theme for theme in themes if theme not in THEMES]
+    if invalid:
+        raise argparse.ArgumentTypeError(f"Unknown themes {invalid}; expected any of {', '.join(t or 'any' for t in THEMES)}")
+    return themes
+
+
+def pending_name_buckets(index: NameIndex, genders: List[str], themes: List[str], letters: List[str], target: int) -> List[Tuple[str, str, str]]:
+    return [
+        (gender, theme, letter)
+        for gender in genders
+        for theme in themes
+        for letter in letters
+        if index.count(gender, theme, letter) < target
+    ]
+
+
+def pending_jobs(store: ContentStore, weeks: List[int], moods: List[str], variants: int, force: bool) -> List[Job]:
+    return [
+        (week, mood, variant)
+        for week in weeks
+        for mood in moods
+        for variant in range(variants)
+        if force or not store.has(week, mood, variant)
+    ]
+
+
+def _generate(job: Job, attempts: int):
+    """Worker thread body: one curriculum, on the thread's own event loop."""
+    from .services import llm_service
+
+    week, mood, _ = job
+    for attempt in range(attempts):
+        curriculum = asyncio.run(llm_service.build_daily_curriculum(week, mood or None))
+        if curriculum and not any(a.id.startswith("fallback_") for a in curriculum.activities):
+            return curriculum
+        if attempt + 1 < attempts:
+            # Quota placeholder or hard failure: back off, then try again
+            time.sleep(min(60, 5 * 2 ** attempt))
+    return None
+
+
+def run(store: ContentStore, jobs: List[Job], concurrency: int, attempts: int) -> Tuple[int, int]:
+    from .services import llm_service
+
+    model = llm_service.get_current_model_config()
+    model_label = f"{model['provider']}:{model['model_name'] or 'default'}"
+    done = failed = 0
+    progress_lock = threading.Lock()
+    started = time.monotonic()
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="precompute")
+    try:
+        futures = {executor.submit(_generate, job, attempts): job for job in jobs}
+        for future in as_completed(futures):
+            week, mood, variant = futures[future]
+            try:
+                curriculum = future.result()
+            except Exception as e:
+                curriculum = None
+                print(f"[Precompute] week {week} {mood or 'none'} #{variant} failed: {e}")
+            with progress_lock:
+                if curriculum:
+                    store.put(week, mood, variant, curriculum, model=model_label)
+                    done += 1
+                else:
+                    failed += 1
+                elapsed = time.monotonic() - started
+                print(f"[Precompute] {done + failed}/{len(jobs)} week {week} {mood or 'none'} #{variant} "
+                      f"{'ok' if curriculum else 'FAILED'} ({elapsed:.0f}s)")
+    except KeyboardInterrupt:
+        print("[Precompute] Interrupted; finished curricula are saved. Re-run to resume.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+    return done, failed
+
+
+def _fill_name_bucket(bucket: Tuple[str, str, str], index: NameIndex, target: int, attempts: int) -> int:
+    """Worker thread body: generate batches until the bucket reaches `target` or stops yielding new names."""
+    from .services import llm_service
+
+    gender, theme, letter = bucket
+    for _ in range(attempts):
+        before = index.count(gender, theme, letter)
+        if before >= target:
+            break
+        asyncio.run(llm_service.top_up_vedic_names(gender, letter, theme or None))
+        if index.count(gender, theme, letter) == before:
+            # Rare letters run dry quickly; don't keep paying for duplicates
+            break
+    return index.count(gender, theme, letter)
+
+
+def run_names(index: NameIndex, buckets: List[Tuple[str, str, str]], target: int, concurrency: int, attempts: int):
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="precompute-names") as executor:
+        futures = {executor.submit(_fill_name_bucket, bucket, index, target, attempts): bucket for bucket in buckets}
+        for position, future in enumerate(as_completed(futures), 1):
+            gender, theme, letter = futures[future]
+            try:
+                count = future.result()
+            except Exception as e:
+                count = index.count(gender, theme, letter)
+                print(f"[Precompute] names {gender}/{theme or 'any'}/{letter} failed: {e}")
+            print(f"[Precompute] {position}/{len(buckets)} names {gender}/{theme or 'any'}/{letter}: {count}")
+
+
+def _apply_default_config():
+    """Use the default tenant's provider/model, as the server would."""
+    from .services import llm_service
+    from .services.config_store import ConfigStore, DEFAULT_TENANT
+
+    config = ConfigStore().get(DEFAULT_TENANT)
+    llm_service.set_model_config(config.model_provider, config.model_name)
+    if config.groq_api_key:
+        llm_service.set_groq_api_key(config.groq_api_key)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Precompute curricula for every week x mood into the content store")
+    parser.add_argument("--weeks", type=parse_weeks, default=list(WEEKS), help="e.g. 1-40 or 4,8,12")
+    parser.add_argument("--moods", type=parse_moods, default=list(MOODS), help="comma separated; 'none' for no mood")
+    parser.add_argument("--variants", type=int, default=3, help="variants per week/mood (rotated daily when served)")
+    parser.add_argument("--concurrency", type=int, default=4, help="curricula generated in parallel")
+    parser.add_argument("--attempts", type=int, default=3, help="tries per curriculum before giving up")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE_PATH)
+    parser.add_argument("--force", action="store_true", help="regenerate entries that already exist")
+    parser.add_argument("--dry-run", action="store_true", help="list pending work and exit")
+    parser.add_argument("--names", action="store_true", help="fill the Vedic name index instead of curricula")
+    parser.add_argument("--genders", type=lambda s: [g.strip().title() for g in s.split(",")], default=list(GENDERS))
+    parser.add_argument("--themes", type=parse_themes, default=list(THEMES), help="comma separated; 'any' for no theme")
+    parser.add_argument("--letters", type=parse_letters, default=list(LETTERS), help="e.g. A-Z or A,K,S")
+    parser.add_argument("--names-target", type=int, default=20, help="names wanted per gender/theme/letter bucket")
+    parser.add_argument("--names-index", type=Path, default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    if args.names:
+        from .services.name_index import set_name_index
+
+        index = NameIndex(args.names_index)
+        set_name_index(index)
+        buckets = pending_name_buckets(index, args.genders, args.themes, args.letters, args.names_target)
+        print(f"[Precompute] {len(buckets)} name buckets below {args.names_target} in {args.names_index} ({index.size()} names)")
+        if args.dry_run or not buckets:
+            return
+        _apply_default_config()
+        run_names(index, buckets, args.names_target, max(1, args.concurrency), max(1, args.attempts))
+        print(f"[Precompute] Finished: {index.size()} names indexed")
+        return
+
+    store = ContentStore(args.store)
+    jobs = pending_jobs(store, args.weeks, args.moods, args.variants, args.force)
+    total = len(args.weeks) * len(args.moods) * args.variants
+    print(f"[Precompute] {len(jobs)} of {total} curricula to generate into {args.store} ({store.count()} stored)")
+    if args.dry_run or not jobs:
+        return
+
+    _apply_default_config()
+    done, failed = run(store, jobs, max(1, args.concurrency), max(1, args.attempts))
+    print(f"[Precompute] Finished: {done} generated, {failed} failed, {store.count()} stored")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Audio
+
+Local audio processing, kept in-process and vectorized with NumPy.
+
+Rhythm tracks: click tracks for the rhythmic math activities, so a counting
+exercise at a given BPM needs no external media or TTS call. Two patterns are
+available:
+
+- "click": a metronome, with an accented (higher, louder) first beat per bar
+- "counting": every beat of the bar has its own pitch, rising from beat 1, so
+  the listener can count along ("1, 2, 3 / 1, 2, 3") by ear
+
+Beat onsets for the whole track are computed at once and the tones written
+with one fancy-indexed assignment per beat kind; synthesis and framing take
+roughly 10 ms per minute of audio (30-55 ms for a 5 minute track). Output is
+mono 16-bit PCM WAV. The most recent tracks are kept as raw bytes in a small
+LRU (RHYTHM_CACHE_BYTES): a shared TypedCache would cost more than synthesis,
+since every hit re-inflates and re-decodes up to 26 MB, and repeat clients are
+already served by the parameter ETag.
+
+Speech post-processing: Gemini TTS returns headerless 16-bit PCM (L16,
+24 kHz). `speech_to_wav` downmixes, resamples to 16 kHz, trims silence,
+normalizes loudness and wraps the result in a RIFF/WAV container, either as
+16-bit PCM or as 8-bit G.711 mu-law for clients that ask for it.
+"""
+
+import base64
+import binascii
+import re
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 22050
+MIN_BPM = 30
+MAX_BPM = 240
+MAX_DURATION_SECONDS = 600
+PATTERNS = ("click", "counting")
+
+# Click length; shortened when beats come faster than this
+TONE_SECONDS = 0.06
+ACCENT_GAIN = 1.0
+BEAT_GAIN = 0.55
+CLICK_HZ = 1000.0
+ACCENT_HZ = 1500.0
+# Counting tones climb a major scale from A4, one step per beat of the bar
+COUNTING_STEPS = [0, 2, 4, 5, 7, 9, 11, 12]
+COUNTING_BASE_HZ = 440.0
+
+# Recently served rhythm tracks, least recently used first, bounded by total size
+RHYTHM_CACHE_BYTES = 64 * 1024 * 1024
+_rhythm_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_rhythm_cache_size = 0
+_rhythm_cache_lock = threading.Lock()
+
+
+def beats_for_activity(activity_id: str) -> int:
+    """Default beats per bar for an activity (counting in 3s, 4s or 5s), stable per id."""
+    return 3 + zlib.crc32(activity_id.encode("utf-8")) % 3
+
+
+def tone(frequency: float, length: int, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """A sine burst with a 2 ms attack and exponential decay."""
+    t = np.arange(length, dtype=np.float32) / sample_rate
+    envelope = np.exp(-t * (6.0 / TONE_SECONDS)).astype(np.float32)
+    attack = min(length, int(0.002 * sample_rate))
+    envelope[:attack] *= np.linspace(0.0, 1.0, attack, dtype=np.float32)
+    return np.sin(2 * np.pi * frequency * t) * envelope
+
+
+def rhythm_track(bpm: float, duration: float, beats_per_bar: int = 4, pattern: str = "click",
+                 sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Samples (int16) of `duration` seconds of `pattern` at `bpm`."""
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown pattern '{pattern}'; expected one of {', '.join(PATTERNS)}")
+    if not MIN_BPM <= bpm <= MAX_BPM:
+        raise ValueError(f"bpm must be within {MIN_BPM}-{MAX_BPM}")
+    if not 0 < duration <= MAX_DURATION_SECONDS:
+        raise ValueError(f"duration must be within 0-{MAX_DURATION_SECONDS} seconds")
+    beats_per_bar = max(1, min(beats_per_bar, len(COUNTING_STEPS)))
+
+    total = int(round(duration * sample_rate))
+    beat_seconds = 60.0 / bpm
+    # Onsets from the exact beat times, so rounding never accumulates into drift
+    onsets = np.round(np.arange(int(np.ceil(duration / beat_seconds))) * beat_seconds * sample_rate).astype(np.int64)
+    positions = np.arange(len(onsets)) % beats_per_bar
+
+    length = min(int(TONE_SECONDS * sample_rate), int(beat_seconds * sample_rate) - 1)
+    track = np.zeros(total, dtype=np.float32)
+    offsets = np.arange(length)
+    for position in range(beats_per_bar):
+        if pattern == "counting":
+            frequency = COUNTING_BASE_HZ * 2 ** (COUNTING_STEPS[position] / 12)
+        else:
+            frequency = ACCENT_HZ if position == 0 else CLICK_HZ
+        gain = ACCENT_GAIN if position == 0 else BEAT_GAIN
+        index = onsets[positions == position][:, None] + offsets[None, :]
+        valid = index < total
+        # Clicks never overlap (length < one beat), so plain assignment is enough
+        track[index[valid]] = np.broadcast_to(gain * tone(frequency, length, sample_rate), index.shape)[valid]
+
+    return np.round(track * (0.9 * 32767)).astype(np.int16)
+
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_MULAW = 7
+
+
+def wav_container(data: bytes, sample_rate: int, channels: int = 1, bits: int = 16,
+                  format_tag: int = WAVE_FORMAT_PCM) -> bytes:
+    """RIFF/WAV header plus `data` (the wave module only writes PCM)."""
+    block_align = channels * bits // 8
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(data), b"WAVE",
+        b"fmt ", 16, format_tag, channels, sample_rate, sample_rate * block_align, block_align, bits,
+        b"data", len(data),
+    )
+    return header + data + (b"\x00" if len(data) % 2 else b"")
+
+
+def to_wav(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    return wav_container(samples.astype("<i2").tobytes(), sample_rate)
+
+
+def rhythm_wav(bpm: float, duration: float, beats_per_bar: int = 4, pattern: str = "click",
+               sample_rate: int = SAMPLE_RATE) -> bytes:
+    """WAV bytes for the given parameters, from the recent-tracks LRU when possible."""
+    global _rhythm_cache_size
+    key = f"{pattern}:{bpm:g}:{duration:g}:{beats_per_bar}:{sample_rate}"
+    with _rhythm_cache_lock:
+        audio = _rhythm_cache.get(key)
+        if audio is not None:
+            _rhythm_cache.move_to_end(key)
+            return audio
+
+    audio = to_wav(rhythm_track(bpm, duration, beats_per_bar, pattern, sample_rate), sample_rate)
+    with _rhythm_cache_lock:
+        if key not in _rhythm_cache and len(audio) <= RHYTHM_CACHE_BYTES:
+            _rhythm_cache[key] = audio
+            _rhythm_cache_size += len(audio)
+            while _rhythm_cache_size > RHYTHM_CACHE_BYTES:
+                _, evicted = _rhythm_cache.popitem(last=False)
+                _rhythm_cache_size -= len(evicted)
+    return audio
+
+
+# --- Speech post-processing ---
+
+TTS_SAMPLE_RATE = 24000
+SPEECH_SAMPLE_RATE = 16000
+ENCODINGS = ("pcm16", "mulaw")
+MEDIA_TYPES = {"pcm16": "audio/wav", "mulaw": "audio/vnd.wave;codec=7"}
+
+# Frames quieter than this (relative to full scale) count as silence when trimming
+SILENCE_DBFS = -45.0
+SILENCE_FRAME_SECONDS = 0.01
+SILENCE_PADDING_SECONDS = 0.05
+# RMS loudness target, with the peak kept below PEAK_DBFS
+TARGET_DBFS = -20.0
+PEAK_DBFS = -1.0
+
+_BASE64 = re.compile(rb"[A-Za-z0-9+/=\s]+")
+
+
+def parse_pcm_mime(mime_type: Optional[str]) -> Tuple[int, int]:
+    """(sample rate, channels) from e.g. "audio/L16;codec=pcm;rate=24000"."""
+    params = dict(
+        part.strip().lower().split("=", 1)
+        for part in (mime_type or "").split(";")[1:]
+        if "=" in part
+    )
+    return int(params.get("rate", TTS_SAMPLE_RATE)), int(params.get("channels", 1))
+
+
+def decode_pcm(data, mime_type: Optional[str] = None) -> Tuple[np.ndarray, int]:
+    """
+    Float samples (frames x channels, in [-1, 1]) and the sample rate of TTS
+    output. Accepts raw bytes, base64 (str or bytes), L16 or a WAV container.
+    """
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    elif not data.startswith(b"RIFF") and _BASE64.fullmatch(data[:4096]):
+        # Raw PCM practically never stays inside the base64 alphabet this long
+        try:
+            data = base64.b64decode(data, validate=False)
+        except binascii.Error:
+            pass
+
+    sample_rate, channels = parse_pcm_mime(mime_type)
+    if data.startswith(b"RIFF") and data[8:12] == b"WAVE":
+        data, sample_rate, channels = _wav_pcm(data)
+    # Gemini labels its output L16 but sends little-endian samples (as its own examples write them)
+    samples = np.frombuffer(data[: len(data) // 2 * 2], dtype="<i2")
+    frames = samples[: len(samples) // channels * channels].reshape(-1, channels)
+    return frames.astype(np.float32) / 32768.0, sample_rate
+
+
+def _wav_pcm(data: bytes) -> Tuple[bytes, int, int]:
+    position = 12
+    sample_rate, channels = TTS_SAMPLE_RATE, 1
+    while position + 8 <= len(data):
+        chunk_id, size = struct.unpack("<4sI", data[position:position + 8])
+        body = data[position + 8:position + 8 + size]
+        if chunk_id == b"fmt ":
+            _, channels, sample_rate = struct.unpack("<HHI", body[:8])
+        elif chunk_id == b"data":
+            return body, sample_rate, channels
+        position += 8 + size + (size % 2)
+    raise ValueError("WAV data has no data chunk")
+
+
+def _lowpass(samples: np.ndarray, cutoff: float, taps: int = 31) -> np.ndarray:
+    """Windowed-sinc FIR low-pass; `cutoff` is a fraction of the sample rate."""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return np.convolve(samples, (kernel / kernel.sum()).astype(np.float32), mode="same")
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Mono resampling by linear interpolation, low-passed first when downsampling."""
+    if source_rate == target_rate or not len(samples):
+        return samples
+    if target_rate < source_rate:
+        samples = _lowpass(samples, 0.45 * target_rate / source_rate)
+    length = int(round(len(samples) * target_rate / source_rate))
+    positions = np.arange(length, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    frame = max(1, int(SILENCE_FRAME_SECONDS * sample_rate))
+    count = len(samples) // frame
+    if not count:
+        return samples
+    rms = np.sqrt(np.mean(samples[:count * frame].reshape(count, frame) ** 2, axis=1))
+    loud = np.flatnonzero(rms > 10 ** (SILENCE_DBFS / 20))
+    if not len(loud):
+        return samples[:0]
+    padding = int(SILENCE_PADDING_SECONDS * sample_rate)
+    start = max(0, loud[0] * frame - padding)
+    end = min(len(samples), (loud[-1] + 1) * frame + padding)
+    return samples[start:end]
+
+
+def normalize_loudness(samples: np.ndarray) -> np.ndarray:
+    """RMS normalization to TARGET_DBFS, limited so the peak stays at PEAK_DBFS."""
+    if not len(samples):
+        return samples
+    rms = float(np.sqrt(np.mean(samples ** 2)))
+    peak = float(np.max(np.abs(samples)))
+    if rms == 0 or peak == 0:
+        return samples
+    gain = min(10 ** (TARGET_DBFS / 20) / rms, 10 ** (PEAK_DBFS / 20) / peak)
+    return samples * np.float32(gain)
+
+
+def mulaw_encode(samples: np.ndarray) -> np.ndarray:
+    """G.711 mu-law bytes for float samples in [-1, 1]."""
+    pcm = np.clip(np.round(samples * 32768.0), -32768, 32767).astype(np.int32)
+    sign = (pcm < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(pcm), 32635) + 0x84
+    exponent = np.clip(np.floor(np.log2(magnitude)).astype(np.int32) - 7, 0, 7)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+
+
+def mulaw_decode(codes: np.ndarray) -> np.ndarray:
+    codes = ~codes.astype(np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    magnitude = ((((codes & 0x0F) << 3) + 0x84) << exponent) - 0x84
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.float32) / 32768.0
+
+
+def negotiate_encoding(accept: Optional[str]) -> str:
+    """"mulaw" when the Accept header asks for mu-law (audio/basic, codec=7, x-mulaw), else "pcm16"."""
+    accept = (accept or "").lower()
+    if "codec=7" in accept or "mulaw" in accept or "mu-law" in accept or "audio/basic" in accept:
+        return "mulaw"
+    return "pcm16"
+
+
+def speech_to_wav(data, mime_type: Optional[str] = None, sample_rate: Optional[int] = SPEECH_SAMPLE_RATE,
+                  encoding: str = "pcm16", trim: bool = True, normalize: bool = True) -> bytes:
+    """
+    TTS output to a WAV file: downmixed to mono, resampled to `sample_rate`
+    (None keeps the source rate), silence-trimmed, loudness-normalized and
+    encoded as 16-bit PCM or 8-bit mu-law.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}'; expected one of {', '.join(ENCODINGS)}")
+    frames, source_rate = decode_pcm(data, mime_type)
+    samples = frames.mean(axis=1) if frames.shape[1] > 1 else frames[:, 0]
+    target_rate = sample_rate or source_rate
+    samples = resample(samples, source_rate, target_rate)
+    if trim:
+        samples = trim_silence(samples, target_rate)
+    if normalize:
+        samples = normalize_loudness(samples)
+
+    if encoding == "mulaw":
+        return wav_container(mulaw_encode(samples).tobytes(), target_rate, bits=8, format_tag=WAVE_FORMAT_MULAW)
+    pcm = np.clip(np.round(samples * 32768.0), -32768, 32767).astype("<i2")
+    return wav_container(pcm.tobytes(), target_rate)
@@ -0,0 +1,95 @@
+"""
+Tenant Config Store
+
+Per-tenant application configuration served from an immutable in-memory
+snapshot. Reads never lock: they take whatever snapshot is current. Writes
+build a new snapshot (copy-on-write) under a lock and swap it in, so a
+request never observes a half-applied update and tenants never race on a
+shared mutable config object.
+
+On disk the default tenant keeps the original flat backend_config.json layout;
+other tenants live under a "tenants" key. Every update rewrites the file, so
+call update() from a thread in async code. At most `max_tenants` tenants are
+stored.
+"""
+
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+from ..models import AppConfig, ConfigUpdateRequest
+from ..util import fastjson
+
+DEFAULT_TENANT = "default"
+DEFAULT_CONFIG_FILE = Path(__file__).resolve().parent.parent / "backend_config.json"
+
+
+class ConfigStore:
+    def __init__(self, path: Path = DEFAULT_CONFIG_FILE, max_tenants: int = 100):
+        self.path = path
+        self.max_tenants = max_tenants
+        self._lock = threading.Lock()
+        self._snapshot: Mapping[str, AppConfig] = MappingProxyType(self._load())
+
+    def _load(self) -> Dict[str, AppConfig]:
+        configs = {DEFAULT_TENANT: AppConfig()}
+        if not self.path.exists():
+            return configs
+        try:
+            data = fastjson.loads(self.path.read_bytes())
+            tenants = data.pop("tenants", {}) or {}
+            configs[DEFAULT_TENANT] = AppConfig(**data)
+            for tenant_id, tenant_data in tenants.items():
+                configs[tenant_id] = AppConfig(**tenant_data)
+            print(f"[Config] Loaded config from file: provider={configs[DEFAULT_TENANT].model_provider}, tenants={len(configs)}")
+        except Exception as e:
+            print(f"[Config] Failed to load config file: {e}")
+        return configs
+
+    def _save(self, snapshot: Mapping[str, AppConfig]):
+        try:
+            data = snapshot[DEFAULT_TENANT].model_dump()
+            data["tenants"] = {
+                tenant_id: config.model_dump()
+                for tenant_id, config in snapshot.items()
+                if tenant_id != DEFAULT_TENANT
+            }
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_bytes(fastjson.dumps(data, indent=True))
+            tmp_path.replace(self.path)
+            print(f"[Config] Persistent config saved to {self.path.name}")
+        except Exception as e:
+            print(f"[Config] Failed to save config: {e}")
+
+    def snapshot(self) -> Mapping[str, AppConfig]:
+        """The current read-only mapping of tenant id -> config."""
+        return self._snapshot
+
+    @staticmethod
+    def _config_for(snapshot: Mapping[str, AppConfig], tenant_id: str) -> AppConfig:
+        config = snapshot.get(tenant_id)
+        if config is not None:
+            return config
+        # Tenant ids are unauthenticated: a new tenant only inherits the default
+        # model choice, never the default tenant's personal details or API key
+        default = snapshot[DEFAULT_TENANT]
+        return AppConfig(model_provider=default.model_provider, model_name=default.model_name)
+
+    def get(self, tenant_id: str) -> AppConfig:
+        """Config for a tenant; unknown tenants get the default tenant's model choice only."""
+        return self._config_for(self._snapshot, tenant_id)
+
+    def update(self, tenant_id: str, request: ConfigUpdateRequest) -> AppConfig:
+        """Apply the non-None fields of `request` for one tenant and persist; OverflowError if there's no room for a new tenant."""
+        changes = request.model_dump(exclude_none=True)
+        with self._lock:
+            if tenant_id not in self._snapshot and len(self._snapshot) >= self.max_tenants:
+                raise OverflowError("Tenant limit reached")
+            current = self._config_for(self._snapshot, tenant_id)
+            updated = current.model_copy(update=changes)
+            snapshot = dict(self._snapshot)
+            snapshot[tenant_id] = updated
+            self._snapshot = MappingProxyType(snapshot)
+            self._save(self._snapshot)
+        return updated
@@ -0,0 +1,138 @@
+"""
+Curriculum Content Store
+
+Precomputed curricula for every (week, mood) pair, several variants each,
+written by `python -m backend.precompute` and served by /api/curriculum.
+
+Rows live in a SQLite file keyed by (week, mood, variant). An in-memory index
+of which variants exist lets the request path decide hit/miss without a
+query; a hit is then a single primary-key lookup. The index is rebuilt when
+another connection (a running precompute job) commits new rows.
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..models import DailyCurriculum
+from ..util.cache import decode_payload, encode_payload
+
+WEEKS = range(1, 41)
+# Mirrors the frontend's Mood enum; "" is the no-mood curriculum
+MOODS = ["", "HAPPY", "CALM", "TIRED", "ANXIOUS", "ENERGETIC"]
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent / "data" / "curricula.sqlite3"
+
+
+def normalize_mood(mood: Optional[str]) -> str:
+    return (mood or "").strip().upper()
+
+
+class ContentStore:
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS curricula (
+                week INTEGER NOT NULL,
+                mood TEXT NOT NULL,
+                variant INTEGER NOT NULL,
+                model TEXT,
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (week, mood, variant)
+            ) WITHOUT ROWID
+            """
+        )
+        self._index: Dict[Tuple[int, str], List[int]] = {}
+        self._data_version = None
+        self._refresh_index()
+
+    def _refresh_index(self):
+        # data_version changes whenever another connection commits
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        index: Dict[Tuple[int, str], List[int]] = {}
+        for week, mood, variant in self._conn.execute(
+            "SELECT week, mood, variant FROM curricula ORDER BY week, mood, variant"
+        ):
+            index.setdefault((week, mood), []).append(variant)
+        self._index = index
+        self._data_version = version
+
+    def variants(self, week: int, mood: Optional[str]) -> List[int]:
+        with self._lock:
+            self._refresh_index()
+            return list(self._index.get((week, normalize_mood(mood)), []))
+
+    def has(self, week: int, mood: Optional[str], variant: int) -> bool:
+        return variant in self.variants(week, mood)
+
+    def get(self, week: int, mood: Optional[str], variant: int) -> Optional[DailyCurriculum]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM curricula WHERE week = ? AND mood = ? AND variant = ?",
+                (week, normalize_mood(mood), variant),
+            ).fetchone()
+        if not row:
+            return None
+        return DailyCurriculum.model_validate_json(decode_payload(bytes(row[0])))
+
+    def pick(self, week: int, mood: Optional[str], day: Optional[datetime.date] = None) -> Optional[DailyCurriculum]:
+        """Today's variant for (week, mood), rotating daily; None if nothing was precomputed."""
+        variants = self.variants(week, mood)
+        if not variants:
+            return None
+        day = day or datetime.date.today()
+        return self.get(week, mood, variants[day.toordinal() % len(variants)])
+
+    def put(self, week: int, mood: Optional[str], variant: int, curriculum: DailyCurriculum, model: Optional[str] = None):
+        mood = normalize_mood(mood)
+        payload = encode_payload(curriculum.model_dump_json(exclude_defaults=True).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO curricula (week, mood, variant, model, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (week, mood, variant, model, sqlite3.Binary(payload), time.time()),
+            )
+            variants = self._index.setdefault((week, mood), [])
+            if variant not in variants:
+                variants.append(variant)
+                variants.sort()
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return sum(len(v) for v in self._index.values())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[ContentStore] = None
+
+
+def get_content_store() -> Optional[ContentStore]:
+    """The store named by GARBHVEDA_CONTENT_STORE (default backend/data/curricula.sqlite3), if it exists."""
+    global _store
+    if _store is None:
+        path = Path(os.getenv("GARBHVEDA_CONTENT_STORE") or DEFAULT_STORE_PATH)
+        if not path.exists():
+            # Nothing precomputed yet; don't create an empty store from the request path
+            return None
+        try:
+            _store = ContentStore(path)
+            print(f"[Content Store] Loaded {_store.count()} precomputed curricula from {path}")
+        except Exception as e:
+            print(f"[Content Store] Could not open {path}: {e}")
+            return None
+    return _store
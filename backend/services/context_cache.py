@@ -0,0 +1,55 @@
+"""
+Provider Context Cache Usage
+
+Every generator sends the same SYSTEM_INSTRUCTION ahead of its prompt. Gemini
+and Groq both cache repeated prompt prefixes on their own and bill the reused
+part at the cached-token rate, so there is nothing to manage here. This module
+only records the prompt and cached token counts each response reports, so
+`stats()` shows how much of our prompts the providers are actually reusing.
+
+An explicit Gemini cache (`client.caches.create` / `cached_content`) is not
+used: it rejects contexts under about 1024 tokens, and the shared instruction
+is a small fraction of that.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+
+class ContextCacheUsage:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+        }
+
+    def record_usage(self, prompt_tokens: Optional[int], cached_tokens: Optional[int]):
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["prompt_tokens"] += prompt_tokens or 0
+            self.counters["cached_tokens"] += cached_tokens or 0
+
+    def stats(self) -> Dict[str, Any]:
+        prompt_tokens = self.counters["prompt_tokens"]
+        return {
+            **self.counters,
+            "cached_token_ratio": round(self.counters["cached_tokens"] / prompt_tokens, 3) if prompt_tokens else 0.0,
+        }
+
+
+_usage: Optional[ContextCacheUsage] = None
+
+
+def get_context_cache() -> ContextCacheUsage:
+    """Process-wide usage counters."""
+    global _usage
+    if _usage is None:
+        _usage = ContextCacheUsage()
+    return _usage
+
+
+def set_context_cache(usage: ContextCacheUsage):
+    global _usage
+    _usage = usage
@@ -0,0 +1,174 @@
+"""
+Background Jobs
+
+In-process job queue for generations that take tens of seconds. A route that
+opts in returns 202 with a job ID straight away; a bounded pool of worker
+tasks runs the job, and the client fetches the result from /api/jobs/{id}
+(polling, or SSE). Submitting a job identical to one that is still pending or
+running returns the existing job instead of doing the work twice, and
+finished jobs are kept for `result_ttl` seconds.
+
+Jobs run in the submitting request's context, so per-tenant model selection
+(see llm_service.use_model_config) carries over to the worker.
+"""
+
+import asyncio
+import contextvars
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    key: Tuple
+    factory: Callable[[], Awaitable[Any]]
+    context: contextvars.Context
+    status: str = PENDING
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    finished: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == DONE:
+            data["result"] = self.result
+        if self.status == FAILED:
+            data["error"] = self.error
+        return data
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 4, result_ttl: float = 15 * 60, max_pending: int = 100):
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self.max_pending = max_pending
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[Tuple, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+
+    def start(self):
+        """Start the worker tasks on the running loop (called from the app lifespan)."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.max_workers)]
+        print(f"[Jobs] Started {self.max_workers} workers")
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for pending and running jobs to finish; True if they all did."""
+        waits = [asyncio.ensure_future(job.finished.wait()) for job in self._active.values()]
+        if not waits:
+            return True
+        print(f"[Jobs] Draining {len(waits)} unfinished jobs")
+        _, unfinished = await asyncio.wait(waits, timeout=timeout)
+        for wait in unfinished:
+            wait.cancel()
+        return not unfinished
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(self, kind: str, key: Tuple, factory: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        Queue `factory()` as a job. `key` identifies identical work: while a job
+        with the same (kind, key) is pending or running, it is returned instead.
+        """
+        self._purge()
+        if not self._workers:
+            self.start()
+
+        existing = self._active.get((kind, key))
+        if existing is not None:
+            print(f"[Jobs] Reusing {existing.status} job {existing.id} for {kind}")
+            return existing
+
+        if self._queue.qsize() >= self.max_pending:
+            raise OverflowError("Job queue is full")
+
+        job = Job(id=uuid.uuid4().hex, kind=kind, key=key, factory=factory, context=contextvars.copy_context())
+        self._jobs[job.id] = job
+        self._active[(kind, key)] = job
+        self._queue.put_nowait(job)
+        print(f"[Jobs] Queued {kind} job {job.id} ({self._queue.qsize()} waiting)")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: Optional[float] = None) -> Job:
+        try:
+            await asyncio.wait_for(job.finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            # Run inside the submitter's context (tenant model config etc.)
+            task = asyncio.create_task(job.factory(), context=job.context)
+            job.result = await task
+            job.status = DONE
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "Cancelled"
+            raise
+        except Exception as e:
+            print(f"[Jobs] {job.kind} job {job.id} failed: {e}")
+            job.status = FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self._active.pop((job.kind, job.key), None)
+            job.finished.set()
+            print(f"[Jobs] {job.kind} job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+    def _purge(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.is_finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, int]:
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {"workers": len(self._workers), **counts}
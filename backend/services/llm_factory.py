@@ -6,10 +6,33 @@ Supports multiple providers: Gemini (Google) and Groq.
 """
 
 import os
-from typing import Optional, Any, Dict
+from abc import ABC, abstractmethod
+from typing import Optional, Any, Dict, AsyncIterator, Type, TypeVar
 from enum import Enum
 from dataclasses import dataclass
 
+from pydantic import BaseModel, ValidationError
+
+from ..util import fastjson
+from ..util.deadline import remaining, deadline_timeout
+from .context_cache import ContextCacheUsage, get_context_cache
+
+T = TypeVar("T", bound=BaseModel)
+
+# Sent once when a structured response fails validation; much cheaper than
+# regenerating the whole answer because the model only has to fix the JSON.
+REPAIR_PROMPT = """The JSON below does not match the required schema.
+
+Validation errors:
+{errors}
+
+JSON:
+{text}
+
+Return ONLY the corrected JSON object matching this JSON schema, keeping all existing content:
+{schema}
+"""
+
 class ModelProvider(Enum):
     GEMINI = "gemini"
     GROQ = "groq"
@@ -61,30 +84,105 @@ class LLMFactory:
         return GroqWrapper(client, config.model_name, config.temperature, config.max_tokens)
 
 
-class GeminiWrapper:
+class BaseLLMWrapper(ABC):
+    """Provider-independent helpers shared by the wrappers."""
+
+    @abstractmethod
+    def generate(self, prompt: str, system_instruction: Optional[str] = None,
+                 response_format: Optional[str] = None,
+                 response_schema: Optional[Type[BaseModel]] = None) -> str:
+        ...
+
+    @abstractmethod
+    def generate_stream(self, prompt: str, system_instruction: Optional[str] = None,
+                        response_format: Optional[str] = None) -> AsyncIterator[str]:
+        ...
+
+    def generate_structured(self, model_cls: Type[T], prompt: str,
+                            system_instruction: Optional[str] = None) -> T:
+        """
+        Generate a response constrained to `model_cls`'s JSON schema.
+
+        The output is validated in a single pass with `model_validate_json`.
+        If validation fails, one targeted repair call is made with the errors
+        before giving up (raising pydantic.ValidationError).
+        """
+        text = self.generate(prompt, system_instruction, response_format="json", response_schema=model_cls)
+        try:
+            return model_cls.model_validate_json(text or "")
+        except ValidationError as e:
+            print(f"[LLM] {model_cls.__name__} validation failed, attempting repair: {e.error_count()} errors")
+            repair_prompt = REPAIR_PROMPT.format(
+                errors=e,
+                text=text,
+                schema=fastjson.dumps_str(model_cls.model_json_schema()),
+            )
+            repaired = self.generate(repair_prompt, None, response_format="json", response_schema=model_cls)
+            return model_cls.model_validate_json(repaired or "")
+
+
+class GeminiWrapper(BaseLLMWrapper):
     """Wrapper for Gemini client to provide unified interface."""
     
-    def __init__(self, client: Any, model_name: str):
+    def __init__(self, client: Any, model_name: str, context_cache: Optional[ContextCacheUsage] = None):
         self.client = client
         self.model_name = model_name
+        self._context_cache = context_cache
+
+    @property
+    def context_cache(self) -> ContextCacheUsage:
+        return self._context_cache or get_context_cache()
+
+    def _record_usage(self, usage: Any):
+        if usage is not None:
+            self.context_cache.record_usage(
+                getattr(usage, "prompt_token_count", None), getattr(usage, "cached_content_token_count", None)
+            )
     
-    def generate(self, prompt: str, system_instruction: Optional[str] = None, 
-                 response_format: Optional[str] = None) -> str:
-        """Generate text using Gemini."""
+    def _config(self, system_instruction: Optional[str], response_format: Optional[str],
+                response_schema: Optional[Type[BaseModel]] = None):
         from google.genai import types
-        
+
         config_kwargs = {}
         if system_instruction:
             config_kwargs["system_instruction"] = system_instruction
         if response_format == "json":
             config_kwargs["response_mime_type"] = "application/json"
-        
+            if response_schema is not None:
+                config_kwargs["response_schema"] = response_schema
+        if remaining() is not None:
+            # Don't let one call outlive the request's deadline (timeout is in ms)
+            config_kwargs["http_options"] = types.HttpOptions(timeout=int(deadline_timeout(120.0) * 1000))
+        return types.GenerateContentConfig(**config_kwargs) if config_kwargs else None
+
+    def generate(self, prompt: str, system_instruction: Optional[str] = None, 
+                 response_format: Optional[str] = None,
+                 response_schema: Optional[Type[BaseModel]] = None) -> str:
+        """Generate text using Gemini."""
         response = self.client.models.generate_content(
             model=self.model_name,
             contents=prompt,
-            config=types.GenerateContentConfig(**config_kwargs) if config_kwargs else None
+            config=self._config(system_instruction, response_format, response_schema)
         )
+        # Gemini caches repeated prompt prefixes implicitly; record how much of ours it reused
+        self._record_usage(getattr(response, "usage_metadata", None))
         return response.text
+
+    async def generate_stream(self, prompt: str, system_instruction: Optional[str] = None,
+                              response_format: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream text chunks from Gemini as they are generated."""
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=prompt,
+            config=self._config(system_instruction, response_format)
+        )
+        usage = None
+        async for chunk in stream:
+            # Usage is reported on the final chunk
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            if chunk.text:
+                yield chunk.text
+        self._record_usage(usage)
     
     async def generate_async(self, prompt: str, system_instruction: Optional[str] = None,
                             response_format: Optional[str] = None) -> str:
@@ -93,7 +191,7 @@ class GeminiWrapper:
         return self.generate(prompt, system_instruction, response_format)
 
 
-class GroqWrapper:
+class GroqWrapper(BaseLLMWrapper):
     """Wrapper for Groq client to provide unified interface."""
     
     def __init__(self, client: Any, model_name: str, temperature: float = 0.7, max_tokens: int = 4096):
@@ -101,12 +199,18 @@ class GroqWrapper:
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self._async_client = None
     
-    def generate(self, prompt: str, system_instruction: Optional[str] = None,
-                 response_format: Optional[str] = None) -> str:
-        """Generate text using Groq."""
+    def _request_kwargs(self, prompt: str, system_instruction: Optional[str],
+                        response_format: Optional[str],
+                        response_schema: Optional[Type[BaseModel]] = None) -> Dict[str, Any]:
         messages = []
         
+        if response_schema is not None:
+            # Groq JSON mode doesn't take a schema, so describe it in the system prompt
+            schema_instruction = f"Respond with a JSON object matching this JSON schema:\n{fastjson.dumps_str(response_schema.model_json_schema())}"
+            system_instruction = f"{system_instruction}\n\n{schema_instruction}" if system_instruction else schema_instruction
+
         if system_instruction:
             messages.append({"role": "system", "content": system_instruction})
         
@@ -121,9 +225,37 @@ class GroqWrapper:
         
         if response_format == "json":
             kwargs["response_format"] = {"type": "json_object"}
-        
+        if remaining() is not None:
+            kwargs["timeout"] = deadline_timeout(60.0)
+        return kwargs
+
+    def generate(self, prompt: str, system_instruction: Optional[str] = None,
+                 response_format: Optional[str] = None,
+                 response_schema: Optional[Type[BaseModel]] = None) -> str:
+        """Generate text using Groq."""
+        kwargs = self._request_kwargs(prompt, system_instruction, response_format, response_schema)
         response = self.client.chat.completions.create(**kwargs)
+        # Groq caches shared prompt prefixes on its own; record how much of ours it reused
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            get_context_cache().record_usage(getattr(usage, "prompt_tokens", None), getattr(details, "cached_tokens", None))
         return response.choices[0].message.content
+
+    async def generate_stream(self, prompt: str, system_instruction: Optional[str] = None,
+                              response_format: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream text chunks from Groq as they are generated."""
+        if self._async_client is None:
+            # The sync client would block the event loop while iterating the stream
+            from groq import AsyncGroq
+            self._async_client = AsyncGroq(api_key=self.client.api_key)
+
+        # Groq's JSON mode doesn't support streaming; the prompt already asks for JSON
+        kwargs = self._request_kwargs(prompt, system_instruction, None)
+        stream = await self._async_client.chat.completions.create(stream=True, **kwargs)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
     
     async def generate_async(self, prompt: str, system_instruction: Optional[str] = None,
                             response_format: Optional[str] = None) -> str:
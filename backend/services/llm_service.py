@@ -1,32 +1,21 @@
 import os
 import json
-import base64
-import requests
 import httpx
-from google import genai
-from google.genai import types
-from fastapi import HTTPException
-from dotenv import load_dotenv
 from jinja2 import Template
-from ..models import DailyCurriculum, Activity, DreamInterpretationRequest, DreamInterpretationResponse, Resource, FinancialWisdomResponse, RhythmicMathResponse, RaagaResponse, MantraResponse, Sankalpa
+from ..models import DailyCurriculum, Activity, DreamInterpretationRequest, DreamInterpretationResponse, Resource, FinancialWisdomResponse, RhythmicMathResponse, RaagaResponse, MantraResponse, Sankalpa, DadJokesResponse, VedicName, VedicNamesResponse, VedicNamesBatchResponse
 from ..util.logger import setup_logger
+from ..util.env import load_env
 from .llm_factory import LLMFactory, LLMConfig, ModelProvider
+from .wrapper_pool import WrapperPool, key_fingerprint
 from ..util.prompt_loader import prompt_loader
+from ..util.json_stream import IncrementalJSONParser, JSONEvent
 
-logger = setup_logger("gemini_service")
-
-from dotenv import load_dotenv
-from pathlib import Path
+# Provider SDKs (google.genai, groq) and `requests` are imported on first use;
+# clients are built by init_clients() from the app lifespan, or lazily on first call.
 
-# Try loading from .env
-load_dotenv()
+logger = setup_logger("gemini_service")
 
-# If not found, try loading from .env.local in project root
-if not os.getenv("VITE_GEMINI_API_KEY"):
-    # backend/services/gemini_service.py -> backend/services -> backend -> root
-    env_local_path = Path(__file__).resolve().parent.parent.parent / ".env.local"
-    print(f"[Gemini] Attempting to load .env.local from: {env_local_path}")
-    load_dotenv(dotenv_path=env_local_path)
+load_env()
 
 api_key = os.getenv("VITE_GEMINI_API_KEY")
 if not api_key:
@@ -37,7 +26,32 @@ groq_api_key_from_env = os.getenv("GROQ_API_KEY")
 if groq_api_key_from_env:
     print("[Gemini] Found GROQ_API_KEY in environment")
 
-client = genai.Client(api_key=api_key)
+_gemini_client = None
+_react_agent = None
+
+def get_gemini_client():
+    """Return the shared Gemini client, constructing it on first use."""
+    global _gemini_client
+    if _gemini_client is None:
+        from google import genai
+        _gemini_client = genai.Client(api_key=api_key)
+    return _gemini_client
+
+def get_react_agent() -> "ReActYouTubeAgent":
+    """Return the shared ReAct agent, constructing it on first use."""
+    global _react_agent
+    if _react_agent is None:
+        _react_agent = ReActYouTubeAgent(get_gemini_client())
+    return _react_agent
+
+def init_clients():
+    """Build provider clients and the default LLM wrapper up front (called from the app lifespan)."""
+    try:
+        get_react_agent()
+    except Exception as e:
+        # Don't block startup; the client is retried lazily on first use
+        print(f"[Gemini] Could not initialise Gemini client: {e}")
+    _get_llm_wrapper(None, None)
 
 SYSTEM_INSTRUCTION = """
 You are a holistic Garbh Sanskar guide named "GarbhVeda".
@@ -103,32 +117,97 @@ VERIFIED_MANTRA_DATA = [
     }
 ]
 
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator
 import re
+import hashlib
+import contextvars
+import datetime
+import asyncio
+import random
+import time
 from dataclasses import dataclass
+from .youtube_scraper import YouTubeSearchResult, scan_search_results
+from ..util.cache import TypedCache
+from .name_index import get_name_index, name_key, normalize_gender, normalize_theme
+from ..util.deadline import remaining, has_budget, deadline_timeout, expired
+from ..util.batching import MicroBatcher
+from ..util import fastjson
+
+# Shared caches (in-memory, SQLite or Redis; see util/cache.py), so every
+# worker benefits from work any one of them has already paid for.
+CURRICULUM_CACHE_TTL = 6 * 3600
+SEARCH_CACHE_TTL = 3600
+VERIFIED_TTL = 24 * 3600
+UNVERIFIED_TTL = 10 * 60
+GROUNDED_SEARCH_CACHE_TTL = 6 * 3600
+
+# After a provider reports quota exhaustion, optional work (prefetch) holds off this long
+QUOTA_BACKOFF_SECONDS = float(os.getenv("QUOTA_BACKOFF_SECONDS", "300"))
+_quota_exhausted_at: Optional[float] = None
+
+def _is_quota_error(e: Exception) -> bool:
+    """True for a provider 429 / RESOURCE_EXHAUSTED error; remembers when it happened."""
+    global _quota_exhausted_at
+    if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
+        _quota_exhausted_at = time.monotonic()
+        return True
+    return False
 
-# Web scraping for YouTube search
-try:
-    from bs4 import BeautifulSoup
-    WEB_SCRAPING_AVAILABLE = True
-    print("[ReAct Agent] BeautifulSoup loaded for web scraping")
-except ImportError:
-    WEB_SCRAPING_AVAILABLE = False
-    print("[ReAct Agent] Warning: BeautifulSoup not available")
-
-@dataclass
-class YouTubeSearchResult:
-    """Represents a YouTube video found via search"""
-    video_id: str
-    url: str
-    title: str = ""
-    verified: bool = False
+def quota_backoff_remaining() -> float:
+    """Seconds until optional work may use the provider again after a quota error (0 if it may now)."""
+    if _quota_exhausted_at is None:
+        return 0.0
+    return max(0.0, QUOTA_BACKOFF_SECONDS - (time.monotonic() - _quota_exhausted_at))
+
+def _curriculum_ttl(curriculum: DailyCurriculum) -> float:
+    # The quota-exhausted placeholder should be retried soon, not served all day
+    if any(activity.id.startswith("fallback_") for activity in curriculum.activities):
+        return 60
+    # So should a curriculum whose resources were cut short by the deadline
+    if any(_is_search_fallback(r.url) for activity in curriculum.activities for r in activity.resources):
+        return 10 * 60
+    return CURRICULUM_CACHE_TTL
+
+def _is_search_fallback(url: str) -> bool:
+    return url.startswith("https://www.google.com/search?") or url.startswith("https://www.youtube.com/results?")
+
+_curriculum_cache = TypedCache("curriculum", DailyCurriculum, ttl=_curriculum_ttl)
+_youtube_search_cache = TypedCache("youtube_search", List[YouTubeSearchResult], ttl=SEARCH_CACHE_TTL)
+_verification_cache = TypedCache("url_verification", bool, ttl=lambda ok: VERIFIED_TTL if ok else UNVERIFIED_TTL)
+_url_check_cache = TypedCache("url_check", bool, ttl=lambda ok: VERIFIED_TTL if ok else UNVERIFIED_TTL)
+_grounded_search_cache = TypedCache("grounded_search", str, ttl=GROUNDED_SEARCH_CACHE_TTL)
+# Grounding redirect URIs recur across queries; failed resolutions return None and aren't cached
+_redirect_cache = TypedCache("grounding_redirect", str, ttl=GROUNDED_SEARCH_CACHE_TTL)
+REDIRECT_CONCURRENCY = 8
+MAX_REDIRECT_HOPS = 5
+
+# Where search pages and oEmbed are fetched from (a local stand-in under bench/load.py);
+# the video URLs handed out always stay canonical youtube.com links
+YOUTUBE_BASE_URL = os.getenv("YOUTUBE_BASE_URL", "https://www.youtube.com").rstrip("/")
+
+def _is_youtube_url(url: str) -> bool:
+    return "youtube.com/watch" in url or "youtu.be/" in url
+
+# Rough cost of optional stages, used to decide whether they still fit the request's deadline
+GROUNDED_SEARCH_SECONDS = 8.0
+REACT_SEARCH_SECONDS = 6.0
+URL_CHECK_SECONDS = 1.0
+
+def _grounded_search_config():
+    """Google Search grounding config, with the call capped to the request's remaining budget."""
+    from google.genai import types
+
+    config_kwargs = {"tools": [types.Tool(google_search=types.GoogleSearch())]}
+    if remaining() is not None:
+        config_kwargs["http_options"] = types.HttpOptions(timeout=int(deadline_timeout(60.0) * 1000))
+    return types.GenerateContentConfig(**config_kwargs)
 
 class ReActYouTubeAgent:
     """
     ReAct-style agent for finding valid YouTube videos.
-    Uses web scraping to search YouTube directly, then verifies via oEmbed API.
-    
+    Uses web scraping to search YouTube directly. Results parsed from the page's
+    ytInitialData are accepted as-is; oEmbed is kept for bare IDs.
+
     Tools:
     1. search_youtube_direct - Web scrapes YouTube search results
     2. verify_youtube_url - Verifies URL via oEmbed API
@@ -143,55 +222,43 @@ class ReActYouTubeAgent:
         """
         TOOL: Direct YouTube Search via Web Scraping
         Scrapes YouTube search results page to get real video IDs.
-        No API key needed!
+        No API key needed! Results are shared through the search cache.
         """
+        key = f"{query.strip().lower()}:{limit}"
+        videos = await _youtube_search_cache.aget_or_set(key, lambda: self._scrape_youtube_search(query, limit))
+        return videos or []
+
+    async def _scrape_youtube_search(self, query: str, limit: int) -> Optional[List[YouTubeSearchResult]]:
         print(f"[ReAct Agent] 🔍 Web scraping YouTube for: '{query}'")
         
         try:
-            search_url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}"
+            search_url = f"{YOUTUBE_BASE_URL}/results?search_query={query.replace(' ', '+')}"
             
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                 'Accept-Language': 'en-US,en;q=0.9',
             }
             
+            # Stream the page and stop reading as soon as we have enough results;
+            # leaving the stream context closes the connection early.
+            # Each result carries title/channel/duration parsed from ytInitialData.
             async with httpx.AsyncClient() as http_client:
-                response = await http_client.get(search_url, headers=headers, timeout=10.0)
-                html = response.text
-            
-            # Extract video IDs from the JavaScript data in the page
-            # YouTube embeds video data in scripts with pattern "videoId":"XXXXXXXXXXX"
-            video_id_pattern = r'"videoId":"([a-zA-Z0-9_-]{11})"'
-            matches = re.findall(video_id_pattern, html)
-            
-            # Get unique video IDs
-            seen = set()
-            unique_ids = []
-            for vid_id in matches:
-                if vid_id not in seen:
-                    seen.add(vid_id)
-                    unique_ids.append(vid_id)
-                    if len(unique_ids) >= limit:
-                        break
-            
-            videos = []
-            for video_id in unique_ids:
-                url = f"https://www.youtube.com/watch?v={video_id}"
-                videos.append(YouTubeSearchResult(
-                    video_id=video_id,
-                    url=url,
-                    title=""  # We don't extract title in this simple approach
-                ))
-                print(f"[ReAct Agent] Found video ID: {video_id}")
-            
-            print(f"[ReAct Agent] Web scraping returned {len(videos)} video IDs")
-            return videos
+                async with http_client.stream("GET", search_url, headers=headers, timeout=deadline_timeout(10.0)) as response:
+                    videos = await scan_search_results(response.aiter_bytes(), limit)
+
+            for video in videos:
+                print(f"[ReAct Agent] Found video: {video.title[:40] or video.video_id} ({video.video_id})")
+
+            print(f"[ReAct Agent] Web scraping returned {len(videos)} videos")
+            # Empty pages are usually throttling; don't cache them
+            return videos or None
             
         except Exception as e:
             print(f"[ReAct Agent] Web scraping error: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            if not expired():
+                import traceback
+                traceback.print_exc()
+            return None
     """
     ReAct-style agent for finding valid YouTube videos.
     Uses Gemini's Google Search grounding to extract REAL URLs from search results,
@@ -214,14 +281,16 @@ class ReActYouTubeAgent:
         """Verify a YouTube URL is valid using oEmbed API"""
         if not url:
             return False
+        if "youtube.com" not in url and "youtu.be" not in url:
+            return False
+        return bool(await _verification_cache.aget_or_set(url, lambda: self._check_oembed(url)))
+
+    async def _check_oembed(self, url: str) -> Optional[bool]:
         try:
-            if "youtube.com" not in url and "youtu.be" not in url:
-                return False
-            
             print(f"[ReAct Agent] Verifying: {url}")
             async with httpx.AsyncClient() as http_client:
-                oembed_url = f"https://www.youtube.com/oembed?url={url}&format=json"
-                response = await http_client.get(oembed_url, timeout=5.0)
+                oembed_url = f"{YOUTUBE_BASE_URL}/oembed?url={url}&format=json"
+                response = await http_client.get(oembed_url, timeout=deadline_timeout(5.0))
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -232,24 +301,44 @@ class ReActYouTubeAgent:
                     return False
         except Exception as e:
             print(f"[ReAct Agent] ✗ Verification error: {e}")
-            return False
+            # A timeout cut short by the request deadline says nothing about the URL; don't cache it
+            return None if expired() else False
     
-    async def follow_redirect(self, url: str) -> Optional[str]:
-        """Follow a redirect URL to get the final destination"""
+    async def follow_redirect(self, url: str, http_client: Optional[httpx.AsyncClient] = None) -> Optional[str]:
+        """Follow a redirect URL to get the final destination (cached per redirect URL)"""
+        return await _redirect_cache.aget_or_set(url, lambda: self._resolve_redirect(url, http_client))
+
+    async def _resolve_redirect(self, url: str, http_client: Optional[httpx.AsyncClient]) -> Optional[str]:
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as http_client:
-                response = await http_client.head(url, timeout=5.0)
-                final_url = str(response.url)
-                print(f"[ReAct Agent] Redirect: {url[:50]}... -> {final_url[:80]}")
-                return final_url
+            if http_client is None:
+                async with httpx.AsyncClient() as http_client:
+                    final_url = await self._follow_hops(url, http_client)
+            else:
+                final_url = await self._follow_hops(url, http_client)
+            print(f"[ReAct Agent] Redirect: {url[:50]}... -> {final_url[:80]}")
+            return final_url
         except Exception as e:
             print(f"[ReAct Agent] Failed to follow redirect: {e}")
             return None
+
+    async def _follow_hops(self, url: str, http_client: httpx.AsyncClient) -> str:
+        # Hop by hop, stopping at the first YouTube URL: its Location is all we
+        # need, so the video page itself is never requested
+        for _ in range(MAX_REDIRECT_HOPS):
+            response = await http_client.head(url, timeout=deadline_timeout(5.0), follow_redirects=False)
+            location = response.headers.get("location")
+            if not response.is_redirect or not location:
+                break
+            url = str(response.url.join(location))
+            if _is_youtube_url(url):
+                break
+        return url
     
     async def extract_youtube_urls_from_grounding(self, response) -> List[YouTubeSearchResult]:
         """
         Extract YouTube URLs from Gemini's grounding metadata.
-        Follows redirect URLs to get actual destination URLs.
+        Follows redirect URLs to get actual destination URLs, concurrently
+        (at most REDIRECT_CONCURRENCY at a time) over one connection pool.
         """
         results = []
         
@@ -264,32 +353,45 @@ class ReActYouTubeAgent:
                 gm = candidate.grounding_metadata
                 
                 # Extract from grounding chunks (contains actual web search results)
+                chunks = []
                 if hasattr(gm, 'grounding_chunks') and gm.grounding_chunks:
                     for chunk in gm.grounding_chunks:
                         if hasattr(chunk, 'web') and chunk.web:
                             url = chunk.web.uri if hasattr(chunk.web, 'uri') else None
                             title = chunk.web.title if hasattr(chunk.web, 'title') else ""
-                            
-                            if not url:
-                                continue
-                            
-                            # Follow redirect if it's a Google redirect URL
-                            if "vertexaisearch" in url or "grounding-api-redirect" in url:
-                                print(f"[ReAct Agent] Following redirect for: {title[:40]}...")
-                                url = await self.follow_redirect(url)
-                                if not url:
-                                    continue
-                            
-                            # Now check if it's a YouTube URL
-                            if "youtube.com/watch" in url or "youtu.be/" in url:
-                                video_id = self._extract_video_id(url)
-                                if video_id:
-                                    results.append(YouTubeSearchResult(
-                                        video_id=video_id,
-                                        url=f"https://www.youtube.com/watch?v={video_id}",
-                                        title=title
-                                    ))
-                                    print(f"[ReAct Agent] Found YouTube video: {title[:40]}... ({video_id})")
+                            if url:
+                                chunks.append((url, title or ""))
+
+                semaphore = asyncio.Semaphore(REDIRECT_CONCURRENCY)
+
+                async def resolve(url: str, title: str, http_client: httpx.AsyncClient) -> Optional[str]:
+                    # Follow redirect if it's a Google redirect URL
+                    if "vertexaisearch" not in url and "grounding-api-redirect" not in url:
+                        return url
+                    async with semaphore:
+                        print(f"[ReAct Agent] Following redirect for: {title[:40]}...")
+                        return await self.follow_redirect(url, http_client)
+
+                if chunks:
+                    async with httpx.AsyncClient() as http_client:
+                        final_urls = await asyncio.gather(*(resolve(url, title, http_client) for url, title in chunks))
+                else:
+                    final_urls = []
+
+                for (_, title), url in zip(chunks, final_urls):
+                    if not url:
+                        continue
+
+                    # Now check if it's a YouTube URL
+                    if _is_youtube_url(url):
+                        video_id = self._extract_video_id(url)
+                        if video_id and not any(r.video_id == video_id for r in results):
+                            results.append(YouTubeSearchResult(
+                                video_id=video_id,
+                                url=f"https://www.youtube.com/watch?v={video_id}",
+                                title=title
+                            ))
+                            print(f"[ReAct Agent] Found YouTube video: {title[:40]}... ({video_id})")
                             
             # Also try to extract from response text as fallback
             if response.text:
@@ -351,9 +453,7 @@ class ReActYouTubeAgent:
             response = self.client.models.generate_content(
                 model=self.model,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    tools=[types.Tool(google_search=types.GoogleSearch())],
-                )
+                config=_grounded_search_config()
             )
             
             # Debug: Print response structure
@@ -377,7 +477,7 @@ class ReActYouTubeAgent:
                     print(f"[ReAct Agent] No grounding metadata in response")
             
             # Extract URLs from grounding metadata (real search results)
-            results = self.extract_youtube_urls_from_grounding(response)
+            results = await self.extract_youtube_urls_from_grounding(response)
             
             # Filter out known bad URLs
             results = [r for r in results if r.url not in bad_urls]
@@ -410,7 +510,7 @@ class ReActYouTubeAgent:
         # STEP 1: Use Direct YouTube Search (most reliable)
         # Fetch MORE candidates (10) to ensure variety
         print(f"[ReAct Agent] STEP 1: Searching YouTube directly...")
-        results = await self.search_youtube_direct(query, limit=10)
+        results = await self.search_youtube_direct(query, limit=10) if not expired() else []
         
         if results:
             # STEP 2: Verify results until we have a pool of candidates
@@ -418,12 +518,23 @@ class ReActYouTubeAgent:
             
             print(f"[ReAct Agent] STEP 2: Verifying results to build candidate pool...")
             for result in results:
+                if expired():
+                    print(f"[ReAct Agent] Deadline reached; stopping verification")
+                    break
+
                 # SKIP excluded URLs immediately
                 if result.url in exclude_urls:
                     print(f"[ReAct Agent] ⏭ Skipping excluded URL: {result.url}")
                     continue
 
-                is_valid = await self.verify_youtube_url(result.url)
+                # Live streams and Shorts don't make good guided activities
+                if result.is_live or result.is_short:
+                    print(f"[ReAct Agent] ⏭ Skipping {'live stream' if result.is_live else 'Short'}: {result.video_id}")
+                    continue
+
+                # Results parsed from ytInitialData are already known to exist;
+                # oEmbed is only needed for bare IDs without page metadata
+                is_valid = result.verified or await self.verify_youtube_url(result.url)
                 if is_valid:
                     print(f"[ReAct Agent] ✓ Added candidate: '{result.title[:40]}...'")
                     valid_candidates.append(result.url)
@@ -450,12 +561,28 @@ class ReActYouTubeAgent:
         print(f"[ReAct Agent] ⚠ Falling back to search URL: {fallback_url}")
         return fallback_url
 
-# Initialize the ReAct agent
-react_agent = ReActYouTubeAgent(client)
-
 from typing import Optional
 
 async def generate_daily_curriculum(week: int, mood: Optional[str] = None) -> Optional[DailyCurriculum]:
+    """Today's curriculum for (week, mood), generated once per model and shared via the curriculum cache."""
+    return await _curriculum_cache.aget_or_set(_curriculum_key(week, mood), lambda: build_daily_curriculum(week, mood))
+
+def _curriculum_key(week: int, mood: Optional[str]) -> str:
+    selection = _active_model()
+    return ":".join([
+        selection.provider.value,
+        selection.model_name or "default",
+        str(week),
+        (mood or "").strip().lower(),
+        datetime.date.today().isoformat(),
+    ])
+
+async def is_curriculum_cached(week: int, mood: Optional[str] = None) -> bool:
+    """Whether today's curriculum for (week, mood) is already in the curriculum cache for the active model."""
+    return await _curriculum_cache.aget(_curriculum_key(week, mood)) is not None
+
+async def build_daily_curriculum(week: int, mood: Optional[str] = None) -> Optional[DailyCurriculum]:
+    """Generate and resource-resolve a fresh curriculum, bypassing caches (used by the precompute job)."""
     print(f"[Gemini] Generating curriculum content for week {week}, mood: {mood}...")
     
     wrapper = _get_llm_wrapper(None, None) # Use current config
@@ -475,26 +602,14 @@ async def generate_daily_curriculum(week: int, mood: Optional[str] = None) -> Op
     content_prompt = template.render(week=week, mood_instruction=mood_instruction)
 
     try:
-        # Use simple generate (sync) for now as wrappers handle sync/async internally if needed
-        # or we update wrappers to be truly async later. Given current wrappers are sync:
-        text = wrapper.generate(
+        # Schema-constrained generation, validated (and repaired once if needed) by the wrapper
+        curriculum = wrapper.generate_structured(
+            DailyCurriculum,
             prompt=content_prompt,
-            system_instruction=SYSTEM_INSTRUCTION,
-            response_format="json"
+            system_instruction=SYSTEM_INSTRUCTION
         )
-
-        if not text:
-            return None
-
-        curriculum_data = json.loads(text)
-        
-        # Validate structure roughly by trying to parse into Pydantic model
-        # Note: We might need to handle the 'resources' field being empty initially
-        
-        activities_data = curriculum_data.get("activities", [])
-        if not isinstance(activities_data, list):
-             print("[Gemini] Invalid curriculum format received")
-             return None
+        curriculum_data = curriculum.model_dump()
+        activities_data = curriculum_data["activities"]
 
         # Step 2: Find Resources for each activity
         print(f"[Gemini] Finding resources for {len(activities_data)} activities...")
@@ -503,10 +618,13 @@ async def generate_daily_curriculum(week: int, mood: Optional[str] = None) -> Op
         # However, to be efficient, let's just do it sequentially or use simple list comprehension if we make find_resources async.
         # Since we are in an async function, we can await.
         
+        # All activities are resolved together so the whole curriculum costs
+        # one grounded search plus at most a couple of batched repairs.
+        resources_by_id = await find_resources_for_activities(activities_data)
+
         final_activities = []
         for activity in activities_data:
-            resources = await find_resources_for_activity(activity.get("title", ""), activity.get("description", ""), activity.get("category", ""))
-            activity["resources"] = resources
+            activity["resources"] = resources_by_id.get(activity.get("id"), [])
             activity["isCompleted"] = False
             final_activities.append(activity)
             
@@ -516,7 +634,7 @@ async def generate_daily_curriculum(week: int, mood: Optional[str] = None) -> Op
 
     except Exception as e:
         logger.error(f"Error generating curriculum: {e}", exc_info=True)
-        if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
+        if _is_quota_error(e):
              # Return a graceful fallback instead of crashing
             return DailyCurriculum(
                 sankalpa=Sankalpa(
@@ -538,77 +656,88 @@ async def generate_daily_curriculum(week: int, mood: Optional[str] = None) -> Op
             )
         return None
 
-def validate_url(url: str) -> bool:
+async def validate_url(url: str) -> bool:
+    """HEAD/GET reachability check, shared through the URL check cache."""
+    # The check (and any wait on another worker's cache lock) stays off the event loop
+    return bool(await _url_check_cache.aget_or_set(url, lambda: asyncio.to_thread(_check_url_reachable, url)))
+
+def _check_url_reachable(url: str) -> Optional[bool]:
+    import requests
+
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     try:
         print(f"[Gemini] Validating URL: {url}")
-        response = requests.head(url, headers=headers, timeout=5, allow_redirects=True)
+        response = requests.head(url, headers=headers, timeout=deadline_timeout(5.0), allow_redirects=True)
         if response.status_code == 200:
             return True
     except Exception as e:
         print(f"[Gemini] HEAD validation failed for {url}: {e}")
 
+    if expired():
+        # Out of time, not a verdict on the URL; don't cache it
+        return None
+
     try:
         # Fallback to GET if HEAD fails (some servers block HEAD)
-        response = requests.get(url, headers=headers, timeout=5, stream=True)
+        response = requests.get(url, headers=headers, timeout=deadline_timeout(5.0), stream=True)
         if response.status_code == 200:
             return True
         print(f"[Gemini] GET validation failed for {url} with status: {response.status_code}")
     except Exception as e:
         print(f"[Gemini] GET validation error for {url}: {e}")
+        if expired():
+            return None
     
     return False
 
 async def find_single_valid_resource(title: str, description: str, category: str) -> Optional[Resource]:
     # Check current provider
-    if _current_model_provider == ModelProvider.GROQ:
+    if _active_provider() == ModelProvider.GROQ:
         print(f"[Resource Search] Provider is Groq. Using ReAct Agent for {title}")
-        video_url = await react_agent.find_verified_video(f"{title} {category} pregnancy")
+        video_url = await get_react_agent().find_verified_video(f"{title} {category} pregnancy")
         if video_url:
              return Resource(
                 title=f"Video: {title}",
                 url=video_url,
                 description=f"Watch this video for {title}"
             )
-            
+
     # Default to Gemini Search if not Groq
     model = "gemini-2.0-flash"
     for attempt in range(2):
+        if not has_budget(GROUNDED_SEARCH_SECONDS):
+            print(f"[Gemini] No time left for a repair attempt for: {title}")
+            break
         print(f"[Gemini] Repair attempt {attempt+1} for: {title}")
         template_str = prompt_loader.get_template("resource_search_repair")
         template = Template(template_str)
         prompt = template.render(title=title, category=category, description=description)
         
         try:
-            response = client.models.generate_content(
+            response = get_gemini_client().models.generate_content(
                 model=model,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    tools=[types.Tool(google_search=types.GoogleSearch())],
-                )
+                config=_grounded_search_config()
             )
             
             text = response.text
             if not text: continue
 
-            json_str = text
-            if "```json" in text:
-                json_str = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                json_str = text.split("```")[1].split("```")[0].strip()
-            
             try:
-                data = json.loads(json_str)
+                # Grounded calls can't use JSON mode, so recover the object from the text
+                data = _extract_json_object(text)
+                if data is None:
+                    raise ValueError("No JSON object in response")
                 # Handle if it returns a list or single object
                 if "resources" in data and isinstance(data["resources"], list) and len(data["resources"]) > 0:
                     res_data = data["resources"][0]
                 else:
                     res_data = data
 
-                res = Resource(**res_data)
-                if validate_url(res.url):
+                res = Resource.model_validate(res_data)
+                if await validate_url(res.url):
                     print(f"[Gemini] Found valid replacement: {res.url}")
                     return res
                 else:
@@ -618,9 +747,9 @@ async def find_single_valid_resource(title: str, description: str, category: str
                 
         except Exception as e:
             print(f"[Gemini] Error in repair loop: {e}")
-            if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
+            if _is_quota_error(e):
                  print(f"[Gemini] 429 Error in repair loop. Falling back to ReAct Agent.")
-                 video_url = await react_agent.find_verified_video(f"{title} {category} pregnancy")
+                 video_url = await get_react_agent().find_verified_video(f"{title} {category} pregnancy")
                  if video_url:
                      return Resource(
                         title=f"Video: {title}",
@@ -631,21 +760,48 @@ async def find_single_valid_resource(title: str, description: str, category: str
             
     return None
 
+async def _reusable_resources(title: str, description: str, category: str) -> Optional[list[Resource]]:
+    """Validated resources of a sufficiently similar earlier activity, if any (no outbound calls)."""
+    from .resource_index import get_resource_index
+
+    def lookup() -> Optional[list[Resource]]:
+        index = get_resource_index()
+        return index.lookup(title, category, description) if index else None
+
+    # The index reads SQLite and may rebuild its matrix; keep that off the event loop
+    return await asyncio.to_thread(lookup)
+
+async def _remember_resources(title: str, description: str, category: str, resources: list[Resource]):
+    from .resource_index import get_resource_index
+
+    def add():
+        index = get_resource_index()
+        if index:
+            index.add(title, category, description, resources)
+
+    await asyncio.to_thread(add)
+
 async def find_resources_for_activity(title: str, description: str, category: str) -> list[Resource]:
     print(f"[Gemini] Searching resources for: {title}")
+
+    reused = await _reusable_resources(title, description, category)
+    if reused:
+        return reused
     
     # Check current provider
-    # Note: _current_model_provider is a global variable managed by set_model_config
-    if _current_model_provider == ModelProvider.GROQ:
+    # Note: the active provider is resolved per request (see use_model_config)
+    if _active_provider() == ModelProvider.GROQ:
         print(f"[Resource Search] Provider is Groq. Using ReAct Agent to find video.")
         # Groq doesn't support Google Search tool, so we use ReAct agent to find a video
-        video_url = await react_agent.find_verified_video(f"{title} {category} pregnancy")
+        video_url = await get_react_agent().find_verified_video(f"{title} {category} pregnancy")
         if video_url:
-            return [Resource(
+            resources = [Resource(
                 title=f"Video Guide: {title}",
                 url=video_url,
                 description=f"A curated video guide for {title}"
             )]
+            await _remember_resources(title, description, category, resources)
+            return resources
         else:
              # Fallback to general search link
             search_query = f"{title} pregnancy activity {category}"
@@ -663,42 +819,29 @@ async def find_resources_for_activity(title: str, description: str, category: st
     prompt = template.render(title=title, category=category, description=description)
 
     try:
-        response = client.models.generate_content(
+        response = get_gemini_client().models.generate_content(
             model=model,
             contents=prompt,
-            config=types.GenerateContentConfig(
-                tools=[types.Tool(google_search=types.GoogleSearch())],
-            )
+            config=_grounded_search_config()
         )
         
         text = response.text
         resources = []
         if text:
-            # Cleanup markdown
-            json_str = text
-            if "```json" in text:
-                json_str = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                 json_str = text.split("```")[1].split("```")[0].strip()
-            
-            try:
-                data = json.loads(json_str)
-                resources = [Resource(**r) for r in data.get("resources", [])]
-            except json.JSONDecodeError:
-                # Fallback: try to find JSON-like structure
-                import re
-                match = re.search(r'\{.*\}', text, re.DOTALL)
-                if match:
-                    try:
-                        data = json.loads(match.group(0))
-                        resources = [Resource(**r) for r in data.get("resources", [])]
-                    except:
-                        pass
+            data = _extract_json_object(text)
+            if data is not None:
+                try:
+                    resources = [Resource.model_validate(r) for r in data.get("resources", [])]
+                except Exception as e:
+                    print(f"[Gemini] Invalid resource list: {e}")
         
         # Validate URLs
         valid_resources = []
         for res in resources:
-            if validate_url(res.url):
+            if expired():
+                print(f"[Gemini] Deadline reached; skipping validation of remaining links for {title}")
+                break
+            if await validate_url(res.url):
                 valid_resources.append(res)
             else:
                 print(f"[Gemini] Invalid URL found and removed: {res.url}")
@@ -708,6 +851,8 @@ async def find_resources_for_activity(title: str, description: str, category: st
             needed = 3 - len(valid_resources)
             
             for _ in range(needed):
+                if not has_budget(GROUNDED_SEARCH_SECONDS):
+                    break
                 new_res = await find_single_valid_resource(title, description, category)
                 if new_res:
                     if not any(r.url == new_res.url for r in valid_resources):
@@ -716,30 +861,224 @@ async def find_resources_for_activity(title: str, description: str, category: st
         if not valid_resources:
             raise Exception("No valid resources found")
 
+        await _remember_resources(title, description, category, valid_resources)
         return valid_resources
 
     except Exception as e:
         print(f"[Gemini] Failed to find resources for {title}: {e}")
         
-        # Fallback to ReAct Agent if Gemini fails (e.g. 429 or no results)
-        print(f"[Gemini] Attempting fallback with ReAct Agent...")
-        video_url = await react_agent.find_verified_video(f"{title} {category} pregnancy")
-        if video_url:
-            return [Resource(
-                title=f"Video Guide: {title}",
-                url=video_url,
-                description=f"A gathered video guide for {title}"
-            )]
+        # ReAct Agent if there's time (e.g. 429 or no results), else a search link
+        return await _fallback_resources(title, category)
+
+# Number of valid links we aim for per activity (same target as the single-activity path)
+RESOURCES_PER_ACTIVITY = 3
+BATCH_REPAIR_ATTEMPTS = 2
+
+def _extract_json_object(text: str) -> Optional[dict]:
+    """Parse a JSON object out of a grounded response (which can't use JSON mode)."""
+    json_str = text
+    if "```json" in text:
+        json_str = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        json_str = text.split("```")[1].split("```")[0].strip()
 
-        # Ultimate Fallback
-        search_query = f"{title} pregnancy activity {category}"
-        search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
+    try:
+        data = fastjson.loads(json_str)
+    except fastjson.JSONDecodeError:
+        match = re.search(r'\{.*\}', text, re.DOTALL)
+        if not match:
+            return None
+        try:
+            data = fastjson.loads(match.group(0))
+        except fastjson.JSONDecodeError:
+            return None
+
+    return data if isinstance(data, dict) else None
+
+def _parse_batched_resources(text: Optional[str]) -> dict[str, list[Resource]]:
+    """Parse a batched grounded response into resources keyed by activity id."""
+    if not text:
+        return {}
+
+    data = _extract_json_object(text)
+    if data is None:
+        print("[Gemini] Could not parse batched resource response")
+        return {}
+
+    keyed = data.get("activities", data)
+    if not isinstance(keyed, dict):
+        return {}
+
+    parsed = {}
+    for activity_id, items in keyed.items():
+        if isinstance(items, dict):
+            items = items.get("resources", [])
+        if not isinstance(items, list):
+            continue
+        resources = []
+        for item in items:
+            try:
+                resources.append(Resource(**item))
+            except Exception:
+                continue
+        parsed[str(activity_id)] = resources
+    return parsed
+
+async def _grounded_batch_search(template_name: str, activities: List[dict]) -> Optional[str]:
+    """Run one Google Search grounded call covering every activity in the batch."""
+    template = Template(prompt_loader.get_template(template_name))
+    prompt = template.render(activities=activities)
+
+    def search() -> Optional[str]:
+        response = get_gemini_client().models.generate_content(
+            model="gemini-2.0-flash",
+            contents=prompt,
+            config=_grounded_search_config()
+        )
+        return response.text
+
+    # Identical prompts (same activities, same exclusions) reuse the earlier answer
+    key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return await _grounded_search_cache.aget_or_set(key, lambda: asyncio.to_thread(search))
+
+async def _fallback_resources(title: str, category: str) -> list[Resource]:
+    """ReAct video (if the deadline leaves time for one), then a plain search link, for an activity grounding couldn't serve."""
+    video_url = None
+    if has_budget(REACT_SEARCH_SECONDS):
+        print(f"[Gemini] Attempting fallback with ReAct Agent...")
+        video_url = await get_react_agent().find_verified_video(f"{title} {category} pregnancy")
+    if video_url:
         return [Resource(
-            title=f"Search: {title}",
-            url=search_url,
-            description="Click here to search for this activity on Google."
+            title=f"Video Guide: {title}",
+            url=video_url,
+            description=f"A gathered video guide for {title}"
         )]
 
+    search_query = f"{title} pregnancy activity {category}"
+    search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
+    return [Resource(
+        title=f"Search: {title}",
+        url=search_url,
+        description="Click here to search for this activity on Google."
+    )]
+
+async def find_resources_for_activities(activities: List[dict]) -> dict[str, list[Resource]]:
+    """
+    Batched counterpart of find_resources_for_activity.
+
+    Activities similar to ones resolved before reuse those resources (see
+    resource_index). The rest go out in a single grounded prompt; the returned
+    links are validated, then only the activities still short of valid links
+    are repaired with (at most BATCH_REPAIR_ATTEMPTS) batched repair calls.
+    Activities are keyed by their "id"; missing or duplicate ids are rewritten
+    in place so the caller can map results back.
+    """
+    seen_ids = set()
+    for index, activity in enumerate(activities):
+        activity_id = str(activity.get("id") or f"activity_{index + 1}")
+        if activity_id in seen_ids:
+            activity_id = f"{activity_id}_{index + 1}"
+        seen_ids.add(activity_id)
+        activity["id"] = activity_id
+
+    if not activities:
+        return {}
+
+    # Groq has no search grounding; the ReAct agent works per activity
+    if _active_provider() == ModelProvider.GROQ:
+        results = {}
+        for activity in activities:
+            results[activity["id"]] = await find_resources_for_activity(
+                activity.get("title", ""), activity.get("description", ""), activity.get("category", "")
+            )
+        return results
+
+    # Activities similar enough to ones resolved before reuse those resources
+    results = {}
+    for activity in activities:
+        reused = await _reusable_resources(activity.get("title", ""), activity.get("description", ""), activity.get("category", ""))
+        if reused:
+            results[activity["id"]] = reused
+    activities = [a for a in activities if a["id"] not in results]
+    if not activities:
+        return results
+
+    by_id = {activity["id"]: activity for activity in activities}
+    valid: dict[str, list[Resource]] = {activity_id: [] for activity_id in by_id}
+    rejected: dict[str, list[str]] = {activity_id: [] for activity_id in by_id}
+
+    async def accept(found: dict[str, list[Resource]]):
+        for activity_id, resources in found.items():
+            if activity_id not in valid:
+                print(f"[Gemini] Ignoring resources for unknown activity id: {activity_id}")
+                continue
+            for res in resources:
+                if len(valid[activity_id]) >= RESOURCES_PER_ACTIVITY + 2 or expired():
+                    break
+                if any(r.url == res.url for r in valid[activity_id]) or res.url in rejected[activity_id]:
+                    continue
+                if await validate_url(res.url):
+                    valid[activity_id].append(res)
+                else:
+                    print(f"[Gemini] Invalid URL found and removed: {res.url}")
+                    rejected[activity_id].append(res.url)
+
+    print(f"[Gemini] Batched resource search for {len(activities)} activities...")
+    quota_exhausted = False
+    try:
+        await accept(_parse_batched_resources(await _grounded_batch_search("resource_search_batch", [
+            {
+                "id": a["id"],
+                "title": a.get("title", ""),
+                "category": a.get("category", ""),
+                "description": a.get("description", ""),
+            }
+            for a in activities
+        ])))
+    except Exception as e:
+        print(f"[Gemini] Batched resource search failed: {e}")
+        quota_exhausted = _is_quota_error(e)
+
+    # Batched repair loop: only activities short of valid links are retried
+    for attempt in range(BATCH_REPAIR_ATTEMPTS):
+        if quota_exhausted:
+            break
+        if not has_budget(GROUNDED_SEARCH_SECONDS):
+            print("[Gemini] Skipping batched repair; not enough time left before the deadline")
+            break
+        needy = [
+            {
+                "id": activity_id,
+                "title": by_id[activity_id].get("title", ""),
+                "category": by_id[activity_id].get("category", ""),
+                "description": by_id[activity_id].get("description", ""),
+                "needed": RESOURCES_PER_ACTIVITY - len(resources),
+                "exclude": [r.url for r in resources] + rejected[activity_id],
+            }
+            for activity_id, resources in valid.items()
+            if len(resources) < RESOURCES_PER_ACTIVITY
+        ]
+        if not needy:
+            break
+
+        print(f"[Gemini] Batched repair attempt {attempt + 1} for {len(needy)} activities")
+        try:
+            await accept(_parse_batched_resources(await _grounded_batch_search("resource_search_batch_repair", needy)))
+        except Exception as e:
+            print(f"[Gemini] Error in batched repair loop: {e}")
+            quota_exhausted = _is_quota_error(e)
+
+    for activity_id, resources in valid.items():
+        if resources:
+            activity = by_id[activity_id]
+            await _remember_resources(activity.get("title", ""), activity.get("description", ""), activity.get("category", ""), resources)
+            results[activity_id] = resources
+        else:
+            activity = by_id[activity_id]
+            print(f"[Gemini] No valid resources for {activity.get('title', '')}. Using fallback.")
+            results[activity_id] = await _fallback_resources(activity.get("title", ""), activity.get("category", ""))
+    return results
+
 async def interpret_dream(dream_text: str) -> Optional[DreamInterpretationResponse]:
     template_str = prompt_loader.get_template("interpret_dream")
     template = Template(template_str)
@@ -750,17 +1089,21 @@ async def interpret_dream(dream_text: str) -> Optional[DreamInterpretationRespon
         if not wrapper:
             return None
             
-        text = wrapper.generate(prompt=prompt, system_instruction=SYSTEM_INSTRUCTION, response_format="json")
-        
-        if not text:
-            return None
-            
-        return DreamInterpretationResponse(**json.loads(text))
+        return wrapper.generate_structured(DreamInterpretationResponse, prompt=prompt, system_instruction=SYSTEM_INSTRUCTION)
     except Exception as e:
         logger.error(f"Error interpreting dream: {e}", exc_info=True)
         return None
 
-async def generate_audio(text: str) -> Optional[bytes]:
+async def stream_dream_interpretation(dream_text: str) -> AsyncIterator[JSONEvent]:
+    """Yield ("interpretation",) / ("affirmation",) events as each field completes."""
+    template = Template(prompt_loader.get_template("interpret_dream"))
+    prompt = template.render(dream_text=dream_text)
+    async for path, value in _stream_json(prompt):
+        if path[0] in DreamInterpretationResponse.model_fields and isinstance(value, str):
+            yield path, value
+
+async def generate_audio(text: str, encoding: str = "pcm16") -> Optional[bytes]:
+    """Speech for `text` as a WAV file (16 kHz mono; 16-bit PCM, or 8-bit mu-law with encoding="mulaw")."""
     print(f"[Gemini] Generating audio for text: \"{text[:50]}...\"")
     try:
         # Note: The Python SDK for TTS might be slightly different or require specific endpoint usage.
@@ -770,8 +1113,9 @@ async def generate_audio(text: str) -> Optional[bytes]:
         
         # However, for 'gemini-2.0-flash-exp', TTS might be via a specific method or just response modalities.
         # Let's try the standard approach mirroring the TS code.
+        from google.genai import types
         
-        response = client.models.generate_content(
+        response = get_gemini_client().models.generate_content(
             model="gemini-2.0-flash-exp", # Using a model known to support this or the one from TS
             contents=text,
             config=types.GenerateContentConfig(
@@ -791,13 +1135,15 @@ async def generate_audio(text: str) -> Optional[bytes]:
         
         for part in response.candidates[0].content.parts:
             if part.inline_data:
-                return base64.b64decode(part.inline_data.data)
+                # Raw L16 PCM; frame, resample, trim and normalize it locally
+                from .audio import speech_to_wav
+                return await asyncio.to_thread(speech_to_wav, part.inline_data.data, part.inline_data.mime_type, encoding=encoding)
                 
         return None
 
     except Exception as e:
-        error_str = str(e)
-        if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+        if _is_quota_error(e):
+            from fastapi import HTTPException
             print(f"[Gemini] Quota exceeded for audio generation: {e}")
             raise HTTPException(status_code=429, detail="Audio generation quota exceeded. Please try again in 1 minute.")
         print(f"[Gemini] Error generating audio: {e}")
@@ -811,13 +1157,7 @@ async def generate_dad_joke() -> List[str]:
         if not wrapper:
             return ["Why did the scarecrow win an award? Because he was outstanding in his field!"]
 
-        text = wrapper.generate(prompt=prompt, system_instruction=SYSTEM_INSTRUCTION, response_format="json")
-
-        if not text:
-            return ["Why did the scarecrow win an award? Because he was outstanding in his field!"]
-        
-        data = json.loads(text)
-        jokes = data.get("jokes", [])
+        jokes = wrapper.generate_structured(DadJokesResponse, prompt=prompt, system_instruction=SYSTEM_INSTRUCTION).jokes
         print(f"[Gemini] Generated {len(jokes)} jokes.")
         return jokes
     except Exception as e:
@@ -827,9 +1167,11 @@ async def generate_dad_joke() -> List[str]:
 async def generate_image(prompt: str) -> Optional[str]:
     print(f"[Gemini] Generating image for prompt: \"{prompt}\"")
     try:
+        from google.genai import types
+
         # Using Imagen 3 model via Gemini API standard
         # Note: This requires a model that supports image generation, e.g., imagen-3.0-generate-001
-        response = client.models.generate_images(
+        response = get_gemini_client().models.generate_images(
             model='imagen-3.0-generate-001',
             prompt=prompt + " style: soft watercolor, spiritual, dreamy, pastel colors, high quality.",
             config=types.GenerateImagesConfig(
@@ -856,12 +1198,7 @@ async def generate_financial_wisdom() -> Optional[FinancialWisdomResponse]:
         if not wrapper:
             return None
 
-        text = wrapper.generate(prompt=prompt, system_instruction=SYSTEM_INSTRUCTION, response_format="json")
-
-        if not text:
-            return None
-            
-        return FinancialWisdomResponse(**json.loads(text))
+        return wrapper.generate_structured(FinancialWisdomResponse, prompt=prompt, system_instruction=SYSTEM_INSTRUCTION)
     except Exception as e:
         print(f"Error generating financial wisdom: {e}")
         return None
@@ -876,12 +1213,7 @@ async def generate_rhythmic_math() -> Optional[RhythmicMathResponse]:
         if not wrapper:
             return None
             
-        text = wrapper.generate(prompt=prompt, system_instruction=SYSTEM_INSTRUCTION, response_format="json")
-
-        if not text:
-            return None
-
-        return RhythmicMathResponse(**json.loads(text))
+        return wrapper.generate_structured(RhythmicMathResponse, prompt=prompt, system_instruction=SYSTEM_INSTRUCTION)
 
     except Exception as e:
         print(f"[Gemini] Error generating rhythmic math: {e}")
@@ -898,18 +1230,13 @@ async def generate_raaga_recommendations() -> Optional[RaagaResponse]:
         if not wrapper:
             return None
             
-        text = wrapper.generate(prompt=prompt, system_instruction=SYSTEM_INSTRUCTION, response_format="json")
-
-        if not text:
-            return None
-
-        raaga_data = json.loads(text)
+        raaga_data = wrapper.generate_structured(RaagaResponse, prompt=prompt, system_instruction=SYSTEM_INSTRUCTION).model_dump()
         
         # Now find YouTube links for these raagas
         raagas_with_links = []
         for raaga in raaga_data.get("raagas", []):
             search_query = f"{raaga['title']} indian classical raaga instrumental for pregnancy"
-            url = await react_agent.find_verified_video(search_query)
+            url = await get_react_agent().find_verified_video(search_query)
             raaga['url'] = url
             raagas_with_links.append(raaga)
             
@@ -925,15 +1252,17 @@ async def verify_youtube_url(url: str) -> bool:
     """Verifies a YouTube URL using the oEmbed API."""
     if not url:
         return False
+    # Check standard format first
+    if "youtube.com" not in url and "youtu.be" not in url:
+        return False
+    return bool(await _verification_cache.aget_or_set(url, lambda: _check_oembed(url)))
+
+async def _check_oembed(url: str) -> Optional[bool]:
     try:
-        # Check standard format first
-        if "youtube.com" not in url and "youtu.be" not in url:
-            return False
-            
         print(f"[Gemini] Verifying YouTube URL: {url}")
         async with httpx.AsyncClient() as client:
-            oembed_url = f"https://www.youtube.com/oembed?url={url}&format=json"
-            response = await client.get(oembed_url, timeout=5.0)
+            oembed_url = f"{YOUTUBE_BASE_URL}/oembed?url={url}&format=json"
+            response = await client.get(oembed_url, timeout=deadline_timeout(5.0))
             
             if response.status_code == 200:
                 data = response.json()
@@ -945,7 +1274,7 @@ async def verify_youtube_url(url: str) -> bool:
                 return False
     except Exception as e:
         print(f"[Gemini] Verification error for {url}: {e}")
-        return False
+        return None if expired() else False
 
 async def get_initial_raagas() -> Optional[RaagaResponse]:
     """
@@ -968,7 +1297,7 @@ async def get_initial_raagas() -> Optional[RaagaResponse]:
         
         # Use ReAct agent to find a verified video
         search_query = f"{raaga['title']} instrumental meditation relaxation"
-        url = await react_agent.find_verified_video(raaga['title'], "instrumental meditation pregnancy relaxation")
+        url = await get_react_agent().find_verified_video(raaga['title'], "instrumental meditation pregnancy relaxation")
         
         raaga_with_url = {**raaga, "url": url}
         raagas_with_urls.append(raaga_with_url)
@@ -1011,7 +1340,7 @@ async def get_initial_mantras(exclude_urls: List[str] = None) -> Optional[Mantra
         # Use pre-defined context or default
         context = mantra.get('context', "meditation chanting peaceful")
         
-        url = await react_agent.find_verified_video(mantra['title'], context, exclude_urls=exclude_urls)
+        url = await get_react_agent().find_verified_video(mantra['title'], context, exclude_urls=exclude_urls)
         
         # Create response object (excluding helper 'context' field)
         mantra_with_url = {
@@ -1027,9 +1356,7 @@ async def get_initial_mantras(exclude_urls: List[str] = None) -> Optional[Mantra
     return MantraResponse(mantras=mantras_with_urls)
 
 
-async def generate_vedic_names(gender: str, starting_letter: Optional[str] = None, preference: Optional[str] = None) -> List[dict]:
-    print(f"[Gemini] Generating Vedic names for {gender}, letter: {starting_letter}, preference: {preference}")
-    
+def _vedic_names_instructions(gender: str, starting_letter: Optional[str] = None, preference: Optional[str] = None) -> dict:
     gender_instruction = f"a baby {gender}"
     if gender.lower() == "unisex":
         gender_instruction = "a baby (Gender-Neutral / Unisex names suitable for both boys and girls)"
@@ -1054,133 +1381,319 @@ async def generate_vedic_names(gender: str, starting_letter: Optional[str] = Non
         prompt_intro = "modern, trendy Indian names with Sanskrit roots"
         significance_constraint = "Names should have a beautiful meaning and contemporary appeal."
 
-    template_str = prompt_loader.get_template("vedic_names")
-    template = Template(template_str)
-    prompt = template.render(
+    return dict(
         prompt_intro=prompt_intro,
         gender_instruction=gender_instruction,
         significance_constraint=significance_constraint,
         starting_letter=starting_letter,
         preference_instruction=preference_instruction
     )
-    
+
+def _render_vedic_names_prompt(gender: str, starting_letter: Optional[str] = None, preference: Optional[str] = None) -> str:
+    template = Template(prompt_loader.get_template("vedic_names"))
+    return template.render(**_vedic_names_instructions(gender, starting_letter, preference))
+
+# Names returned per request, and the bucket size below which we top up in the background
+NAMES_PER_REQUEST = 5
+NAME_BUCKET_TARGET = 20
+NAME_TOP_UP_COOLDOWN = 10 * 60
+
+_name_top_ups_running: set = set()
+_name_top_ups_last: dict = {}
+# The loop only keeps weak references to tasks; hold top-ups until they finish
+_name_top_up_tasks: set = set()
+
+async def generate_vedic_names(gender: str, starting_letter: Optional[str] = None, preference: Optional[str] = None) -> List[dict]:
+    """
+    Sample names from the local name index; call the model only when the
+    bucket can't fill a response (and top it up in the background when sparse).
+    """
+    index = get_name_index()
+    available = index.lookup(gender, preference, starting_letter) if index else []
+
+    if len(available) >= NAMES_PER_REQUEST:
+        print(f"[Names] Serving {gender}/{starting_letter}/{preference} from index ({len(available)} names)")
+        if len(available) < NAME_BUCKET_TARGET:
+            _schedule_name_top_up(gender, starting_letter, preference)
+        return random.sample(available, NAMES_PER_REQUEST)
+
+    generated = await top_up_vedic_names(gender, starting_letter, preference)
+    # Fresh names first, then anything the index already had
+    seen, names = set(), []
+    for name in generated + available:
+        key = name_key(name["name"])
+        if key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names[:NAMES_PER_REQUEST]
+
+NameRequest = tuple  # (gender, starting letter, theme), normalized
+
+async def _generate_names_single(request: NameRequest) -> List[VedicName]:
+    gender, starting_letter, preference = request
+    wrapper = _get_llm_wrapper(None, None)
+    if not wrapper:
+        return []
+    prompt = _render_vedic_names_prompt(gender, starting_letter or None, preference or None)
+    # Off the event loop: top-ups run while other requests are being served
+    response = await asyncio.to_thread(
+        wrapper.generate_structured, VedicNamesResponse, prompt=prompt, system_instruction=SYSTEM_INSTRUCTION
+    )
+    return response.names
+
+async def _generate_names_batch(requests: List[NameRequest]) -> dict:
+    """One combined call for several name requests; requests missing from the answer are retried singly by the batcher."""
+    wrapper = _get_llm_wrapper(None, None)
+    if not wrapper:
+        return {}
+    ids = {f"r{i + 1}": request for i, request in enumerate(requests)}
+    template = Template(prompt_loader.get_template("vedic_names_batch"))
+    prompt = template.render(requests=[
+        {"id": request_id, **_vedic_names_instructions(gender, letter or None, theme or None)}
+        for request_id, (gender, letter, theme) in ids.items()
+    ])
+    print(f"[Gemini] Generating Vedic names for {len(requests)} requests in one call")
+    response = await asyncio.to_thread(
+        wrapper.generate_structured, VedicNamesBatchResponse, prompt=prompt, system_instruction=SYSTEM_INSTRUCTION
+    )
+    return {ids[item.id]: item.names for item in response.results if item.id in ids and item.names}
+
+# Concurrent name requests (different genders/letters/themes) share one model call
+_name_batcher = MicroBatcher(
+    "vedic_names", run_batch=_generate_names_batch, run_single=_generate_names_single,
+    window=float(os.getenv("NAME_BATCH_WINDOW_SECONDS", "0.03")), max_batch=8,
+)
+
+async def top_up_vedic_names(gender: str, starting_letter: Optional[str] = None, preference: Optional[str] = None) -> List[dict]:
+    """Generate one batch of names, keep those that honour the starting letter, and add them to the index."""
+    print(f"[Gemini] Generating Vedic names for {gender}, letter: {starting_letter}, preference: {preference}")
+
+    request = (normalize_gender(gender), (starting_letter or "").upper(), normalize_theme(preference))
     try:
-        wrapper = _get_llm_wrapper(None, None)
-        if not wrapper:
-            return []
-            
-        text = wrapper.generate(prompt=prompt, system_instruction=SYSTEM_INSTRUCTION, response_format="json")
-        
-        if not text:
-            return []
-            
-        data = json.loads(text)
-        return data.get("names", [])
+        # Batched only with requests bound to the same model configuration
+        generated = await _name_batcher.submit(request, group=_active_model())
     except Exception as e:
         print(f"Error generating names: {e}")
         return []
 
+    prefix = name_key(starting_letter or "")
+    names = [name.model_dump() for name in generated if name_key(name.name).startswith(prefix)]
+    if len(names) < len(generated):
+        print(f"[Names] Dropped {len(generated) - len(names)} names not starting with '{starting_letter}'")
+    index = get_name_index()
+    if index:
+        added = index.add(gender, preference, names, starting_letter)
+        print(f"[Names] Indexed {added} new names for {gender}/{starting_letter}/{preference}")
+    return names
+
+def _schedule_name_top_up(gender: str, starting_letter: Optional[str], preference: Optional[str]):
+    bucket = (normalize_gender(gender), (starting_letter or "").upper(), normalize_theme(preference))
+    now = time.monotonic()
+    if bucket in _name_top_ups_running or now - _name_top_ups_last.get(bucket, -NAME_TOP_UP_COOLDOWN) < NAME_TOP_UP_COOLDOWN:
+        return
+    _name_top_ups_running.add(bucket)
+    _name_top_ups_last[bucket] = now
+
+    async def run():
+        try:
+            await top_up_vedic_names(gender, starting_letter, preference)
+        finally:
+            _name_top_ups_running.discard(bucket)
+
+    task = asyncio.create_task(run())
+    _name_top_up_tasks.add(task)
+    task.add_done_callback(_name_top_up_tasks.discard)
+
+async def stream_vedic_names(gender: str, starting_letter: Optional[str] = None, preference: Optional[str] = None) -> AsyncIterator[JSONEvent]:
+    """Yield ("names", index) events as each generated name object completes."""
+    print(f"[Gemini] Streaming Vedic names for {gender}, letter: {starting_letter}, preference: {preference}")
+    index = get_name_index()
+    available = index.lookup(gender, preference, starting_letter) if index else []
+    if len(available) >= NAMES_PER_REQUEST:
+        if len(available) < NAME_BUCKET_TARGET:
+            _schedule_name_top_up(gender, starting_letter, preference)
+        for i, name in enumerate(random.sample(available, NAMES_PER_REQUEST)):
+            yield ("names", i), name
+        return
+
+    prompt = _render_vedic_names_prompt(gender, starting_letter, preference)
+    prefix = name_key(starting_letter or "")
+    streamed = []
+    async for path, value in _stream_json(prompt):
+        if path[0] != "names":
+            continue
+        try:
+            name = VedicName.model_validate(value).model_dump()
+        except Exception as e:
+            print(f"[Gemini] Skipping malformed streamed name: {e}")
+            continue
+        if not name_key(name["name"]).startswith(prefix):
+            continue
+        yield ("names", len(streamed)), name
+        streamed.append(name)
+    if index and streamed:
+        index.add(gender, preference, streamed, starting_letter)
+
+async def _stream_json(prompt: str) -> AsyncIterator[JSONEvent]:
+    """Stream a JSON response, yielding each top-level field / array element as it closes."""
+    wrapper = _get_llm_wrapper(None, None)
+    if not wrapper:
+        raise RuntimeError("No LLM wrapper available")
 
+    parser = IncrementalJSONParser()
+    async for chunk in wrapper.generate_stream(prompt=prompt, system_instruction=SYSTEM_INSTRUCTION, response_format="json"):
+        for event in parser.feed(chunk):
+            yield event
+        if parser.done:
+            break
 
 # ============= Model Configuration Functions =============
 
-# Current model configuration
+@dataclass(frozen=True)
+class ModelSelection:
+    """Provider/model/key choice used to resolve an LLM wrapper."""
+    provider: ModelProvider
+    model_name: Optional[str] = None
+    groq_api_key: Optional[str] = None
+
+# Process-wide default configuration, used when no tenant configuration is
+# bound to the current request (scripts, background jobs started outside a request).
 _current_model_provider = ModelProvider.GEMINI
 _current_model_name = "gemini-2.0-flash"
 _groq_api_key = groq_api_key_from_env
-_llm_wrappers = {}  # Cache wrappers
+
+# Per-request tenant selection (set by main.py for every request)
+_request_model: contextvars.ContextVar[Optional[ModelSelection]] = contextvars.ContextVar("request_model", default=None)
+
+# Warmed wrappers shared across tenants; config changes never flush it
+_wrapper_pool = WrapperPool(
+    max_size=int(os.getenv("LLM_POOL_SIZE", "16")),
+    idle_ttl=float(os.getenv("LLM_POOL_IDLE_SECONDS", "1800")),
+)
+
+def use_model_config(provider: str, model_name: Optional[str] = None, groq_api_key: Optional[str] = None):
+    """Bind a tenant's model configuration to the current request context."""
+    try:
+        # Tenants without their own key share the server's env key, never the default tenant's
+        selection = ModelSelection(ModelProvider(provider), model_name, groq_api_key or groq_api_key_from_env)
+    except ValueError:
+        print(f"[Config] Invalid provider: {provider}")
+        return
+    _request_model.set(selection)
+
+def _active_model() -> ModelSelection:
+    selection = _request_model.get()
+    if selection is not None:
+        return selection
+    return ModelSelection(_current_model_provider, _current_model_name, _groq_api_key)
+
+def _active_provider() -> ModelProvider:
+    return _active_model().provider
 
 def _get_llm_wrapper(provider: str, model_name: Optional[str] = None):
-    """Get or create LLM wrapper for the specified provider"""
-    global _llm_wrappers
-    
-    # DEBUG: Log current state
-    print(f"[LLM Debug] _get_llm_wrapper called: provider_arg={provider}, model_arg={model_name}")
-    print(f"[LLM Debug] Current globals: _current_model_provider={_current_model_provider}, _current_model_name={_current_model_name}")
-    
-    # Use config globals if params are None, with fallbacks
-    prov_enum = ModelProvider(provider) if provider else _current_model_provider
-    
-    print(f"[LLM Debug] Resolved provider enum: {prov_enum}")
+    """Get or create LLM wrapper for the specified provider (defaults to the active selection)"""
+    selection = _active_model()
+
+    # Use the active selection if params are None, with fallbacks
+    prov_enum = ModelProvider(provider) if provider else selection.provider
     
     # Provide defaults if model_name is missing
     if not model_name:
-        model_name = _current_model_name  # Use the configured model name first
+        model_name = selection.model_name  # Use the configured model name first
         if not model_name:  # If still None, use provider defaults
             if prov_enum == ModelProvider.GROQ:
                 model_name = "llama-3.3-70b-versatile"
             else:
                 model_name = "gemini-2.0-flash"
-            
-    cache_key = f"{prov_enum.value}:{model_name}"
-    print(f"[LLM Debug] Cache key: {cache_key}, existing cache: {list(_llm_wrappers.keys())}")
-    
-    if cache_key in _llm_wrappers:
-        print(f"[LLM Debug] Returning cached wrapper for {cache_key}")
-        return _llm_wrappers[cache_key]
         
     api_key = None
     if prov_enum == ModelProvider.GROQ:
-        api_key = _groq_api_key
+        api_key = selection.groq_api_key
         if not api_key:
              print("[Config] Warning: No Groq API key found but Groq provider requested")
              return None
     else:
         api_key = os.getenv("VITE_GEMINI_API_KEY")
-        
+
     try:
+        return _pooled_wrapper(prov_enum, model_name, api_key)
+    except Exception as e:
+        print(f"[Config] Error creating LLM wrapper: {e}")
+        return None
+
+def _pooled_wrapper(provider: ModelProvider, model_name: str, api_key: Optional[str]):
+    def build():
         config = LLMConfig(
-            provider=prov_enum,
+            provider=provider,
             model_name=model_name,
             api_key=api_key or ""
         )
-        wrapper = LLMFactory.create(config)
-        _llm_wrappers[cache_key] = wrapper
-        return wrapper
-    except Exception as e:
-        print(f"[Config] Error creating LLM wrapper: {e}")
-        return None
+        print(f"[Config] Creating LLM wrapper for {provider.value}:{model_name}")
+        return LLMFactory.create(config)
+
+    return _wrapper_pool.get_or_create(provider.value, model_name, api_key, build)
+
+def warm_wrapper_keys() -> List[list]:
+    """(provider, model, key fingerprint) of every pooled wrapper, for the warm-restart snapshot."""
+    return [list(key) for key in _wrapper_pool.keys()]
+
+def prewarm_wrappers(keys: List[list], api_keys: List[str] = ()) -> int:
+    """
+    Rebuild the wrappers that were warm before a restart. The snapshot only
+    has key fingerprints, so a wrapper comes back only if its key is one this
+    process knows (the environment's, or one from `api_keys`).
+    """
+    known = {key_fingerprint(key): key for key in (os.getenv("VITE_GEMINI_API_KEY"), _groq_api_key, *api_keys) if key}
+    warmed = 0
+    for provider, model_name, fingerprint in keys:
+        api_key = known.get(fingerprint)
+        if api_key is None and fingerprint != key_fingerprint(None):
+            continue
+        try:
+            _pooled_wrapper(ModelProvider(provider), model_name, api_key)
+            warmed += 1
+        except Exception as e:
+            print(f"[Config] Could not prewarm {provider}:{model_name}: {e}")
+    return warmed
 
 
 def set_groq_api_key(api_key: str):
-    """Set the Groq API key for use with Groq models."""
-    global _groq_api_key, _llm_wrappers
+    """Set the default Groq API key for use with Groq models."""
+    global _groq_api_key
     
     new_key = api_key or groq_api_key_from_env
     if new_key != _groq_api_key:
+        # Pooled wrappers are keyed by key fingerprint, so nothing needs flushing
         _groq_api_key = new_key
-        _llm_wrappers.clear() # Clear cache when key changes
         print(f"[Config] Groq API key updated")
 
 
 def set_model_config(provider: str, model_name: Optional[str] = None):
-    """Set the current model provider and name."""
-    global _current_model_provider, _current_model_name, _llm_wrappers
-    
-    print(f"[Config Debug] set_model_config called: provider={provider}, model_name={model_name}")
-    print(f"[Config Debug] BEFORE: _current_model_provider={_current_model_provider}, _current_model_name={_current_model_name}")
+    """Set the default model provider and name."""
+    global _current_model_provider, _current_model_name
     
     try:
         new_provider = ModelProvider(provider)
         _current_model_provider = new_provider
         _current_model_name = model_name
         
-        print(f"[Config Debug] AFTER: _current_model_provider={_current_model_provider}, _current_model_name={_current_model_name}")
-        
-        # Clear cache to force new wrapper creation with new config
-        _llm_wrappers.clear()
-        print(f"[Config Debug] Cleared LLM wrapper cache")
-        
-        # Pre-warm the wrapper
-        _get_llm_wrapper(None, None)  # Use None to test global reading
+        # Pre-warm the wrapper (a pool hit if any tenant already uses it)
+        _get_llm_wrapper(None, None)
         
         print(f"[Config] Model config updated: provider={provider}, model={model_name}")
     except ValueError:
         print(f"[Config] Invalid provider: {provider}")
 
 def get_current_model_config():
-    """Get the current model configuration."""
+    """Get the model configuration active for the current request."""
+    selection = _active_model()
     return {
-        "provider": _current_model_provider.value if isinstance(_current_model_provider, ModelProvider) else _current_model_provider,
-        "model_name": _current_model_name
+        "provider": selection.provider.value,
+        "model_name": selection.model_name
     }
+
+def get_wrapper_pool_stats() -> dict:
+    return _wrapper_pool.stats()
+
+def get_name_batching_stats() -> dict:
+    return _name_batcher.stats()
@@ -0,0 +1,191 @@
+"""
+Vedic Name Index
+
+Local index of generated names so /api/vedic-names can answer from memory.
+Names are bucketed by (gender, theme); within a bucket they are kept in a
+sorted array of normalized keys, so a starting-letter (or longer prefix)
+lookup is two bisects. Deduplication and the starting-letter rule are
+enforced here rather than trusted to the model.
+
+Every name is also filed under the theme-less bucket for its gender, which
+serves requests with no theme. The index is persisted to SQLite and seeded
+both from live results and from `python -m backend.precompute --names`.
+"""
+
+import bisect
+import os
+import random
+import sqlite3
+import string
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+GENDERS = ["Boy", "Girl", "Unisex"]
+# Mirrors the frontend's theme picker; "" is "Any"
+THEMES = ["", "Modern", "Traditional", "Nature", "Spiritual", "Royal"]
+LETTERS = list(string.ascii_uppercase)
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent.parent / "data" / "names.sqlite3"
+
+Bucket = Tuple[str, str]
+
+
+def normalize_gender(gender: Optional[str]) -> str:
+    value = (gender or "").strip()
+    for known in GENDERS:
+        if value.lower() == known.lower():
+            return known
+    return value.title()
+
+
+def normalize_theme(theme: Optional[str]) -> str:
+    value = (theme or "").strip()
+    for known in THEMES:
+        if value.lower() == known.lower():
+            return known
+    return value
+
+
+def name_key(name: str) -> str:
+    """Accent-, case- and punctuation-insensitive key ("Aarav", "aarav ", "Āarav" collide)."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in decomposed if c.isalpha()).casefold()
+
+
+class NameIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS names (
+                gender TEXT NOT NULL,
+                theme TEXT NOT NULL,
+                key TEXT NOT NULL,
+                name TEXT NOT NULL,
+                meaning TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                significance TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (gender, theme, key)
+            ) WITHOUT ROWID
+            """
+        )
+        # bucket -> (sorted keys, entries in the same order)
+        self._buckets: Dict[Bucket, Tuple[List[str], List[dict]]] = {}
+        self._data_version = None
+        self._refresh()
+
+    def _refresh(self):
+        # Pick up rows other workers (or the precompute job) have committed
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        buckets: Dict[Bucket, Tuple[List[str], List[dict]]] = {}
+        rows = self._conn.execute(
+            "SELECT gender, theme, key, name, meaning, origin, significance FROM names ORDER BY gender, theme, key"
+        )
+        for gender, theme, key, name, meaning, origin, significance in rows:
+            keys, entries = buckets.setdefault((gender, theme), ([], []))
+            keys.append(key)
+            entries.append({"name": name, "meaning": meaning, "origin": origin, "significance": significance})
+        self._buckets = buckets
+        self._data_version = version
+
+    def _insert(self, bucket: Bucket, key: str, entry: dict) -> bool:
+        keys, entries = self._buckets.setdefault(bucket, ([], []))
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            return False
+        keys.insert(position, key)
+        entries.insert(position, entry)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO names (gender, theme, key, name, meaning, origin, significance, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (bucket[0], bucket[1], key, entry["name"], entry["meaning"], entry["origin"], entry["significance"], time.time()),
+        )
+        return True
+
+    def add(self, gender: str, theme: Optional[str], names: Iterable[dict], starting_letter: Optional[str] = None) -> int:
+        """
+        File names under (gender, theme) and the theme-less bucket. Names that
+        don't start with `starting_letter`, or are already present, are skipped.
+        Returns how many were new to the (gender, theme) bucket.
+        """
+        gender, theme = normalize_gender(gender), normalize_theme(theme)
+        prefix = name_key(starting_letter or "")
+        added = 0
+        with self._lock:
+            self._refresh()
+            self._conn.execute("BEGIN")
+            try:
+                for entry in names:
+                    key = name_key(entry.get("name", ""))
+                    if not key or not key.startswith(prefix):
+                        continue
+                    entry = {field: str(entry.get(field, "")) for field in ("name", "meaning", "origin", "significance")}
+                    entry["name"] = entry["name"].strip()
+                    if self._insert((gender, theme), key, entry):
+                        added += 1
+                    if theme:
+                        self._insert((gender, ""), key, entry)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                # The in-memory arrays may be ahead of the table; reload next time
+                self._data_version = None
+                raise
+        return added
+
+    def lookup(self, gender: str, theme: Optional[str] = None, prefix: Optional[str] = None) -> List[dict]:
+        """All indexed names in the bucket starting with `prefix`, in key order."""
+        bucket = (normalize_gender(gender), normalize_theme(theme))
+        prefix = name_key(prefix or "")
+        with self._lock:
+            self._refresh()
+            keys, entries = self._buckets.get(bucket, ([], []))
+            start = bisect.bisect_left(keys, prefix)
+            end = bisect.bisect_left(keys, prefix + "\uffff") if prefix else len(keys)
+            return list(entries[start:end])
+
+    def count(self, gender: str, theme: Optional[str] = None, prefix: Optional[str] = None) -> int:
+        return len(self.lookup(gender, theme, prefix))
+
+    def sample(self, gender: str, theme: Optional[str], prefix: Optional[str], k: int) -> List[dict]:
+        matches = self.lookup(gender, theme, prefix)
+        return random.sample(matches, min(k, len(matches)))
+
+    def size(self) -> int:
+        with self._lock:
+            self._refresh()
+            # Every name is also in its gender's theme-less bucket
+            return sum(len(keys) for (_, theme), (keys, _) in self._buckets.items() if not theme)
+
+
+_index: Optional[NameIndex] = None
+
+
+def get_name_index() -> Optional[NameIndex]:
+    """The index at GARBHVEDA_NAME_INDEX (default backend/data/names.sqlite3), opened on first use."""
+    global _index
+    if _index is None:
+        path = Path(os.getenv("GARBHVEDA_NAME_INDEX") or DEFAULT_INDEX_PATH)
+        try:
+            _index = NameIndex(path)
+            print(f"[Name Index] Loaded {_index.size()} names from {path}")
+        except Exception as e:
+            print(f"[Name Index] Could not open {path}: {e}")
+            return None
+    return _index
+
+
+def set_name_index(index: NameIndex):
+    """Use a specific index (the precompute job, tests)."""
+    global _index
+    _index = index
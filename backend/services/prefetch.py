@@ -0,0 +1,171 @@
+"""
+Speculative Prefetch
+
+Low-priority background generation of content a user is about to ask for,
+e.g. next week's curriculum right after this week's was served. Prefetches
+only use spare capacity:
+
+- at most `concurrency` run at once (default one), in their own worker
+  tasks, so they never take a job worker or an admission slot
+- nothing is queued or started while `busy()` says the server is under
+  load, and running prefetches are cancelled (pending ones dropped) as soon
+  as it does
+- nothing is queued or started while `quota_backoff()` reports a recent
+  provider quota error, and at most `max_per_hour` start in any hour, so
+  prefetching can't use up the quota that real requests need
+
+Each prefetch runs in the context of the request that scheduled it (tenant
+model selection etc.) but with its own deadline. A request that needs the
+same key calls `claim(key)`: a pending prefetch is dropped (the request does
+the work itself) and a running one is no longer cancelled under load, since
+the request is sharing its result. Requests that only share the cached
+computation (another tenant on the same model) don't claim anything, but
+TypedCache.aget_or_set keeps a computation running while anyone still waits
+on it, so cancelling the prefetch doesn't cancel them.
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+
+from ..util.deadline import deadline
+
+# How often a running prefetch re-checks the load
+LOAD_CHECK_SECONDS = 0.5
+
+
+class PrefetchScheduler:
+    def __init__(self, busy: Callable[[], bool] = lambda: False, quota_backoff: Callable[[], float] = lambda: 0.0,
+                 concurrency: int = 1, max_pending: int = 32, max_per_hour: int = 30, budget_seconds: float = 120.0):
+        self.busy = busy
+        self.quota_backoff = quota_backoff
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.max_per_hour = max_per_hour
+        self.budget_seconds = budget_seconds
+        self._pending: "OrderedDict[Hashable, Tuple[Callable[[], Awaitable[Any]], contextvars.Context]]" = OrderedDict()
+        self._running: Dict[Hashable, asyncio.Task] = {}
+        self._claimed: Set[Hashable] = set()
+        self._started_at: Deque[float] = deque()
+        self._wake: Optional[asyncio.Event] = None
+        self._workers = []
+        self.counters = {"scheduled": 0, "started": 0, "completed": 0, "failed": 0, "claimed": 0,
+                         "cancelled": 0, "skipped_busy": 0, "skipped_quota": 0, "skipped_full": 0}
+
+    def start(self):
+        """Start the worker tasks on the running loop (called from the app lifespan)."""
+        if self._workers:
+            return
+        self._wake = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def drain(self, timeout: float) -> bool:
+        """Drop queued prefetches and give running ones up to `timeout` seconds to finish; True if they did."""
+        self.counters["cancelled"] += len(self._pending)
+        self._pending.clear()
+        running = [task for task in self._running.values() if not task.done()]
+        if not running:
+            return True
+        _, unfinished = await asyncio.wait(running, timeout=timeout)
+        return not unfinished
+
+    async def stop(self):
+        self.cancel_all()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wake = None
+
+    def _headroom(self) -> Optional[str]:
+        """Why a prefetch can't start right now, or None if it can."""
+        if self.busy():
+            return "skipped_busy"
+        if self.quota_backoff() > 0:
+            return "skipped_quota"
+        now = time.monotonic()
+        while self._started_at and now - self._started_at[0] > 3600:
+            self._started_at.popleft()
+        if len(self._started_at) >= self.max_per_hour:
+            return "skipped_quota"
+        return None
+
+    def schedule(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> bool:
+        """Queue `factory()` unless identical work is already queued or running, or there's no headroom."""
+        if key in self._pending or key in self._running:
+            return False
+        reason = self._headroom()
+        if reason is None and len(self._pending) >= self.max_pending:
+            reason = "skipped_full"
+        if reason:
+            self.counters[reason] += 1
+            return False
+        if not self._workers:
+            self.start()
+        self._pending[key] = (factory, contextvars.copy_context())
+        self.counters["scheduled"] += 1
+        self._wake.set()
+        return True
+
+    def claim(self, key: Hashable):
+        """A request needs `key` now: drop it from the queue, or keep a running prefetch from being cancelled."""
+        if self._pending.pop(key, None) is not None or key in self._running:
+            self.counters["claimed"] += 1
+        if key in self._running:
+            self._claimed.add(key)
+
+    def cancel_all(self):
+        """Drop queued prefetches and cancel running ones nobody has claimed."""
+        self.counters["cancelled"] += len(self._pending)
+        self._pending.clear()
+        for key, task in self._running.items():
+            if key not in self._claimed and not task.done():
+                task.cancel()
+                self.counters["cancelled"] += 1
+
+    async def _worker(self):
+        while True:
+            if not self._pending:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            reason = self._headroom()
+            if reason:
+                self.counters[reason] += len(self._pending)
+                self.cancel_all()
+                continue
+            key, (factory, context) = self._pending.popitem(last=False)
+            await self._run(key, factory, context)
+
+    async def _fetch(self, factory: Callable[[], Awaitable[Any]]):
+        # The scheduling request's deadline doesn't apply to work done on its behalf later
+        with deadline(self.budget_seconds, inherit=False):
+            return await factory()
+
+    async def _run(self, key: Hashable, factory: Callable[[], Awaitable[Any]], context: contextvars.Context):
+        self._started_at.append(time.monotonic())
+        self.counters["started"] += 1
+        task = asyncio.create_task(self._fetch(factory), context=context)
+        self._running[key] = task
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=LOAD_CHECK_SECONDS)
+                if not task.done() and key not in self._claimed and self.busy():
+                    print(f"[Prefetch] Server busy; cancelling prefetch of {key}")
+                    self.cancel_all()
+            try:
+                task.result()
+                self.counters["completed"] += 1
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self.counters["failed"] += 1
+                print(f"[Prefetch] Prefetch of {key} failed: {e}")
+        finally:
+            self._running.pop(key, None)
+            self._claimed.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "pending": len(self._pending), "running": len(self._running)}
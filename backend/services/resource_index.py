@@ -0,0 +1,255 @@
+"""
+Resource Reuse Index
+
+Activity titles recur with small variations across weeks and moods
+("Prenatal Yoga for Back Pain", "Gentle Prenatal Yoga"). This index stores
+validated Resource lists next to a vector of the activity's title, category
+and description, so a similar activity can reuse them without another
+grounded search, validation and repair cycle.
+
+Vectors are hashed n-gram TF-IDF computed with NumPy: character 3-5 grams
+and word uni/bi-grams are hashed (crc32, stable across processes) into a
+fixed number of buckets; no vocabulary or model download is needed. IDF
+weights come from the stored activities. A new row is weighted with the
+current IDF when it is added; the IDF (and with it the whole matrix) is only
+recomputed once rows added since the last rebuild make up
+IDF_REFRESH_FRACTION of the index, so adds stay O(DIMENSIONS) and the
+rebuild cost is amortized. A query is one matrix-vector product over the
+stored rows of the same category.
+
+Lookups and adds touch SQLite and can trigger a rebuild; async callers run
+them in a thread.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..models import Resource
+from ..util import fastjson
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent.parent / "data" / "resources.sqlite3"
+
+DIMENSIONS = 2 ** 11
+# Oldest entries are overwritten beyond this (keeps the matrix around 25 MB)
+MAX_ENTRIES = 3000
+# Share of rows weighted with an outdated IDF that triggers a full rebuild
+IDF_REFRESH_FRACTION = 0.1
+# Cosine similarity above which resources are reused as-is
+DEFAULT_THRESHOLD = float(os.getenv("RESOURCE_REUSE_THRESHOLD", "0.6"))
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _features(text: str) -> List[str]:
+    words = _WORD.findall(text.lower())
+    features = list(words)
+    features += [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        for n in (3, 4, 5):
+            features += [padded[i:i + n] for i in range(len(padded) - n + 1)]
+    return features
+
+
+def term_frequencies(text: str) -> np.ndarray:
+    """Sublinear (1 + log tf) counts of hashed n-gram features."""
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    features = _features(text)
+    if not features:
+        return vector
+    buckets = np.fromiter((zlib.crc32(f.encode("utf-8")) % DIMENSIONS for f in features), dtype=np.int64, count=len(features))
+    counts = np.bincount(buckets, minlength=DIMENSIONS).astype(np.float32)
+    nonzero = counts > 0
+    vector[nonzero] = 1.0 + np.log(counts[nonzero])
+    return vector
+
+
+def activity_text(title: str, category: str, description: str) -> str:
+    # The title carries most of the signal; count it twice
+    return f"{title} {title} {category} {description}"
+
+
+class ResourceIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH, threshold: float = DEFAULT_THRESHOLD):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resource_sets (
+                id INTEGER PRIMARY KEY,
+                category TEXT NOT NULL,
+                title TEXT NOT NULL,
+                text TEXT NOT NULL,
+                resources TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._data_version = None
+        self._reset(0)
+        self.rebuilds = 0
+        self.hits = 0
+        self.misses = 0
+        self._refresh()
+
+    def _reset(self, capacity: int):
+        # Rows live in preallocated arrays used as a ring once MAX_ENTRIES is reached
+        self._size = 0
+        self._next = 0
+        self._tf = np.zeros((capacity, DIMENSIONS), dtype=np.float32)
+        self._categories = np.empty(capacity, dtype=object)
+        self._titles: List[str] = [""] * capacity
+        self._resources: List[List[Resource]] = [[] for _ in range(capacity)]
+        # Normalized TF-IDF rows and the IDF they were weighted with; built on first search
+        self._weighted: Optional[np.ndarray] = None
+        self._idf: Optional[np.ndarray] = None
+        self._stale = 0
+
+    def _append(self, category: str, title: str, text: str, resources: List[Resource]):
+        if self._size < MAX_ENTRIES:
+            if self._size == len(self._tf):
+                self._grow(min(MAX_ENTRIES, max(64, 2 * len(self._tf))))
+            slot = self._size
+            self._size += 1
+        else:
+            slot = self._next
+            self._next = (self._next + 1) % MAX_ENTRIES
+        self._tf[slot] = term_frequencies(text)
+        self._categories[slot] = category
+        self._titles[slot] = title
+        self._resources[slot] = list(resources)
+        if self._idf is not None:
+            self._weighted[slot] = self._weigh(self._tf[slot])
+            self._stale += 1
+
+    def _weigh(self, tf: np.ndarray) -> np.ndarray:
+        weighted = tf * self._idf
+        norm = np.linalg.norm(weighted)
+        return weighted / norm if norm else weighted
+
+    def _grow(self, capacity: int):
+        extra = capacity - len(self._tf)
+        self._tf = np.vstack([self._tf, np.zeros((extra, DIMENSIONS), dtype=np.float32)])
+        self._categories = np.concatenate([self._categories, np.empty(extra, dtype=object)])
+        self._titles += [""] * extra
+        self._resources += [[] for _ in range(extra)]
+        if self._weighted is not None:
+            self._weighted = np.vstack([self._weighted, np.zeros((extra, DIMENSIONS), dtype=np.float32)])
+
+    def _refresh(self):
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        rows = self._conn.execute(
+            "SELECT category, title, text, resources FROM resource_sets ORDER BY id DESC LIMIT ?", (MAX_ENTRIES,)
+        ).fetchall()
+        rows.reverse()
+        self._reset(len(rows))
+        for category, title, text, resources in rows:
+            self._append(category, title, text, [Resource.model_validate(r) for r in fastjson.loads(resources)])
+        self._data_version = version
+
+    def _matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row-normalized TF-IDF matrix and the IDF vector, rebuilt once enough rows were added since the last time."""
+        n = self._size
+        if self._idf is None or self._stale > IDF_REFRESH_FRACTION * n:
+            tf = self._tf[:n]
+            df = np.count_nonzero(tf, axis=0).astype(np.float32)
+            self._idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+            weighted = np.zeros_like(self._tf)
+            np.multiply(tf, self._idf, out=weighted[:n])
+            norms = np.linalg.norm(weighted[:n], axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            weighted[:n] /= norms
+            self._weighted = weighted
+            self._stale = 0
+            self.rebuilds += 1
+        return self._weighted[:n], self._idf
+
+    def search(self, title: str, category: str, description: str, k: int = 3) -> List[Tuple[float, str, List[Resource]]]:
+        """Top-k stored activities of the same category as (similarity, title, resources), best first."""
+        query = term_frequencies(activity_text(title, category, description))
+        with self._lock:
+            self._refresh()
+            if not self._size:
+                return []
+            matrix, idf = self._matrix()
+            query = query * idf
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                return []
+            scores = matrix @ (query / norm)
+            scores[self._categories[:self._size] != category] = -1.0
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), self._titles[i], list(self._resources[i])) for i in top if scores[i] >= 0]
+
+    def lookup(self, title: str, category: str, description: str) -> Optional[List[Resource]]:
+        """Resources of the most similar stored activity, if it clears the threshold."""
+        matches = self.search(title, category, description, k=1)
+        if matches and matches[0][0] >= self.threshold:
+            score, matched_title, resources = matches[0]
+            self.hits += 1
+            print(f"[Resource Index] Reusing resources of '{matched_title}' for '{title}' (similarity {score:.2f})")
+            return resources
+        self.misses += 1
+        return None
+
+    def add(self, title: str, category: str, description: str, resources: List[Resource]):
+        if not resources:
+            return
+        text = activity_text(title, category, description)
+        payload = fastjson.dumps_str([r.model_dump() for r in resources])
+        with self._lock:
+            self._refresh()
+            self._conn.execute(
+                "INSERT INTO resource_sets (category, title, text, resources, created_at) VALUES (?, ?, ?, ?, ?)",
+                (category, title, text, payload, time.time()),
+            )
+            self._append(category, title, text, resources)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "rebuilds": self.rebuilds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "threshold": self.threshold,
+        }
+
+
+_index: Optional[ResourceIndex] = None
+
+
+def get_resource_index() -> Optional[ResourceIndex]:
+    """The index at GARBHVEDA_RESOURCE_INDEX (default backend/data/resources.sqlite3), opened on first use."""
+    global _index
+    if _index is None:
+        path = Path(os.getenv("GARBHVEDA_RESOURCE_INDEX") or DEFAULT_INDEX_PATH)
+        try:
+            _index = ResourceIndex(path)
+            print(f"[Resource Index] Loaded {_index.stats()['entries']} resource sets from {path}")
+        except Exception as e:
+            print(f"[Resource Index] Could not open {path}: {e}")
+            return None
+    return _index
+
+
+def set_resource_index(index: ResourceIndex):
+    global _index
+    _index = index
@@ -0,0 +1,98 @@
+"""
+LLM Wrapper Pool
+
+Bounded LRU pool of warmed LLM wrappers shared by every tenant. Wrappers are
+keyed by (provider, model, API key fingerprint), so one tenant switching
+models or keys never evicts clients another tenant is still using; entries
+only leave the pool when it is full or when they have been idle too long.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PoolKey = Tuple[str, str, str]
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """Short, non-reversible identifier for an API key (never store the key itself)."""
+    if not api_key:
+        return "nokey"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class _PoolEntry:
+    wrapper: Any
+    created_at: float
+    last_used: float
+
+
+class WrapperPool:
+    def __init__(self, max_size: int = 16, idle_ttl: float = 30 * 60):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._entries: "OrderedDict[PoolKey, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, provider: str, model_name: str, api_key: Optional[str],
+                      factory: Callable[[], Any]) -> Any:
+        """Return the pooled wrapper for this key, building it with `factory` on a miss."""
+        key = (provider, model_name, key_fingerprint(api_key))
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_used = now
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.wrapper
+
+        # Build outside the lock; client construction can be slow
+        wrapper = factory()
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another request built the same wrapper concurrently; keep the first
+                existing.last_used = now
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return existing.wrapper
+            self.misses += 1
+            self._entries[key] = _PoolEntry(wrapper=wrapper, created_at=now, last_used=now)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return wrapper
+
+    def _evict_idle(self, now: float):
+        expired = [key for key, entry in self._entries.items() if now - entry.last_used > self.idle_ttl]
+        for key in expired:
+            del self._entries[key]
+            self.evictions += 1
+
+    def keys(self) -> List[PoolKey]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,237 @@
+"""
+YouTube Results Page Scraper
+
+Streaming helpers used by the ReAct agent to turn a YouTube search results page
+into search results without downloading or parsing the whole page.
+
+The page embeds its data as the `ytInitialData` JSON blob. Rather than loading
+the full blob, we pull out each complete `"videoRenderer": {...}` object as
+soon as its closing brace arrives, which gives us title, channel, duration and
+live/short flags for every result. Bare `"videoId"` matches are collected as
+a fallback in case the renderer layout changes.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from ..util import fastjson
+
+
+@dataclass
+class YouTubeSearchResult:
+    """Represents a YouTube video found via search"""
+    video_id: str
+    url: str
+    title: str = ""
+    verified: bool = False
+    channel: str = ""
+    duration_seconds: Optional[int] = None
+    is_live: bool = False
+    is_short: bool = False
+
+
+# YouTube embeds video data in scripts with pattern "videoId":"XXXXXXXXXXX"
+VIDEO_ID_PATTERN = re.compile(rb'"videoId":"([a-zA-Z0-9_-]{11})"')
+# Bytes carried over between chunks so a match split across a boundary is still found.
+# One byte short of a full match, so a match is never seen twice.
+_VIDEO_ID_OVERLAP = len(b'"videoId":"') + 11
+
+_RENDERER_MARKER = b'"videoRenderer":'
+# Only these bytes change the JSON nesting state; everything else is skipped
+_JSON_STRUCTURE = re.compile(rb'[{}"\\]')
+# Give up on a renderer object that never closes rather than buffering the page
+_MAX_RENDERER_BYTES = 512 * 1024
+
+
+class VideoIdScanner:
+    """Incrementally finds "videoId" values in a byte stream."""
+
+    def __init__(self):
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> List[str]:
+        buffer = self._tail + chunk
+        ids = [match.group(1).decode("ascii") for match in VIDEO_ID_PATTERN.finditer(buffer)]
+        self._tail = buffer[-_VIDEO_ID_OVERLAP:]
+        return ids
+
+
+class VideoRendererScanner:
+    """
+    Incrementally extracts complete "videoRenderer" objects from a byte stream.
+
+    Tracks brace depth (ignoring braces inside strings) from the opening brace
+    after each marker, and decodes the object once its depth returns to zero.
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        self._buffer += chunk
+        found = []
+        while True:
+            if self._start is None:
+                idx = self._buffer.find(_RENDERER_MARKER, self._pos)
+                if idx == -1:
+                    # Keep just enough to recognise a marker split across chunks
+                    self._buffer = self._buffer[-(len(_RENDERER_MARKER) - 1):]
+                    self._pos = 0
+                    return found
+                self._start = idx + len(_RENDERER_MARKER)
+                self._pos = self._start
+                self._depth = 0
+                self._in_string = False
+
+            end = self._walk()
+            if end is None:
+                # Object continues in the next chunk; drop everything before it
+                if self._pos - self._start > _MAX_RENDERER_BYTES:
+                    self._buffer = b""
+                    self._pos = 0
+                    self._start = None
+                    return found
+                self._buffer = self._buffer[self._start:]
+                self._pos -= self._start
+                self._start = 0
+                return found
+
+            raw = self._buffer[self._start:end]
+            self._start = None
+            self._pos = end
+            try:
+                renderer = fastjson.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(renderer, dict):
+                found.append(renderer)
+
+    def _walk(self) -> Optional[int]:
+        """Advance through the buffer; return the end offset of a completed object."""
+        while True:
+            match = _JSON_STRUCTURE.search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+                return None
+            char = match.group()
+            i = match.start()
+            if self._in_string:
+                if char == b"\\":
+                    if i + 1 >= len(self._buffer):
+                        # The escaped byte hasn't arrived yet
+                        self._pos = i
+                        return None
+                    self._pos = i + 2
+                    continue
+                if char == b'"':
+                    self._in_string = False
+            elif char == b'"':
+                self._in_string = True
+            elif char == b"{":
+                self._depth += 1
+            elif char == b"}":
+                self._depth -= 1
+                if self._depth <= 0:
+                    return i + 1
+            self._pos = i + 1
+
+
+def _text_of(node) -> str:
+    """Flatten YouTube's {"simpleText": ...} / {"runs": [...]} text nodes."""
+    if not isinstance(node, dict):
+        return ""
+    if "simpleText" in node:
+        return str(node["simpleText"])
+    return "".join(str(run.get("text", "")) for run in node.get("runs", []) if isinstance(run, dict))
+
+
+def parse_duration(text: str) -> Optional[int]:
+    """Convert "1:02:03" / "12:34" style durations to seconds."""
+    if not text:
+        return None
+    try:
+        seconds = 0
+        for part in text.strip().split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def result_from_renderer(renderer: dict) -> Optional[YouTubeSearchResult]:
+    """Build a search result from a decoded videoRenderer object."""
+    video_id = renderer.get("videoId")
+    if not isinstance(video_id, str) or len(video_id) != 11:
+        return None
+
+    nav_url = (
+        renderer.get("navigationEndpoint", {})
+        .get("commandMetadata", {})
+        .get("webCommandMetadata", {})
+        .get("url", "")
+    )
+
+    badge_styles = [
+        badge.get("metadataBadgeRenderer", {}).get("style", "")
+        for badge in renderer.get("badges", [])
+        if isinstance(badge, dict)
+    ]
+    overlay_styles = [
+        overlay.get("thumbnailOverlayTimeStatusRenderer", {}).get("style", "")
+        for overlay in renderer.get("thumbnailOverlays", [])
+        if isinstance(overlay, dict)
+    ]
+    is_live = "BADGE_STYLE_TYPE_LIVE_NOW" in badge_styles or "LIVE" in overlay_styles
+    is_short = "/shorts/" in nav_url or "SHORTS" in overlay_styles
+
+    return YouTubeSearchResult(
+        video_id=video_id,
+        url=f"https://www.youtube.com/watch?v={video_id}",
+        title=_text_of(renderer.get("title")),
+        # The renderer only exists for videos YouTube is actually serving
+        verified=True,
+        channel=_text_of(renderer.get("ownerText") or renderer.get("longBylineText")),
+        duration_seconds=parse_duration(_text_of(renderer.get("lengthText"))),
+        is_live=is_live,
+        is_short=is_short,
+    )
+
+
+async def scan_search_results(chunks: AsyncIterator[bytes], limit: int) -> List[YouTubeSearchResult]:
+    """
+    Collect up to `limit` unique results from a results page byte stream.
+
+    Stops consuming the stream once `limit` renderer objects have been parsed.
+    If the page runs out first, bare video IDs (without metadata) fill the gap.
+    """
+    renderer_scanner = VideoRendererScanner()
+    id_scanner = VideoIdScanner()
+    results: List[YouTubeSearchResult] = []
+    seen = set()
+    bare_ids: List[str] = []
+
+    async for chunk in chunks:
+        bare_ids.extend(id_scanner.feed(chunk))
+        for renderer in renderer_scanner.feed(chunk):
+            result = result_from_renderer(renderer)
+            if result and result.video_id not in seen:
+                seen.add(result.video_id)
+                results.append(result)
+                if len(results) >= limit:
+                    return results
+
+    for video_id in bare_ids:
+        if len(results) >= limit:
+            break
+        if video_id not in seen:
+            seen.add(video_id)
+            results.append(YouTubeSearchResult(
+                video_id=video_id,
+                url=f"https://www.youtube.com/watch?v={video_id}",
+            ))
+    return results
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import sys
+
+import httpx
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.models import MAX_SPEECH_CHARS, AudioGenerationRequest
+from backend.util.admission import AdmissionLimiter, AdmissionMiddleware
+
+
+def test_limiter_queues_then_sheds():
+    print("Testing AdmissionLimiter...")
+
+    async def run():
+        limiter = AdmissionLimiter("test", limit=1, queue=1, wait=0.2)
+        assert await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        assert not await limiter.acquire()  # queue full: turned away at once
+
+        limiter.release(held_seconds=3.0)  # slot goes straight to the waiter
+        assert await queued and limiter.active == 1
+        assert limiter.retry_after() == 3
+
+        # A waiter that isn't served in time gives up and leaves the queue
+        assert not await limiter.acquire()
+        limiter.release()
+        assert limiter.active == 0
+        stats = limiter.stats()
+        assert stats["rejected"] == 1 and stats["timed_out"] == 1 and stats["admitted"] == 2
+
+    asyncio.run(run())
+    print("✅ AdmissionLimiter test passed!")
+
+
+def _app(limiters) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, limiters=limiters,
+                       routes=[("/slow", "expensive"), ("/health", None)], max_body_bytes=1024)
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.1)
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    @app.post("/speak")
+    async def speak(request: AudioGenerationRequest):
+        return {"chars": len(request.text)}
+
+    return app
+
+
+def test_middleware_sheds_overload_and_large_bodies():
+    print("Testing AdmissionMiddleware...")
+    limiters = {"expensive": AdmissionLimiter("expensive", limit=2, queue=2, wait=5.0)}
+
+    async def run():
+        transport = httpx.ASGITransport(app=_app(limiters))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.get("/slow") for _ in range(6)))
+            codes = sorted(r.status_code for r in responses)
+            assert codes == [200, 200, 200, 200, 503, 503]
+            busy = next(r for r in responses if r.status_code == 503)
+            assert int(busy.headers["retry-after"]) >= 1
+
+            # Unlimited routes aren't held up
+            assert (await client.get("/health")).status_code == 200
+
+            too_big = await client.post("/speak", content=b"x" * 2048, headers={"content-type": "application/json"})
+            assert too_big.status_code == 413
+
+            async def chunks():
+                for _ in range(4):
+                    yield b" " * 512
+            chunked = await client.post("/speak", content=chunks(), headers={"content-type": "application/json"})
+            assert chunked.status_code == 413
+
+            assert (await client.post("/speak", json={"text": "a" * 1000})).json() == {"chars": 1000}
+            assert (await client.post("/speak", json={"text": ""})).status_code == 422
+        assert limiters["expensive"].active == 0
+
+    asyncio.run(run())
+    try:
+        AudioGenerationRequest(text="a" * (MAX_SPEECH_CHARS + 1))
+        assert False, "expected a validation error"
+    except ValidationError:
+        pass
+    print("✅ AdmissionMiddleware test passed!")
+
+
+if __name__ == "__main__":
+    test_limiter_queues_then_sheds()
+    test_middleware_sheds_overload_and_large_bodies()
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import sys
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services import llm_service
+from backend.util.cache import MemoryBackend, get_backend, set_backend
+
+
+def links(activity_id: str, count: int, start: int = 1):
+    return [{"title": f"{activity_id} guide {i}", "url": f"https://example.com/{activity_id}/{i}", "description": "Guide"}
+            for i in range(start, start + count)]
+
+
+class FakeGroundedClient:
+    """Answers grounded generate_content calls from a script, recording the prompts."""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.prompts = []
+        self.models = self
+
+    def generate_content(self, model, contents, config):
+        self.prompts.append(contents)
+        text = self.answers.pop(0)
+        return type("Response", (), {"text": text})()
+
+
+def test_extract_json_object():
+    print("Testing grounded JSON recovery...")
+    fenced = 'Here are the links:\n```json\n{"activities": {"a1": []}}\n```\nEnjoy!'
+    assert llm_service._extract_json_object(fenced) == {"activities": {"a1": []}}
+    # Prose around a bare object, no fences
+    assert llm_service._extract_json_object('Sure! {"a1": {"resources": []}} Hope that helps.') == {"a1": {"resources": []}}
+    # Not an object, or not JSON at all
+    assert llm_service._extract_json_object("[1, 2, 3]") is None
+    assert llm_service._extract_json_object("I couldn't find anything {unbalanced") is None
+
+    parsed = llm_service._parse_batched_resources(json.dumps({"activities": {
+        "a1": {"resources": links("a1", 1) + [{"title": "No url"}]},
+        "a2": "not a list",
+    }}))
+    # Items that aren't valid resources are dropped, not the whole answer
+    assert list(parsed) == ["a1"] and len(parsed["a1"]) == 1
+    assert llm_service._parse_batched_resources(None) == {}
+    print("✅ Grounded JSON recovery test passed!")
+
+
+def test_batched_search_repairs_and_falls_back():
+    print("Testing batched resource search...")
+    activities = [
+        {"id": "a1", "title": "Prenatal Yoga", "category": "SPIRITUALITY", "description": "Gentle stretches"},
+        {"id": "a2", "title": "Sudoku", "category": "MATH", "description": "An easy puzzle"},
+        {"id": "a3", "title": "Lotus Painting", "category": "ART", "description": "Watercolor lotus"},
+    ]
+    batch = {"activities": {
+        "a1": links("a1", 3),
+        # One dead link, to be repaired
+        "a2": links("a2", 2) + [{"title": "Dead", "url": "https://broken.example.com/a2", "description": "Gone"}],
+        "a9": links("a9", 1),  # not an activity we asked about
+        # a3 missing from the answer altogether
+    }}
+    client = FakeGroundedClient([
+        # Fenced JSON with prose around it
+        "Here are the resources:\n```json\n" + json.dumps(batch) + "\n```",
+        # Repair: a bare object inside prose; a3 still gets nothing
+        "Sure! " + json.dumps({"activities": {"a2": links("a2", 1, start=3), "a3": []}}) + " Hope this helps.",
+        # Second repair: malformed
+        "I could not find more resources {",
+    ])
+
+    async def no_video(query):
+        return None
+
+    async def nothing_reusable(title, description, category):
+        return None
+
+    async def forget(title, description, category, resources):
+        pass
+
+    patched = {
+        "_gemini_client": client,
+        "_check_url_reachable": lambda url: "broken" not in url,
+        "_reusable_resources": nothing_reusable,
+        "_remember_resources": forget,
+        "get_react_agent": lambda: type("Agent", (), {"find_verified_video": staticmethod(no_video)})(),
+    }
+    saved = {name: getattr(llm_service, name) for name in patched}
+    previous = get_backend()
+    try:
+        for name, value in patched.items():
+            setattr(llm_service, name, value)
+        set_backend(MemoryBackend())
+
+        async def run():
+            llm_service.use_model_config("gemini")
+            return await llm_service.find_resources_for_activities(activities)
+
+        results = asyncio.run(run())
+    finally:
+        for name, value in saved.items():
+            setattr(llm_service, name, value)
+        set_backend(previous)
+
+    assert [r.url for r in results["a1"]] == [f"https://example.com/a1/{i}" for i in (1, 2, 3)]
+    # The dead link is dropped and the repair pass tops a2 back up
+    assert [r.url for r in results["a2"]] == [f"https://example.com/a2/{i}" for i in (1, 2, 3)]
+    # Nothing usable for a3 after both repairs: a plain search link
+    assert len(results["a3"]) == 1 and results["a3"][0].url.startswith("https://www.google.com/search?q=Lotus+Painting")
+    assert "a9" not in results
+
+    # One batched call, then repairs for only the activities still short of links
+    assert len(client.prompts) == 3
+    assert "a1" not in client.prompts[1] and "a2" in client.prompts[1] and "a3" in client.prompts[1]
+    assert "a2" not in client.prompts[2] and "a3" in client.prompts[2]
+    print("✅ Batched resource search test passed!")
+
+
+if __name__ == "__main__":
+    test_extract_json_object()
+    test_batched_search_repairs_and_falls_back()
@@ -0,0 +1,217 @@
+import asyncio
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.models import Activity, DailyCurriculum, Sankalpa
+from backend.util.cache import (RELEASE_LOCK_SCRIPT, MemoryBackend, RedisBackend, SQLiteBackend, TypedCache,
+                                decode_payload)
+
+
+class RESPStandIn(socketserver.ThreadingTCPServer):
+    """Just enough of the Redis protocol (GET, SET [NX] [PX], DEL, SCAN, the lock-release EVAL) to exercise RedisBackend."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RESPHandler)
+        self.data = {}
+        self.lock = threading.Lock()
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def bulk(self, value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        store = self.server
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            cmd, now = args[0].upper(), time.time()
+            with store.lock:
+                if cmd == b"GET":
+                    value, expires = store.data.get(args[1], (None, 0))
+                    reply = self.bulk(value if expires > now else None)
+                elif cmd == b"SET":
+                    opts = [a.upper() for a in args[3:]]
+                    ttl = int(args[3 + opts.index(b"PX") + 1]) / 1000 if b"PX" in opts else 1e9
+                    existing = store.data.get(args[1])
+                    if b"NX" in opts and existing and existing[1] > now:
+                        reply = b"$-1\r\n"
+                    else:
+                        store.data[args[1]] = (args[2], now + ttl)
+                        reply = b"+OK\r\n"
+                elif cmd == b"DEL":
+                    removed = sum(1 for key in args[1:] if store.data.pop(key, None))
+                    reply = b":%d\r\n" % removed
+                elif cmd == b"EVAL" and args[1] == RELEASE_LOCK_SCRIPT.encode():
+                    value, expires = store.data.get(args[3], (None, 0))
+                    released = expires > now and value == args[4] and store.data.pop(args[3])
+                    reply = b":%d\r\n" % bool(released)
+                elif cmd == b"SCAN":
+                    prefix = args[3].rstrip(b"*")
+                    keys = [key for key in store.data if key.startswith(prefix)]
+                    reply = b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(self.bulk(k) for k in keys)
+                else:
+                    reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+def make_curriculum(n: int) -> DailyCurriculum:
+    return DailyCurriculum(
+        sankalpa=Sankalpa(virtue="Patience", description="Breathe", mantra="Om"),
+        activities=[
+            Activity(id=f"a{i}", category="MATH", title=f"Activity {i}", description="Count the breaths " * 5,
+                     durationMinutes=10, content="Sit comfortably. " * 20)
+            for i in range(n)
+        ],
+    )
+
+
+def check_backend(backend):
+    cache = TypedCache(f"test_{backend.name}", DailyCurriculum, ttl=60, backend=backend)
+    curriculum = make_curriculum(6)
+    cache.set("week12", curriculum)
+    assert cache.get("week12") == curriculum
+    assert cache.get("week13") is None
+
+    # Repetitive model output compresses well
+    payload = backend.get(cache._key("week12"))
+    assert payload[:1] == b"\x01"
+    assert len(payload) < len(decode_payload(payload)) / 3
+
+    # Lock is exclusive until released
+    token = backend.acquire_lock("k", 5)
+    assert token and backend.acquire_lock("k", 5) is None
+    backend.release_lock("k", token)
+    assert backend.acquire_lock("k", 5)
+
+    # A lock that expired and was taken by another worker isn't released by its old holder
+    stale = backend.acquire_lock("expiring", 0.1)
+    time.sleep(0.2)
+    assert backend.acquire_lock("expiring", 5)
+    backend.release_lock("expiring", stale)
+    assert backend.acquire_lock("expiring", 5) is None
+
+    short = TypedCache(f"short_{backend.name}", str, ttl=0.2, backend=backend)
+    short.set("x", "value")
+    assert short.get("x") == "value"
+    time.sleep(0.3)
+    assert short.get("x") is None
+
+
+def test_memory_backend():
+    print("Testing memory cache backend...")
+    check_backend(MemoryBackend())
+    print("✅ Memory backend passed!")
+
+
+def test_sqlite_backend_shared_between_workers():
+    print("Testing SQLite cache backend...")
+    path = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+    check_backend(SQLiteBackend(path))
+
+    # A second connection (another worker) sees the first one's writes
+    writer = TypedCache("shared", str, ttl=60, backend=SQLiteBackend(path))
+    reader = TypedCache("shared", str, ttl=60, backend=SQLiteBackend(path))
+    writer.set("k", "from worker 1")
+    assert reader.get("k") == "from worker 1"
+    print("✅ SQLite backend passed!")
+
+
+def test_redis_backend_against_stand_in():
+    print("Testing Redis cache backend...")
+    server = RESPStandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        host, port = server.server_address
+        check_backend(RedisBackend(f"redis://{host}:{port}/0"))
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ Redis backend passed!")
+
+
+def test_get_or_set_computes_once():
+    print("Testing get_or_set single flight...")
+    cache = TypedCache("single_flight", bool, ttl=60, backend=MemoryBackend())
+    calls = []
+
+    async def verify():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return False
+
+    async def run():
+        return await asyncio.gather(*[cache.aget_or_set("url", verify) for _ in range(10)])
+
+    # A False result is a value too, and is cached like any other
+    assert asyncio.run(run()) == [False] * 10
+    assert asyncio.run(run()) == [False] * 10
+    assert len(calls) == 1
+
+    # None means "don't cache"
+    assert cache.get_or_set("missing", lambda: None) is None
+    assert cache.get("missing") is None
+    print("✅ get_or_set test passed!")
+
+
+class SlowBackend(MemoryBackend):
+    """A memory backend that takes as long as a slow disk or network round-trip."""
+
+    blocking = True
+
+    def get(self, key):
+        time.sleep(0.1)
+        return super().get(key)
+
+
+def test_async_path_keeps_the_loop_free():
+    print("Testing async cache calls on a blocking backend...")
+    cache = TypedCache("slow_backend", str, ttl=60, backend=SlowBackend())
+
+    async def run():
+        ticks = []
+
+        async def heartbeat():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        await asyncio.sleep(0)
+        value = await cache.aget_or_set("k", lambda: asyncio.sleep(0, result="v"))
+        assert value == "v" and await cache.aget("k") == "v"
+        beat.cancel()
+        # Every backend read took 100 ms, and the loop kept ticking throughout
+        return max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    assert asyncio.run(run()) < 0.08
+    print("✅ Async cache path test passed!")
+
+
+if __name__ == "__main__":
+    test_memory_backend()
+    test_sqlite_backend_shared_between_workers()
+    test_redis_backend_against_stand_in()
+    test_get_or_set_computes_once()
+    test_async_path_keeps_the_loop_free()
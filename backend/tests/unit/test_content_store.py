@@ -0,0 +1,61 @@
+import datetime
+import os
+import sys
+import tempfile
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.models import Activity, DailyCurriculum, Sankalpa
+from backend.precompute import parse_moods, parse_weeks, pending_jobs
+from backend.services.content_store import ContentStore
+
+
+def curriculum(virtue: str) -> DailyCurriculum:
+    return DailyCurriculum(
+        sankalpa=Sankalpa(virtue=virtue, description="Breathe", mantra="Om"),
+        activities=[Activity(id="a1", category="ART", title="Draw", description="Draw a lotus",
+                             durationMinutes=10, content="Take a pencil.")],
+    )
+
+
+def test_store_rotates_variants():
+    print("Testing ContentStore...")
+    path = os.path.join(tempfile.mkdtemp(), "curricula.sqlite3")
+    store = ContentStore(path)
+    store.put(12, "calm", 0, curriculum("Patience"))
+    store.put(12, "CALM", 1, curriculum("Gratitude"))
+
+    assert store.variants(12, "Calm") == [0, 1]
+    assert store.pick(12, "TIRED") is None
+    day = datetime.date(2026, 1, 1)
+    first = store.pick(12, "calm", day).sankalpa.virtue
+    second = store.pick(12, "calm", day + datetime.timedelta(days=1)).sankalpa.virtue
+    assert {first, second} == {"Patience", "Gratitude"}
+
+    # A server process picks up rows written by the precompute job
+    reader = ContentStore(path)
+    store.put(13, "", 0, curriculum("Courage"))
+    assert reader.pick(13, None).sankalpa.virtue == "Courage"
+    print("✅ ContentStore test passed!")
+
+
+def test_precompute_resumes():
+    print("Testing precompute resume...")
+    store = ContentStore(os.path.join(tempfile.mkdtemp(), "curricula.sqlite3"))
+    weeks, moods = parse_weeks("1-2,4"), parse_moods("none,calm")
+    assert weeks == [1, 2, 4] and moods == ["", "CALM"]
+
+    assert len(pending_jobs(store, weeks, moods, 2, force=False)) == 12
+    store.put(1, "", 0, curriculum("Patience"))
+    store.put(4, "CALM", 1, curriculum("Patience"))
+    pending = pending_jobs(store, weeks, moods, 2, force=False)
+    assert len(pending) == 10
+    assert (1, "", 0) not in pending and (4, "CALM", 1) not in pending
+    assert len(pending_jobs(store, weeks, moods, 2, force=True)) == 12
+    print("✅ Precompute resume test passed!")
+
+
+if __name__ == "__main__":
+    test_store_rotates_variants()
+    test_precompute_resumes()
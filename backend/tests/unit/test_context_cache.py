@@ -0,0 +1,48 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services.context_cache import ContextCacheUsage
+from backend.services.llm_factory import GeminiWrapper
+
+INSTRUCTION = "You are a holistic Garbh Sanskar guide."
+
+
+class FakeModels:
+    """Stands in for genai's client.models; the provider reuses the prefix after the first call."""
+
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, model, contents, config):
+        self.requests.append(config)
+        cached = 100 if len(self.requests) > 1 else None
+        usage = SimpleNamespace(prompt_token_count=400, cached_content_token_count=cached)
+        return SimpleNamespace(text='{"ok": true}', usage_metadata=usage)
+
+
+def test_implicit_prefix_caching_is_recorded():
+    print("Testing context cache usage accounting...")
+    usage = ContextCacheUsage()
+    models = FakeModels()
+    wrapper = GeminiWrapper(SimpleNamespace(models=models), "gemini-test", context_cache=usage)
+
+    for _ in range(3):
+        assert wrapper.generate("Week 12 curriculum", system_instruction=INSTRUCTION) == '{"ok": true}'
+    # The instruction is always sent inline; no explicit cached context is referenced
+    assert all(c.system_instruction == INSTRUCTION and c.cached_content is None for c in models.requests)
+
+    stats = usage.stats()
+    assert stats["requests"] == 3 and stats["prompt_tokens"] == 1200 and stats["cached_tokens"] == 200
+    assert stats["cached_token_ratio"] == 0.167
+    # Responses without usage metadata don't count as requests
+    wrapper._record_usage(None)
+    assert usage.stats()["requests"] == 3
+    print("✅ Context cache usage test passed!")
+
+
+if __name__ == "__main__":
+    test_implicit_prefix_caching_is_recorded()
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.util.deadline import MIN_TIMEOUT_SECONDS, deadline, deadline_timeout, expired, has_budget, remaining
+
+
+def test_deadline_budget():
+    print("Testing request deadlines...")
+
+    # No deadline: everything behaves as before
+    assert remaining() is None and has_budget(1000) and deadline_timeout(5.0) == 5.0
+
+    with deadline(2.0):
+        assert 1.9 < remaining() <= 2.0
+        assert deadline_timeout(5.0) <= 2.0 and deadline_timeout(1.0) == 1.0
+        assert not has_budget(10.0)
+
+        # Nested deadlines can only shorten the enclosing one...
+        with deadline(10.0):
+            assert remaining() <= 2.0
+        # ...unless they opt out (background jobs)
+        with deadline(10.0, inherit=False):
+            assert remaining() > 9.0
+
+    with deadline(0.01):
+        time.sleep(0.02)
+        assert expired() and deadline_timeout(5.0) == MIN_TIMEOUT_SECONDS
+
+    assert remaining() is None
+    print("✅ Deadline budget test passed!")
+
+
+def test_fallback_skips_react_without_budget():
+    print("Testing resource fallback under an exhausted deadline...")
+    from backend.services import llm_service
+
+    class Agent:
+        calls = 0
+
+        async def find_verified_video(self, query):
+            Agent.calls += 1
+            return "https://www.youtube.com/watch?v=abcdefghijk"
+
+    original = llm_service._react_agent
+    llm_service._react_agent = Agent()
+    try:
+        with deadline(llm_service.REACT_SEARCH_SECONDS / 2):
+            resources = asyncio.run(llm_service._fallback_resources("Prenatal Yoga", "BONDING"))
+        assert Agent.calls == 0
+        assert llm_service._is_search_fallback(resources[0].url)
+
+        resources = asyncio.run(llm_service._fallback_resources("Prenatal Yoga", "BONDING"))
+        assert Agent.calls == 1 and "youtube.com/watch" in resources[0].url
+    finally:
+        llm_service._react_agent = original
+    print("✅ Resource fallback deadline test passed!")
+
+
+if __name__ == "__main__":
+    test_deadline_budget()
+    test_fallback_skips_react_without_budget()
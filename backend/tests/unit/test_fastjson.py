@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.bench.json_bench import sample_curriculum
+from backend.models import DailyCurriculum
+from backend.util import fastjson
+from backend.util.responses import ORJSONResponse
+
+
+def test_dumps_and_loads():
+    print("Testing fastjson round trips...")
+    curriculum = sample_curriculum()
+    data = {"mantra": "ॐ शान्तिः", "tags": {"calm"}, "curriculum": curriculum, "n": 1.5}
+
+    encoded = fastjson.dumps(data)
+    assert isinstance(encoded, bytes) and "ॐ".encode("utf-8") in encoded
+    decoded = fastjson.loads(encoded)
+    assert decoded == fastjson.loads(encoded.decode("utf-8")) == json.loads(encoded)
+    assert decoded["tags"] == ["calm"] and decoded["curriculum"] == curriculum.model_dump(mode="json")
+
+    # Models go straight through pydantic-core; indent is for files people read
+    assert fastjson.dumps(curriculum) == curriculum.model_dump_json().encode("utf-8")
+    assert fastjson.dumps_str({"a": 1}) == '{"a":1}'
+    assert fastjson.dumps({"a": 1}, indent=True).decode().startswith('{\n  "a"')
+
+    try:
+        fastjson.loads("{not json")
+        assert False, "expected a decode error"
+    except json.JSONDecodeError:
+        pass
+    print("✅ fastjson round trip test passed!")
+
+
+def test_orjson_response_matches_default_encoder():
+    print("Testing ORJSONResponse...")
+    curriculum = sample_curriculum()
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/model", response_model=DailyCurriculum)
+    def model():
+        return curriculum
+
+    @app.get("/direct", response_model=DailyCurriculum)
+    def direct():
+        return ORJSONResponse(curriculum)
+
+    client = TestClient(app)
+    via_model, via_direct = client.get("/model"), client.get("/direct")
+    assert via_model.headers["content-type"] == via_direct.headers["content-type"] == "application/json"
+    assert via_model.json() == via_direct.json() == json.loads(curriculum.model_dump_json())
+    print("✅ ORJSONResponse test passed!")
+
+
+if __name__ == "__main__":
+    test_dumps_and_loads()
+    test_orjson_response_matches_default_encoder()
@@ -0,0 +1,49 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services import llm_service
+
+
+def grounded_response(uris):
+    chunks = [SimpleNamespace(web=SimpleNamespace(uri=uri, title=f"Video {i}")) for i, uri in enumerate(uris)]
+    metadata = SimpleNamespace(grounding_chunks=chunks)
+    return SimpleNamespace(candidates=[SimpleNamespace(grounding_metadata=metadata)], text="")
+
+
+def test_redirects_resolved_concurrently_and_cached():
+    print("Testing grounding redirect resolution...")
+    agent = llm_service.ReActYouTubeAgent(gemini_client=None)
+    resolved = []
+
+    async def resolve_redirect(url, http_client):
+        resolved.append(url)
+        await asyncio.sleep(0.1)
+        return f"https://www.youtube.com/watch?v={url[-11:]}"
+
+    agent._resolve_redirect = resolve_redirect
+    redirects = [f"https://vertexaisearch.cloud.google.com/grounding-api-redirect/test{i}-{'x' * 6}{i:04d}" for i in range(6)]
+    response = grounded_response(redirects + ["https://www.youtube.com/watch?v=plainvideo1"])
+
+    started = time.monotonic()
+    results = asyncio.run(agent.extract_youtube_urls_from_grounding(response))
+    elapsed = time.monotonic() - started
+    assert len(results) == 7 and len(resolved) == 6
+    # One round-trip, not six
+    assert elapsed < 0.3, elapsed
+    # Chunk order is preserved
+    assert [r.title for r in results] == [f"Video {i}" for i in range(7)]
+
+    # The same redirects again come from the cache
+    asyncio.run(agent.extract_youtube_urls_from_grounding(response))
+    assert len(resolved) == 6
+    print("✅ Grounding redirect test passed!")
+
+
+if __name__ == "__main__":
+    test_redirects_resolved_concurrently_and_cached()
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.util.http_cache import HTTPOptimizationMiddleware
+
+JOKES = {"jokes": [f"Why did the baby bring a ladder? Joke number {i}." for i in range(50)]}
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(HTTPOptimizationMiddleware, policies=[("/api/jokes", "private, max-age=60")], minimum_size=1024)
+
+    @app.get("/api/jokes")
+    def jokes():
+        return JOKES
+
+    @app.get("/api/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/api/stream")
+    def stream():
+        async def body():
+            for i in range(3):
+                yield json.dumps({"i": i}) + "\n"
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def test_compression_and_conditional_get():
+    print("Testing compression and ETags...")
+    client = _client()
+
+    plain = client.get("/api/jokes", headers={"Accept-Encoding": "identity"})
+    assert plain.json() == JOKES and "content-encoding" not in plain.headers
+    assert plain.headers["cache-control"] == "private, max-age=60"
+    etag = plain.headers["etag"]
+
+    compressed = client.get("/api/jokes", headers={"Accept-Encoding": "gzip, br"})
+    assert compressed.headers["content-encoding"] == "br" and compressed.json() == JOKES
+    assert int(compressed.headers["content-length"]) < len(plain.content) / 4
+    assert compressed.headers["etag"] == etag[:-1] + '-br"'
+    assert "Accept-Encoding" in compressed.headers["vary"]
+    raw = client.get("/api/jokes", headers={"Accept-Encoding": "gzip"}).headers
+    assert raw["content-encoding"] == "gzip"
+
+    # Unchanged data: 304 with no body, for either representation's tag
+    for tag in (etag, compressed.headers["etag"], f"W/{etag}"):
+        cached = client.get("/api/jokes", headers={"If-None-Match": tag})
+        assert cached.status_code == 304 and cached.content == b"" and cached.headers["etag"]
+    assert client.get("/api/jokes", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    # Small bodies aren't compressed; the default policy revalidates
+    small = client.get("/api/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers and small.headers["cache-control"] == "no-cache"
+    print("✅ Compression and ETag test passed!")
+
+
+def test_streams_pass_through():
+    print("Testing streaming passthrough...")
+    response = _client().get("/api/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.text.splitlines() == ['{"i": 0}', '{"i": 1}', '{"i": 2}']
+    assert "etag" not in response.headers and "content-encoding" not in response.headers
+    print("✅ Streaming passthrough test passed!")
+
+
+if __name__ == "__main__":
+    test_compression_and_conditional_get()
+    test_streams_pass_through()
@@ -0,0 +1,72 @@
+import asyncio
+import contextvars
+import os
+import sys
+import time
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services.jobs import DONE, FAILED, JobManager
+
+tenant = contextvars.ContextVar("tenant", default=None)
+
+
+def test_identical_jobs_are_deduplicated():
+    print("Testing job dedup...")
+
+    async def run():
+        manager = JobManager(max_workers=2)
+        manager.start()
+        calls = []
+
+        async def generate():
+            calls.append(tenant.get())
+            await asyncio.sleep(0.05)
+            return {"raagas": ["Yaman"]}
+
+        tenant.set("acme")
+        first = manager.submit("raagas", ("acme",), generate)
+        second = manager.submit("raagas", ("acme",), generate)
+        other = manager.submit("raagas", ("other",), generate)
+        assert first is second and first is not other
+
+        await manager.wait(first, timeout=1)
+        await manager.wait(other, timeout=1)
+        assert first.status == DONE and first.to_dict()["result"] == {"raagas": ["Yaman"]}
+        # Jobs run with the submitter's context
+        assert calls == ["acme", "acme"]
+
+        # Once finished, the same work can be submitted again
+        assert manager.submit("raagas", ("acme",), generate) is not first
+        await manager.stop()
+
+    asyncio.run(run())
+    print("✅ Job dedup test passed!")
+
+
+def test_failures_and_ttl():
+    print("Testing job failure and TTL...")
+
+    async def run():
+        manager = JobManager(max_workers=1, result_ttl=0.1)
+
+        async def broken():
+            raise RuntimeError("quota exhausted")
+
+        job = manager.submit("curriculum", (12,), broken)
+        await manager.wait(job, timeout=1)
+        assert job.status == FAILED and job.to_dict()["error"] == "quota exhausted"
+        assert manager.get(job.id) is job
+
+        time.sleep(0.15)
+        assert manager.get(job.id) is None
+        await manager.stop()
+
+    asyncio.run(run())
+    print("✅ Job failure/TTL test passed!")
+
+
+if __name__ == "__main__":
+    test_identical_jobs_are_deduplicated()
+    test_failures_and_ttl()
@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.util.json_stream import IncrementalJSONParser
+
+DOC = {
+    "interpretation": "Water {often} means \"renewal\" \\ growth",
+    "score": 12,
+    "names": [
+        {"name": "Aarav", "meaning": "Peaceful"},
+        {"name": "Anaya", "meaning": "Caring"},
+    ],
+    "meta": {"tags": [1, 2]},
+    "affirmation": "I am calm",
+}
+
+
+def test_incremental_events():
+    print("Testing IncrementalJSONParser...")
+    # Model output sometimes arrives wrapped in a markdown fence
+    text = "```json\n" + json.dumps(DOC) + "\n```"
+    for size in (1, 5, len(text)):
+        parser = IncrementalJSONParser()
+        events = []
+        for i in range(0, len(text), size):
+            events.extend(parser.feed(text[i:i + size]))
+
+        assert events == [
+            (("interpretation",), DOC["interpretation"]),
+            (("score",), 12),
+            (("names", 0), DOC["names"][0]),
+            (("names", 1), DOC["names"][1]),
+            (("meta",), DOC["meta"]),
+            (("affirmation",), "I am calm"),
+        ]
+        assert parser.done
+        assert parser.result() == DOC
+    print("SUCCESS: Fields and array elements emitted as they closed")
+
+
+def test_field_emitted_before_object_closes():
+    print("Testing early emission...")
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"interpretation": "Fly') == []
+    assert parser.feed('ing high", "affir') == [(("interpretation",), "Flying high")]
+    assert not parser.done
+    print("SUCCESS: First field available before the rest of the object")
+
+
+if __name__ == "__main__":
+    test_incremental_events()
+    test_field_emitted_before_object_closes()
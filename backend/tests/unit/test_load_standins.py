@@ -0,0 +1,74 @@
+import asyncio
+import os
+import random
+import sys
+
+import httpx
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.bench.load import FakeContext, ServiceProfile, StandInServer, fake_from_schema, youtube_results_page
+from backend.models import DailyCurriculum, VedicNamesBatchResponse
+from backend.services.llm_service import ReActYouTubeAgent
+from backend.services.youtube_scraper import scan_search_results
+
+
+def test_fake_answers_follow_schema_and_prompt():
+    print("Testing stand-in structured output...")
+    rng = random.Random(7)
+    prompt = ("- ID: r1\n  Generate 5 unique names\n  Every name MUST start with the letter K. Do NOT...\n"
+              "- ID: r2\n  Generate 5 unique names\n")
+    schema = VedicNamesBatchResponse.model_json_schema()
+    ctx = FakeContext(rng, prompt, "http://stand-in", defs=schema["$defs"])
+    batch = VedicNamesBatchResponse.model_validate(fake_from_schema(schema, ctx))
+    assert [item.id for item in batch.results] == ["r1", "r2"]
+    assert all(name.name.startswith("K") for name in batch.results[0].names)
+    assert len(batch.results[1].names) == 5
+
+    # Gemini-style schema, as the SDK sends it
+    gemini_schema = {"type": "OBJECT", "properties": {
+        "sankalpa": {"type": "OBJECT", "properties": {k: {"type": "STRING"} for k in ("virtue", "description", "mantra")}},
+        "activities": {"type": "ARRAY", "items": {"type": "OBJECT", "properties": {
+            "id": {"type": "STRING"},
+            "category": {"type": "STRING", "enum": ["MATH", "ART", "SPIRITUALITY", "BONDING"]},
+            "title": {"type": "STRING"}, "description": {"type": "STRING"},
+            "durationMinutes": {"type": "INTEGER"}, "content": {"type": "STRING"},
+            "solution": {"type": "STRING", "nullable": True},
+        }}},
+    }}
+    ctx = FakeContext(rng, "2. **Activities**: Provide exactly 4 distinct activities", "http://stand-in")
+    curriculum = DailyCurriculum.model_validate(fake_from_schema(gemini_schema, ctx))
+    assert len(curriculum.activities) == 4
+    print("✅ Stand-in structured output test passed!")
+
+
+def test_youtube_stand_ins():
+    print("Testing YouTube stand-ins...")
+
+    async def chunks(page: bytes):
+        for i in range(0, len(page), 16 * 1024):
+            yield page[i:i + 16 * 1024]
+
+    results = asyncio.run(scan_search_results(chunks(youtube_results_page("raag yaman", padding_kb=64)), 5))
+    assert len(results) == 5 and results[0].title == "raag yaman (1)" and results[0].duration_seconds == 180
+
+    server = StandInServer({name: ServiceProfile(0.0) for name in ("gemini", "groq", "youtube")}).start()
+    try:
+        # A grounding redirect resolves to the youtube.com URL without requesting it
+        agent = ReActYouTubeAgent(None)
+
+        async def resolve():
+            async with httpx.AsyncClient(trust_env=False) as client:
+                return await agent._follow_hops(f"{server.url}/grounding-api-redirect/abcdefghijk", client)
+
+        assert asyncio.run(resolve()) == "https://www.youtube.com/watch?v=abcdefghijk"
+        assert server.counts()["calls"] == {"youtube:grounding-redirect": 1}
+    finally:
+        server.stop()
+    print("✅ YouTube stand-ins test passed!")
+
+
+if __name__ == "__main__":
+    test_fake_answers_follow_schema_and_prompt()
+    test_youtube_stand_ins()
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.util.loop_watchdog import LoopWatchdog
+
+
+def blocking_call(seconds: float):
+    time.sleep(seconds)  # a synchronous call on the loop, like requests.get
+
+
+def test_watchdog_reports_blocking_call_site():
+    print("Testing event loop watchdog...")
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01)
+
+    async def run():
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        blocking_call(0.3)
+        await asyncio.sleep(0.05)
+        blocking_call(0.15)
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+
+    asyncio.run(run())
+    stats = watchdog.stats()
+    assert stats["stalls"] == 2 and not stats["running"]
+    # A stall is measured from the heartbeat, which can already be partway into its sleep when the call starts
+    slack = 2 * watchdog.interval
+    assert 0.3 - slack <= stats["max_stall_seconds"] < 1.0
+    assert stats["histogram"]["le_0.25s"] == 1 and stats["histogram"]["le_0.5s"] == 1
+    [site] = stats["top_sites"]
+    assert site["site"].startswith("backend/tests/unit/test_loop_watchdog.py:") and "blocking_call" in site["site"]
+    assert site["count"] == 2 and site["seconds"] >= 0.45 - 2 * slack
+    # time.sleep is C code, so the innermost Python frame is the caller itself
+    assert site["blocked_in"] == site["site"] and "blocking_call" in site["stack"][-1]
+    assert stats["lag"]["max_ms"] >= 300
+    print("✅ Event loop watchdog test passed!")
+
+
+if __name__ == "__main__":
+    test_watchdog_reports_blocking_call_site()
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services import llm_service
+from backend.services.llm_factory import GroqWrapper
+from backend.services.name_index import NameIndex, set_name_index
+from backend.util.batching import MicroBatcher
+
+
+def test_micro_batcher_coalesces_and_falls_back():
+    print("Testing MicroBatcher...")
+    batches, singles = [], []
+
+    async def run_batch(keys):
+        batches.append(keys)
+        if "broken" in keys:
+            raise ValueError("unparseable")
+        # Leave one key unanswered to exercise the per-key fallback
+        return {key: key.upper() for key in keys if key != "skipped"}
+
+    async def run_single(key):
+        singles.append(key)
+        return key.upper()
+
+    async def run():
+        batcher = MicroBatcher("test", run_batch, run_single, window=0.02, max_batch=8)
+        results = await asyncio.gather(*(batcher.submit(k) for k in ["a", "b", "a", "skipped"]))
+        assert results == ["A", "B", "A", "SKIPPED"]
+        assert batches == [["a", "b", "skipped"]] and singles == ["skipped"]
+
+        # Different groups never share a batch; a lone key goes straight to run_single
+        await asyncio.gather(batcher.submit("c", group=1), batcher.submit("d", group=2))
+        assert len(batches) == 1 and singles == ["skipped", "c", "d"]
+
+        # A failed batch falls back to single calls for every key
+        results = await asyncio.gather(batcher.submit("broken"), batcher.submit("e"))
+        assert results == ["BROKEN", "E"] and singles[-2:] == ["broken", "e"]
+        stats = batcher.stats()
+        assert stats["calls"] == 8 and stats["shared"] == 1 and stats["batches"] == 2
+
+    asyncio.run(run())
+    print("✅ MicroBatcher test passed!")
+
+
+class FakeCompletions:
+    """Stands in for groq's chat.completions, answering name prompts."""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        prompt = kwargs["messages"][-1]["content"]
+        if '"results"' in prompt:
+            ids = [line.split("ID: ")[1].strip() for line in prompt.splitlines() if "ID: " in line]
+            letters = {"r1": "A", "r2": "K", "r3": "S"}
+            content = {"results": [
+                {"id": i, "names": [{"name": f"{letters[i]}name", "meaning": "m", "origin": "Sanskrit", "significance": "s"}]}
+                for i in ids
+            ]}
+        else:
+            content = {"names": [{"name": "Single", "meaning": "m", "origin": "Sanskrit", "significance": "s"}]}
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(content)))])
+
+
+def test_concurrent_name_requests_share_one_call():
+    print("Testing batched Vedic name generation...")
+    set_name_index(NameIndex(os.path.join(tempfile.mkdtemp(), "names.sqlite3")))
+    completions = FakeCompletions()
+    wrapper = GroqWrapper(SimpleNamespace(chat=SimpleNamespace(completions=completions), api_key="test"), "test-model")
+    original = llm_service._get_llm_wrapper
+    llm_service._get_llm_wrapper = lambda provider, model_name: wrapper
+    try:
+        async def burst():
+            return await asyncio.gather(
+                llm_service.top_up_vedic_names("Boy", "A", "Royal"),
+                llm_service.top_up_vedic_names("Girl", "K", None),
+                llm_service.top_up_vedic_names("Unisex", "S", "Nature"),
+            )
+
+        results = asyncio.run(burst())
+    finally:
+        llm_service._get_llm_wrapper = original
+    assert len(completions.requests) == 1
+    assert [[n["name"] for n in names] for names in results] == [["Aname"], ["Kname"], ["Sname"]]
+    print("✅ Batched Vedic names test passed!")
+
+
+if __name__ == "__main__":
+    test_micro_batcher_coalesces_and_falls_back()
+    test_concurrent_name_requests_share_one_call()
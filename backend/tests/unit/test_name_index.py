@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services.name_index import NameIndex
+
+
+def name(value: str) -> dict:
+    return {"name": value, "meaning": "m", "origin": "Sanskrit", "significance": "s"}
+
+
+def test_prefix_lookup_and_dedup():
+    print("Testing NameIndex...")
+    path = os.path.join(tempfile.mkdtemp(), "names.sqlite3")
+    index = NameIndex(path)
+
+    # The model ignored the letter for "Vihaan"; "aarav " is a duplicate of "Aarav"
+    added = index.add("boy", "royal", [name("Aarav"), name("Vihaan"), name("Arjun"), name("aarav ")], starting_letter="A")
+    assert added == 2
+    index.add("Boy", "Nature", [name("Aakash"), name("Bodhi")])
+
+    assert [n["name"] for n in index.lookup("Boy", "Royal", "a")] == ["Aarav", "Arjun"]
+    assert [n["name"] for n in index.lookup("Boy", "Royal", "Aa")] == ["Aarav"]
+    # Theme-less requests see every theme
+    assert [n["name"] for n in index.lookup("Boy", "", "A")] == ["Aakash", "Aarav", "Arjun"]
+    assert index.lookup("Girl", "Royal", "A") == []
+    assert len(index.sample("Boy", None, None, 10)) == 4
+
+    # Persisted, and visible to another worker's index
+    other = NameIndex(path)
+    assert other.count("Boy", "Royal", "A") == 2
+    index.add("Boy", "Royal", [name("Aditya")])
+    assert other.count("Boy", "Royal", "A") == 3
+    assert other.size() == 5
+    print("✅ NameIndex test passed!")
+
+
+if __name__ == "__main__":
+    test_prefix_lookup_and_dedup()
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services import prefetch
+from backend.services.prefetch import PrefetchScheduler
+from backend.util.cache import MemoryBackend, TypedCache
+from backend.util.deadline import remaining, set_deadline
+
+prefetch.LOAD_CHECK_SECONDS = 0.01
+
+
+def test_prefetch_runs_once_in_the_background():
+    print("Testing prefetch scheduling...")
+    done = []
+
+    async def run():
+        scheduler = PrefetchScheduler(budget_seconds=60)
+
+        async def generate(week):
+            # Runs under its own deadline, not the scheduling request's
+            assert remaining() > 30
+            await asyncio.sleep(0.01)
+            done.append(week)
+
+        set_deadline(1)
+        assert scheduler.schedule(("t", 13), lambda: generate(13))
+        assert not scheduler.schedule(("t", 13), lambda: generate(13))  # already queued
+        assert scheduler.schedule(("t", 14), lambda: generate(14))
+        while scheduler.stats()["completed"] < 2:
+            await asyncio.sleep(0.01)
+        assert done == [13, 14]  # one at a time, in order
+        await scheduler.stop()
+
+    asyncio.run(run())
+    print("✅ Prefetch scheduling test passed!")
+
+
+def test_prefetch_yields_to_load_and_quota():
+    print("Testing prefetch load shedding...")
+    load = {"busy": False, "quota": 0.0}
+
+    async def run():
+        scheduler = PrefetchScheduler(busy=lambda: load["busy"], quota_backoff=lambda: load["quota"], max_per_hour=3)
+        started = []
+
+        async def slow(key):
+            started.append(key)
+            await asyncio.sleep(10)
+
+        # Load arrives while a prefetch runs: it's cancelled and the queue dropped
+        scheduler.schedule("a", lambda: slow("a"))
+        scheduler.schedule("b", lambda: slow("b"))
+        await asyncio.sleep(0.02)
+        load["busy"] = True
+        await asyncio.sleep(0.05)
+        stats = scheduler.stats()
+        assert started == ["a"] and stats["cancelled"] == 2 and stats["running"] == stats["pending"] == 0
+        assert not scheduler.schedule("c", lambda: slow("c"))
+
+        # A claimed prefetch is shared with a real request, so it survives load
+        load["busy"] = False
+        scheduler.schedule("d", lambda: asyncio.sleep(0.1))
+        await asyncio.sleep(0.02)
+        scheduler.claim("d")
+        load["busy"] = True
+        while scheduler.stats()["running"]:
+            await asyncio.sleep(0.01)
+        assert scheduler.stats()["completed"] == 1
+
+        # Quota: nothing while the provider is backing off, and a cap per hour
+        load["busy"] = False
+        load["quota"] = 30.0
+        assert not scheduler.schedule("e", lambda: asyncio.sleep(0))
+        load["quota"] = 0.0
+        assert scheduler.schedule("f", lambda: asyncio.sleep(0))
+        await asyncio.sleep(0.02)
+        assert not scheduler.schedule("g", lambda: asyncio.sleep(0))  # a, d, f used the hour's 3
+        assert scheduler.stats()["skipped_quota"] == 2
+        await scheduler.stop()
+
+    asyncio.run(run())
+    print("✅ Prefetch load shedding test passed!")
+
+
+def test_shed_prefetch_keeps_shared_computation():
+    print("Testing shed prefetch with a request waiting on it...")
+    load = {"busy": False}
+
+    async def run():
+        cache = TypedCache("prefetch_shared", str, ttl=60, backend=MemoryBackend())
+        scheduler = PrefetchScheduler(busy=lambda: load["busy"])
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "curriculum"
+
+        # Another tenant's request (a different prefetch key, so nothing claimed)
+        # joins the computation the prefetch started; then load arrives
+        scheduler.schedule(("tenant-a", 13), lambda: cache.aget_or_set("week-13", generate))
+        await asyncio.sleep(0.02)
+        request = asyncio.create_task(cache.aget_or_set("week-13", generate))
+        await asyncio.sleep(0.01)
+        load["busy"] = True
+        assert await request == "curriculum"
+        assert scheduler.stats()["cancelled"] == 1 and calls == [1]
+        assert cache.get("week-13") == "curriculum"
+
+        # With nobody else waiting, a shed prefetch does stop the work
+        load["busy"] = False
+        scheduler.schedule(("tenant-a", 14), lambda: cache.aget_or_set("week-14", generate))
+        await asyncio.sleep(0.02)
+        load["busy"] = True
+        while scheduler.stats()["running"]:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.15)
+        assert cache.get("week-14") is None and not cache._inflight
+        await scheduler.stop()
+
+    asyncio.run(run())
+    print("✅ Shed prefetch test passed!")
+
+
+if __name__ == "__main__":
+    test_prefetch_runs_once_in_the_background()
+    test_prefetch_yields_to_load_and_quota()
+    test_shed_prefetch_keeps_shared_computation()
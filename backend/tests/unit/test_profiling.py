@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.util.profiling import ProfilingMiddleware, list_profiles, profile_path
+
+
+def busy_work() -> int:
+    return sum(i * i for i in range(20000))
+
+
+def _client(directory: Path, sample_rate: float = 0.0) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, is_admin=lambda headers: headers.get("x-api-key") == "admin",
+                       sample_rate=sample_rate, directory=directory, keep=2)
+
+    @app.get("/work")
+    async def work():
+        return {"total": busy_work()}
+
+    return TestClient(app)
+
+
+def test_profiles_admin_requests_only():
+    print("Testing per-request profiling...")
+    directory = Path(tempfile.mkdtemp())
+    client = _client(directory)
+
+    assert "x-profile-id" not in client.get("/work").headers
+    assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "1"}).headers  # not an admin
+    assert list_profiles(directory) == []
+
+    response = client.get("/work?n=1", headers={"X-Profile": "1", "X-API-Key": "admin"})
+    profile_id = response.headers["x-profile-id"]
+    [summary] = list_profiles(directory)
+    assert summary["id"] == profile_id and summary["path"] == "/work" and summary["status"] == 200
+    assert summary["query"] == "n=1" and summary["wall_ms"] >= summary["cpu_ms"] > 0
+    assert profile_path(profile_id, ".prof", directory) is not None
+    assert profile_path("../secrets", ".json", directory) is None
+
+    detail = json.loads(profile_path(profile_id, ".json", directory).read_bytes())
+    assert any("busy_work" in row["function"] for row in detail["top"])
+    print("✅ Per-request profiling test passed!")
+
+
+def test_sampling_keeps_newest():
+    print("Testing sampled profiling...")
+    directory = Path(tempfile.mkdtemp())
+    client = _client(directory, sample_rate=1.0)
+    ids = [client.get("/work").headers["x-profile-id"] for _ in range(3)]
+    assert [p["id"] for p in list_profiles(directory)] == ids[::-1][:2]
+    print("✅ Sampled profiling test passed!")
+
+
+if __name__ == "__main__":
+    test_profiles_admin_requests_only()
+    test_sampling_keeps_newest()
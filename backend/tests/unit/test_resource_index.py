@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.models import Resource
+from backend.services.resource_index import ResourceIndex
+
+ACTIVITIES = [
+    ("Prenatal Yoga for Back Pain", "SPIRITUALITY", "Gentle stretches to relieve lower back pain during pregnancy."),
+    ("Sudoku Puzzle", "MATH", "Solve an easy sudoku to engage your logical mind."),
+    ("Watercolor Lotus Painting", "ART", "Paint a lotus flower with watercolors while visualizing your baby."),
+    ("Gayatri Mantra Chanting", "SPIRITUALITY", "Chant the Gayatri mantra 11 times for peace."),
+    ("Garbh Samvad: Talk to Your Baby", "BONDING", "Spend 10 minutes talking to your baby about your day."),
+]
+
+
+def resources_for(title: str):
+    return [Resource(title=title, url=f"https://example.com/{len(title)}", description="Guide")]
+
+
+def test_similar_activity_reuses_resources():
+    print("Testing ResourceIndex...")
+    path = os.path.join(tempfile.mkdtemp(), "resources.sqlite3")
+    index = ResourceIndex(path, threshold=0.6)
+    for title, category, description in ACTIVITIES:
+        index.add(title, category, description, resources_for(title))
+
+    reused = index.lookup("Gentle Prenatal Yoga", "SPIRITUALITY", "Slow yoga poses safe for pregnancy to ease back pain.")
+    assert reused == resources_for("Prenatal Yoga for Back Pain")
+
+    # Related but different activities don't clear the threshold
+    assert index.lookup("Om Chanting", "SPIRITUALITY", "Chant Om 21 times.") is None
+    assert index.lookup("Knitting Baby Booties", "ART", "Knit a small pair of booties.") is None
+    # Matches never cross categories
+    assert index.lookup("Prenatal Yoga for Back Pain", "ART", "Gentle stretches to relieve lower back pain.") is None
+
+    top = index.search("Lotus Watercolor", "ART", "Paint lotus flowers in watercolor.", k=3)
+    assert top[0][1] == "Watercolor Lotus Painting"
+
+    # Another worker loads the same entries from disk
+    assert ResourceIndex(path, threshold=0.6).lookup("Lotus Watercolor", "ART", "Paint lotus flowers in watercolor.")
+    print("✅ ResourceIndex test passed!")
+
+
+def test_adds_update_the_matrix_incrementally():
+    print("Testing incremental ResourceIndex updates...")
+    index = ResourceIndex(os.path.join(tempfile.mkdtemp(), "resources.sqlite3"), threshold=0.6)
+    for i in range(40):
+        title, category, description = ACTIVITIES[i % len(ACTIVITIES)]
+        index.add(f"{title} {i}", category, description, resources_for(title))
+    index.search("Sudoku", "MATH", "A puzzle")
+    assert index.rebuilds == 1
+
+    # A new row is searchable straight away, weighted with the current IDF
+    index.add("Origami Crane Folding", "ART", "Fold a paper crane for your baby's mobile.", resources_for("Origami"))
+    assert index.lookup("Origami Crane Folding", "ART", "Fold a paper crane for the baby's mobile.") == resources_for("Origami")
+    assert index.rebuilds == 1
+
+    # Once a tenth of the rows are weighted with an outdated IDF, it is recomputed
+    for i in range(4):
+        index.add(f"Clay Modelling {i}", "ART", "Shape a small clay pot.", resources_for("Clay"))
+    index.search("Sudoku", "MATH", "A puzzle")
+    assert index.rebuilds == 2
+    print("✅ Incremental ResourceIndex test passed!")
+
+
+if __name__ == "__main__":
+    test_similar_activity_reuses_resources()
+    test_adds_update_the_matrix_incrementally()
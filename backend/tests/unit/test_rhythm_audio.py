@@ -0,0 +1,61 @@
+import io
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services import audio as audio_module
+from backend.services.audio import SAMPLE_RATE, rhythm_track, rhythm_wav
+
+
+def test_click_track_has_accented_beats():
+    print("Testing rhythm track synthesis...")
+    samples = rhythm_track(bpm=120, duration=4.0, beats_per_bar=4, pattern="click")
+    assert samples.dtype == np.int16 and len(samples) == 4 * SAMPLE_RATE
+
+    # 8 beats, half a second apart; the first of each bar is louder
+    beat = SAMPLE_RATE // 2
+    peaks = [np.abs(samples[i * beat:i * beat + 200]).max() for i in range(8)]
+    assert all(p > 1000 for p in peaks)
+    assert peaks[0] > peaks[1] and peaks[4] > peaks[5]
+    # Silence between clicks
+    assert np.abs(samples[beat // 2:beat - 10]).max() == 0
+    print("✅ Rhythm track test passed!")
+
+
+def test_wav_output_is_cached():
+    print("Testing rhythm WAV output...")
+    started = time.perf_counter()
+    audio = rhythm_wav(bpm=90, duration=300, beats_per_bar=3, pattern="counting")
+    elapsed = time.perf_counter() - started
+    print(f"  5 minute track synthesized in {elapsed * 1000:.1f} ms")
+
+    with wave.open(io.BytesIO(audio)) as wav:
+        assert wav.getnchannels() == 1 and wav.getsampwidth() == 2 and wav.getframerate() == SAMPLE_RATE
+        assert wav.getnframes() == 300 * SAMPLE_RATE
+
+    # Served from the LRU as the very same bytes
+    assert rhythm_wav(bpm=90, duration=300, beats_per_bar=3, pattern="counting") is audio
+
+    # Bounded by total size: the least recently used tracks go first
+    limit = audio_module.RHYTHM_CACHE_BYTES
+    try:
+        first = rhythm_wav(bpm=60, duration=10)
+        audio_module.RHYTHM_CACHE_BYTES = 3 * len(first)
+        tracks = [rhythm_wav(bpm=bpm, duration=10) for bpm in (61, 62, 63)]
+        assert audio_module._rhythm_cache_size <= audio_module.RHYTHM_CACHE_BYTES
+        assert rhythm_wav(bpm=61, duration=10) is tracks[0]
+        assert rhythm_wav(bpm=60, duration=10) is not first
+    finally:
+        audio_module.RHYTHM_CACHE_BYTES = limit
+    print("✅ Rhythm WAV test passed!")
+
+
+if __name__ == "__main__":
+    test_click_track_has_accented_beats()
+    test_wav_output_is_cached()
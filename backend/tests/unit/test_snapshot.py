@@ -0,0 +1,103 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.models import Sankalpa
+from backend.services.jobs import JobManager
+from backend.services.prefetch import PrefetchScheduler
+from backend.util import snapshot as snapshot_module
+from backend.util.cache import (MemoryBackend, TypedCache, get_backend, inflight_computations, restore_snapshot,
+                                save_snapshot, set_backend)
+
+
+def test_snapshot_round_trip():
+    print("Testing warm-restart snapshots...")
+    previous = get_backend()
+    sankalpas = TypedCache("snapshot_sankalpa", Sankalpa, ttl=3600)
+    short_lived = TypedCache("snapshot_short", str, ttl=1)
+    not_persisted = TypedCache("snapshot_skip", str, ttl=3600, persist=False)
+    value = Sankalpa(virtue="Patience", description="Breathe", mantra="Om Shanti")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "warm.bin"
+            set_backend(MemoryBackend())
+            sankalpas.set("week-12", value)
+            sankalpas.set("week-13", value.model_copy(update={"virtue": "Courage"}))
+            short_lived.set("soon-gone", "x")
+            not_persisted.set("bulky", "x")
+            assert save_snapshot(path, meta={"wrappers": [["gemini", "gemini-2.0-flash", "abc"]]}) == 2
+
+            # A fresh process: nothing is decoded until a key is asked for
+            set_backend(MemoryBackend())
+            snapshot = restore_snapshot(path)
+            assert len(snapshot) == 2 and snapshot.meta["wrappers"][0][0] == "gemini"
+            assert sankalpas.get("week-12") == value
+            assert snapshot.stats()["restored"] == 1 and snapshot.stats()["pending"] == 1
+            assert short_lived.get("soon-gone") is None and not_persisted.get("bulky") is None
+
+            # Writes win over the snapshot, and entries never asked for survive the next snapshot
+            sankalpas.set("week-12", value.model_copy(update={"mantra": "Om"}))
+            assert save_snapshot(path) == 2
+            set_backend(MemoryBackend())
+            restore_snapshot(path)
+            assert sankalpas.get("week-12").mantra == "Om" and sankalpas.get("week-13").virtue == "Courage"
+
+            # Expired while the app was down, or from another format version: ignored
+            snapshot_module.write_snapshot(path, [("snapshot_sankalpa:old", 1.0, b"x")])
+            assert len(snapshot_module.open_snapshot(path)) == 0
+            path.write_bytes(b"GVSNAP\x63\x00" + bytes(64))
+            assert snapshot_module.open_snapshot(path) is None
+    finally:
+        set_backend(previous)
+    print("✅ Snapshot round trip test passed!")
+
+
+def test_shutdown_drains_generations():
+    print("Testing shutdown drain...")
+
+    async def run():
+        jobs = JobManager(max_workers=1)
+        jobs.start()
+        job = jobs.submit("slow", ("a",), lambda: asyncio.sleep(0.1, result="done"))
+        assert await jobs.drain(5) and job.result == "done"
+
+        finished = []
+
+        async def prefetch(key):
+            await asyncio.sleep(0.1)
+            finished.append(key)
+
+        prefetcher = PrefetchScheduler(concurrency=1)
+        prefetcher.start()
+        prefetcher.schedule("running", lambda: prefetch("running"))
+        await asyncio.sleep(0.02)
+        prefetcher.schedule("queued", lambda: prefetch("queued"))
+        assert await prefetcher.drain(5)
+        # The running prefetch got to finish; the queued one was dropped
+        assert finished == ["running"] and prefetcher.stats()["cancelled"] == 1
+
+        cache = TypedCache("snapshot_inflight", str, ttl=60, backend=MemoryBackend())
+        fill = asyncio.create_task(cache.aget_or_set("k", lambda: asyncio.sleep(0.1, result="v")))
+        await asyncio.sleep(0.01)
+        pending = inflight_computations()
+        assert len(pending) == 1
+        await asyncio.wait(pending, timeout=5)
+        assert fill.done() and fill.result() == "v"
+
+        # Nothing outstanding: drains return straight away
+        assert await jobs.drain(0) and await prefetcher.drain(0)
+        await jobs.stop()
+        await prefetcher.stop()
+
+    asyncio.run(run())
+    print("✅ Shutdown drain test passed!")
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_shutdown_drains_generations()
@@ -0,0 +1,83 @@
+import base64
+import io
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services.audio import TARGET_DBFS, decode_pcm, mulaw_decode, mulaw_encode, negotiate_encoding, speech_to_wav
+
+TTS_MIME = "audio/L16;codec=pcm;rate=24000"
+
+
+def fake_tts(seconds: float = 10.0) -> bytes:
+    """Quiet 'speech' (a warbling tone) with half a second of silence either side, as raw L16 at 24 kHz."""
+    t = np.arange(int(seconds * 24000)) / 24000
+    voice = 0.05 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    silence = np.zeros(12000)
+    samples = np.concatenate([silence, voice, silence])
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+def test_speech_is_framed_resampled_and_normalized():
+    print("Testing TTS post-processing...")
+    raw = fake_tts()
+    audio = speech_to_wav(raw, TTS_MIME)
+
+    with wave.open(io.BytesIO(audio)) as wav:
+        assert wav.getframerate() == 16000 and wav.getnchannels() == 1 and wav.getsampwidth() == 2
+        # Silence trimmed down to the padding
+        assert abs(wav.getnframes() / 16000 - 10.1) < 0.05
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2") / 32768
+    rms_db = 20 * np.log10(np.sqrt(np.mean(samples ** 2)))
+    assert abs(rms_db - TARGET_DBFS) < 0.5
+
+    # base64 input (str or bytes) decodes to the same audio
+    assert speech_to_wav(base64.b64encode(raw).decode(), TTS_MIME) == audio
+    assert speech_to_wav(base64.b64encode(raw), TTS_MIME) == audio
+    print(f"  {len(raw)} bytes of L16 -> {len(audio)} bytes of WAV")
+    print("✅ TTS post-processing test passed!")
+
+
+def test_mulaw_encoding():
+    print("Testing mu-law encoding...")
+    raw = fake_tts()
+    assert negotiate_encoding("audio/vnd.wave;codec=7, audio/wav;q=0.5") == "mulaw"
+    assert negotiate_encoding("audio/wav") == "pcm16" and negotiate_encoding(None) == "pcm16"
+
+    audio = speech_to_wav(raw, TTS_MIME, encoding="mulaw")
+    assert audio[20:22] == (7).to_bytes(2, "little")
+    # 24 kHz 16-bit -> 16 kHz 8-bit (and trimmed)
+    assert len(raw) / len(audio) > 3
+
+    # Round trip stays within mu-law's quantization error
+    samples = np.linspace(-0.9, 0.9, 1001, dtype=np.float32)
+    assert np.max(np.abs(mulaw_decode(mulaw_encode(samples)) - samples)) < 0.03
+    # Known G.711 codes: silence and full scale
+    assert mulaw_encode(np.array([0.0, 1.0, -1.0], dtype=np.float32)).tolist() == [0xFF, 0x80, 0x00]
+    print("✅ mu-law test passed!")
+
+
+def test_processing_is_fast():
+    print("Testing TTS post-processing speed...")
+    raw = fake_tts(60.0)
+    speech_to_wav(raw, TTS_MIME)
+    started = time.perf_counter()
+    speech_to_wav(raw, TTS_MIME, encoding="mulaw")
+    per_second = (time.perf_counter() - started) / 61 * 1000
+    print(f"  {per_second:.2f} ms per second of audio")
+    assert per_second < 10
+    frames, rate = decode_pcm(raw, TTS_MIME)
+    assert rate == 24000 and frames.shape == (61 * 24000, 1)
+    print("✅ TTS post-processing speed test passed!")
+
+
+if __name__ == "__main__":
+    test_speech_is_framed_resampled_and_normalized()
+    test_mulaw_encoding()
+    test_processing_is_fast()
@@ -0,0 +1,60 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.models import DreamInterpretationResponse
+from backend.services.llm_factory import GroqWrapper
+
+
+class FakeCompletions:
+    """Stands in for groq's chat.completions, replaying canned replies."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = self.replies.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _wrapper(replies):
+    completions = FakeCompletions(replies)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions), api_key="test")
+    return GroqWrapper(client, "test-model"), completions
+
+
+def test_structured_single_pass():
+    print("Testing generate_structured...")
+    wrapper, completions = _wrapper(['{"interpretation": "Growth", "affirmation": "I am safe"}'])
+    result = wrapper.generate_structured(DreamInterpretationResponse, "Interpret this dream")
+
+    assert result == DreamInterpretationResponse(interpretation="Growth", affirmation="I am safe")
+    assert len(completions.requests) == 1
+    request = completions.requests[0]
+    assert request["response_format"] == {"type": "json_object"}
+    assert "affirmation" in request["messages"][0]["content"]  # schema sent in system prompt
+    print("SUCCESS: Validated in one call")
+
+
+def test_structured_repair():
+    print("Testing repair of invalid output...")
+    wrapper, completions = _wrapper([
+        '{"interpretation": "Growth"}',
+        '{"interpretation": "Growth", "affirmation": "I am safe"}',
+    ])
+    result = wrapper.generate_structured(DreamInterpretationResponse, "Interpret this dream")
+
+    assert result.affirmation == "I am safe"
+    assert len(completions.requests) == 2
+    assert "affirmation" in completions.requests[1]["messages"][-1]["content"]
+    print("SUCCESS: One repair call fixed the response")
+
+
+if __name__ == "__main__":
+    test_structured_single_pass()
+    test_structured_repair()
@@ -0,0 +1,98 @@
+import contextvars
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.models import ConfigUpdateRequest
+from backend.services import llm_service
+from backend.services.config_store import ConfigStore, DEFAULT_TENANT
+from backend.services.wrapper_pool import WrapperPool
+
+
+def test_config_store_isolates_tenants():
+    print("Testing ConfigStore...")
+    path = Path(tempfile.mkdtemp()) / "backend_config.json"
+    store = ConfigStore(path)
+    before = store.snapshot()
+
+    store.update("acme", ConfigUpdateRequest(model_provider="groq", model_name="openai/gpt-oss-120b"))
+
+    assert store.get("acme").model_provider == "groq"
+    assert store.get(DEFAULT_TENANT).model_provider == "gemini"
+    # Unknown tenants inherit the default model choice, but none of the default tenant's details
+    store.update(DEFAULT_TENANT, ConfigUpdateRequest(mother_name="Asha", father_name="Ravi", pregnancy_week=20,
+                                                     groq_api_key="gsk-default"))
+    stranger = store.get("stranger")
+    assert stranger.model_provider == "gemini" and stranger.model_name == store.get(DEFAULT_TENANT).model_name
+    assert stranger.mother_name is None and stranger.father_name is None and stranger.pregnancy_week is None
+    assert stranger.groq_api_key is None
+    started = store.update("stranger", ConfigUpdateRequest(pregnancy_week=8))
+    assert started.pregnancy_week == 8 and started.mother_name is None and started.groq_api_key is None
+    # Readers holding the old snapshot never see the update
+    assert "acme" not in before
+
+    reloaded = ConfigStore(path, max_tenants=3)
+    assert reloaded.get("acme").model_name == "openai/gpt-oss-120b"
+    # Full: existing tenants can still update, new ones are refused
+    reloaded.update("acme", ConfigUpdateRequest(model_name="llama-3.3-70b-versatile"))
+    try:
+        reloaded.update("newcomer", ConfigUpdateRequest(pregnancy_week=4))
+        assert False, "tenant limit not enforced"
+    except OverflowError:
+        pass
+    assert "newcomer" not in reloaded.snapshot()
+    print("✅ ConfigStore test passed!")
+
+
+def test_tenants_never_borrow_the_default_groq_key():
+    print("Testing Groq key fallback...")
+    previous = llm_service._groq_api_key
+    try:
+        # The default tenant saved its own key, which becomes the process default
+        llm_service.set_groq_api_key("gsk-default-tenant")
+
+        def selection(groq_api_key):
+            llm_service.use_model_config("groq", None, groq_api_key)
+            return llm_service._active_model().groq_api_key
+
+        assert contextvars.copy_context().run(selection, "gsk-own") == "gsk-own"
+        assert contextvars.copy_context().run(selection, None) == llm_service.groq_api_key_from_env
+    finally:
+        llm_service._groq_api_key = previous
+    print("✅ Groq key fallback test passed!")
+
+
+def test_wrapper_pool_keeps_other_tenants_warm():
+    print("Testing WrapperPool...")
+    pool = WrapperPool(max_size=2)
+    built = []
+
+    def factory(name):
+        def build():
+            built.append(name)
+            return object()
+        return build
+
+    a = pool.get_or_create("groq", "m1", "key-a", factory("a"))
+    b = pool.get_or_create("groq", "m1", "key-b", factory("b"))
+    # Switching one tenant's key reuses nothing but evicts nothing either
+    assert pool.get_or_create("groq", "m1", "key-a", factory("a2")) is a
+    assert pool.get_or_create("groq", "m1", "key-b", factory("b2")) is b
+    assert built == ["a", "b"]
+
+    # Over capacity: the least recently used entry goes
+    pool.get_or_create("gemini", "m2", None, factory("c"))
+    assert len(pool.keys()) == 2
+    assert pool.stats()["evictions"] == 1
+    assert all("key-a" not in key for key in pool.keys())
+    print("✅ WrapperPool test passed!")
+
+
+if __name__ == "__main__":
+    test_config_store_isolates_tenants()
+    test_tenants_never_borrow_the_default_groq_key()
+    test_wrapper_pool_keeps_other_tenants_warm()
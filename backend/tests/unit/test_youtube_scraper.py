@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+import sys
+
+# Add project root to path so we can import backend modules (3 levels up: unit -> tests -> backend -> root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from backend.services.youtube_scraper import scan_search_results
+
+
+def _renderer(video_id, title, length=None, live=False, short=False):
+    renderer = {
+        "videoId": video_id,
+        "title": {"runs": [{"text": title}]},
+        "ownerText": {"runs": [{"text": "Calm Channel"}]},
+        "navigationEndpoint": {"commandMetadata": {"webCommandMetadata": {
+            "url": f"/shorts/{video_id}" if short else f"/watch?v={video_id}"
+        }}},
+        # Braces and escaped quotes inside strings must not confuse the scanner
+        "descriptionSnippet": {"simpleText": "Relax {deeply} with \"Om\" \\ chanting"},
+    }
+    if length:
+        renderer["lengthText"] = {"simpleText": length}
+    if live:
+        renderer["badges"] = [{"metadataBadgeRenderer": {"style": "BADGE_STYLE_TYPE_LIVE_NOW"}}]
+    return {"videoRenderer": renderer}
+
+
+PAGE = (
+    "<html><script>var ytInitialData = " + json.dumps({"contents": [
+        _renderer("aaaaaaaaaaa", "Raag Yaman Flute", "1:02:03"),
+        _renderer("bbbbbbbbbbb", "Live Kirtan", live=True),
+        _renderer("ccccccccccc", "Quick Om", "0:45", short=True),
+        _renderer("ddddddddddd", "Gayatri Mantra 108", "12:34"),
+    ]}) + ";</script></html>"
+).encode("utf-8")
+
+
+async def _chunks(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_scan_search_results():
+    print("Testing scan_search_results across chunk sizes...")
+    for size in (1, 7, 64, 4096):
+        results = asyncio.run(scan_search_results(_chunks(PAGE, size), limit=10))
+        assert [r.video_id for r in results] == ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "ddddddddddd"]
+
+        first = results[0]
+        assert first.title == "Raag Yaman Flute"
+        assert first.channel == "Calm Channel"
+        assert first.duration_seconds == 3723
+        assert first.verified
+        assert results[1].is_live
+        assert results[2].is_short
+    print("SUCCESS: Parsed titles, channels, durations and flags")
+
+
+def test_scan_stops_at_limit():
+    print("Testing early termination...")
+    consumed = []
+
+    async def tracking_chunks():
+        async for chunk in _chunks(PAGE, 32):
+            consumed.append(len(chunk))
+            yield chunk
+
+    results = asyncio.run(scan_search_results(tracking_chunks(), limit=1))
+    assert len(results) == 1
+    assert sum(consumed) < len(PAGE)
+    print(f"SUCCESS: Read {sum(consumed)} of {len(PAGE)} bytes")
+
+
+def test_bare_id_fallback():
+    print("Testing fallback to bare video IDs...")
+    page = b'{"videoId":"eeeeeeeeeee"} {"videoId":"fffffffffff"}'
+    results = asyncio.run(scan_search_results(_chunks(page, 5), limit=10))
+    assert [r.video_id for r in results] == ["eeeeeeeeeee", "fffffffffff"]
+    assert not results[0].verified
+    print("SUCCESS: Bare IDs returned without metadata")
+
+
+if __name__ == "__main__":
+    test_scan_search_results()
+    test_scan_stops_at_limit()
+    test_bare_id_fallback()
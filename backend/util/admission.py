@@ -0,0 +1,175 @@
+"""
+Admission control
+
+Bounds how much expensive work runs at once, so a burst is served at a
+reduced rate instead of every request piling up until they all time out.
+
+Each route class (e.g. "expensive" LLM generations vs. "cheap" lookups) has
+an AdmissionLimiter: `limit` requests run concurrently, up to `queue` more
+wait in FIFO order for at most `wait` seconds, and anything beyond that is
+turned away immediately with 503 and a Retry-After estimated from recent
+service times. A request keeps its slot until its response (including a
+streamed one) has been sent. Routes map to classes by path prefix, first
+match wins; a class of None leaves the route unlimited.
+
+AdmissionMiddleware also rejects request bodies over `max_body_bytes` with
+413, from Content-Length up front or, for chunked bodies, as soon as the
+route reads past the limit.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+# Weight of the latest request in the moving average of service time
+EWMA_ALPHA = 0.2
+MAX_RETRY_AFTER_SECONDS = 60
+
+
+class AdmissionLimiter:
+    def __init__(self, name: str, limit: int, queue: int = 0, wait: float = 5.0):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.wait = wait
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_seconds: Optional[float] = None
+        self.counters = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0}
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in line if there's room in the queue; False if turned away."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.counters["admitted"] += 1
+            return True
+        if len(self._waiters) >= self.queue or self.wait <= 0:
+            self.counters["rejected"] += 1
+            return False
+
+        # release() hands its slot straight to the first waiter, so `active` stays put
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait({waiter}, timeout=self.wait)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._abandon(waiter)
+            raise
+        if waiter.done():
+            self.counters["admitted"] += 1
+            return True
+        self._abandon(waiter)
+        self.counters["timed_out"] += 1
+        return False
+
+    def _abandon(self, waiter: asyncio.Future):
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, held_seconds: Optional[float] = None):
+        if held_seconds is not None:
+            previous = self._service_seconds
+            self._service_seconds = held_seconds if previous is None else (
+                EWMA_ALPHA * held_seconds + (1 - EWMA_ALPHA) * previous)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free: the queue ahead drained at the recent service rate."""
+        if not self._service_seconds:
+            return 1
+        estimate = self._service_seconds * (self.waiting + 1) / max(self.limit, 1)
+        return max(1, min(MAX_RETRY_AFTER_SECONDS, math.ceil(estimate)))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            **self.counters,
+            "active": self.active,
+            "waiting": self.waiting,
+            "limit": self.limit,
+            "queue": self.queue,
+            "avg_service_seconds": round(self._service_seconds, 3) if self._service_seconds else None,
+        }
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, limiters: Dict[str, AdmissionLimiter], routes: List[Tuple[str, str]] = (),
+                 default_class: Optional[str] = None, max_body_bytes: int = 64 * 1024):
+        self.app = app
+        self.limiters = limiters
+        self.routes = list(routes)
+        self.default_class = default_class
+        self.max_body_bytes = max_body_bytes
+
+    def limiter(self, path: str) -> Optional[AdmissionLimiter]:
+        for prefix, route_class in self.routes:
+            if path.startswith(prefix):
+                return self.limiters.get(route_class) if route_class else None
+        return self.limiters.get(self.default_class) if self.default_class else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            await self._too_large(scope, receive, send)
+            return
+
+        limiter = self.limiter(scope["path"])
+        if limiter is not None and not await limiter.acquire():
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(limiter.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # Raised inside the route's body read, so the app's exception handling answers 413
+                    raise HTTPException(status_code=413, detail=self._too_large_detail())
+            return message
+
+        start = time.monotonic()
+        try:
+            await self.app(scope, limited_receive, send)
+        finally:
+            if limiter is not None:
+                limiter.release(time.monotonic() - start)
+
+    def _too_large_detail(self) -> str:
+        return f"Request body exceeds {self.max_body_bytes} bytes"
+
+    async def _too_large(self, scope, receive, send):
+        response = JSONResponse({"detail": self._too_large_detail()}, status_code=413)
+        await response(scope, receive, send)
@@ -0,0 +1,111 @@
+"""
+Micro-batching
+
+Coalesces calls that arrive within a short window into one batched call:
+
+    batcher = MicroBatcher("names", run_batch=generate_many, run_single=generate_one, window=0.03)
+    names = await batcher.submit(("Girl", "A", "Nature"), group=model_selection)
+
+The first call for a `group` opens a window of `window` seconds (closed early
+once `max_batch` distinct keys are waiting). The batch is then handed to
+`run_batch(keys) -> {key: result}`; identical keys share one result. Keys the
+batch call doesn't answer (or all of them, if it raises) fall back to
+`run_single(key)`, concurrently. A window holding a single key goes straight
+to `run_single`.
+
+Calls in different groups are never batched together; the batch runs in the
+context of the call that opened its window, so group by anything that
+context carries (e.g. the tenant's model selection). Windows are per event
+loop, since futures can't be shared across loops.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Set, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+Slot = Tuple[int, Hashable]
+
+
+class MicroBatcher(Generic[K, V]):
+    def __init__(self, name: str, run_batch: Callable[[List[K]], Awaitable[Dict[K, V]]],
+                 run_single: Callable[[K], Awaitable[V]], window: float = 0.03, max_batch: int = 8):
+        self.name = name
+        self.run_batch = run_batch
+        self.run_single = run_single
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Slot, Dict[K, asyncio.Future]] = {}
+        self._timers: Dict[Slot, asyncio.TimerHandle] = {}
+        # The loop only keeps weak references to tasks: a collected batch would leave its callers waiting forever
+        self._running: Set[asyncio.Task] = set()
+        self.counters = {"calls": 0, "shared": 0, "batches": 0, "batched_keys": 0, "singles": 0, "fallbacks": 0}
+
+    async def submit(self, key: K, group: Hashable = None) -> V:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), group)
+        pending = self._pending.setdefault(slot, {})
+        self.counters["calls"] += 1
+
+        future = pending.get(key)
+        if future is not None:
+            self.counters["shared"] += 1
+        else:
+            future = loop.create_future()
+            pending[key] = future
+            if len(pending) >= self.max_batch:
+                self._flush(slot)
+            elif len(pending) == 1:
+                self._timers[slot] = loop.call_later(self.window, self._flush, slot)
+
+        # A caller that goes away must not cancel the result other callers share
+        return await asyncio.shield(future)
+
+    def _flush(self, slot: Slot):
+        timer = self._timers.pop(slot, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(slot, None)
+        if pending:
+            task = asyncio.get_running_loop().create_task(self._run(pending))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, pending: Dict[K, asyncio.Future]):
+        keys = list(pending)
+        results: Dict[K, Any] = {}
+        if len(keys) > 1:
+            self.counters["batches"] += 1
+            self.counters["batched_keys"] += len(keys)
+            try:
+                results = await self.run_batch(keys)
+            except Exception as e:
+                print(f"[Batch] {self.name} batch of {len(keys)} failed ({e}); falling back to single calls")
+                results = {}
+
+        missing = [key for key in keys if key not in results]
+        if len(keys) == 1:
+            self.counters["singles"] += 1
+        else:
+            self.counters["fallbacks"] += len(missing)
+        singles = await asyncio.gather(*(self.run_single(key) for key in missing), return_exceptions=True)
+        outcomes = {**results, **dict(zip(missing, singles))}
+
+        for key, future in pending.items():
+            if future.done():
+                continue
+            outcome = outcomes.get(key)
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.counters["calls"]
+        provider_calls = self.counters["batches"] + self.counters["singles"] + self.counters["fallbacks"]
+        return {
+            **self.counters,
+            "provider_calls": provider_calls,
+            "calls_per_provider_call": round(calls / provider_calls, 2) if provider_calls else 0.0,
+        }
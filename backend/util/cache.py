@@ -0,0 +1,708 @@
+"""
+Shared cache
+
+One cache abstraction with three interchangeable backends, so several uvicorn
+workers can share warm state instead of each keeping a cold private copy:
+
+    memory  - per-process dict (default; tests and single-worker dev)
+    sqlite  - a SQLite file on a volume every worker can reach
+    redis   - anything speaking the Redis protocol (Redis, Valkey, KeyDB, ...)
+
+Selected with environment variables:
+
+    GARBHVEDA_CACHE_BACKEND=memory|sqlite|redis
+    GARBHVEDA_CACHE_PATH=backend/data/cache.sqlite3
+    GARBHVEDA_REDIS_URL=redis://[:password@]host:6379/0
+
+Backends store bytes with a TTL. `TypedCache` sits on top and stores Pydantic
+models (or anything a TypeAdapter understands) as compact JSON, zlib-compressed
+when that pays off. `get_or_set` is atomic across workers: the first caller
+takes a short lock and computes the value while the others wait for it.
+
+The memory backend survives restarts through a warm-restart snapshot (see
+util/snapshot.py): `save_snapshot` on shutdown, `restore_snapshot` on startup.
+"""
+
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
+from urllib.parse import unquote, urlparse
+
+from .env import load_env
+from .snapshot import Snapshot, SnapshotEntry, open_snapshot, write_snapshot
+
+T = TypeVar("T")
+
+DEFAULT_SQLITE_PATH = Path(__file__).resolve().parent.parent / "data" / "cache.sqlite3"
+
+# How long a get_or_set lock is held before another worker may take over
+LOCK_TTL_SECONDS = 60.0
+LOCK_POLL_SECONDS = 0.05
+
+# Payload header byte: raw JSON or zlib-compressed JSON
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+COMPRESS_MIN_BYTES = 512
+
+
+class CacheBackend(ABC):
+    """Byte-level key/value store with per-key TTL and an advisory lock."""
+
+    name = "base"
+    # Whether calls can block on I/O (disk, network); async callers run those in a thread
+    blocking = True
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Try to take the lock for `key`; return a token on success, None if it is held."""
+
+    @abstractmethod
+    def release_lock(self, key: str, token: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._locks: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        # Entries from the previous process, restored on first access
+        self._snapshot: Optional[Snapshot] = None
+
+    def attach_snapshot(self, snapshot: Optional[Snapshot]):
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.close()
+            self._snapshot = snapshot
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                restored = self._snapshot.pop(key) if self._snapshot is not None else None
+                if restored is None:
+                    return None
+                ttl, value = restored
+                self._store(key, value, ttl)
+                return value
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: bytes, ttl: float):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.discard(key)
+            self._store(key, value, ttl)
+
+    def delete(self, key: str):
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.discard(key)
+            self._data.pop(key, None)
+
+    def export(self, prefixes: Tuple[str, ...]) -> List[SnapshotEntry]:
+        """Live entries under `prefixes` (plus ones never restored from the last snapshot), expiring on the wall clock."""
+        with self._lock:
+            now_wall, now = time.time(), time.monotonic()
+            entries = [(key, now_wall + expires_at - now, value)
+                       for key, (expires_at, value) in self._data.items()
+                       if expires_at > now and key.startswith(prefixes)]
+            if self._snapshot is not None:
+                live = set(self._data)
+                entries += [entry for entry in self._snapshot.entries()
+                            if entry[0] not in live and entry[0].startswith(prefixes)]
+        return entries
+
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            held = self._locks.get(key)
+            if held and held[0] > now:
+                return None
+            token = uuid.uuid4().hex
+            self._locks[key] = (now + ttl, token)
+            return token
+
+    def release_lock(self, key: str, token: str):
+        with self._lock:
+            held = self._locks.get(key)
+            if held and held[1] == token:
+                del self._locks[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._locks.clear()
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Cache in a SQLite file. WAL mode lets every worker on the host (or on a
+    shared volume) read concurrently; writes are short single-row statements.
+    """
+
+    name = "sqlite"
+    PURGE_EVERY = 500
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_SQLITE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_locks (key TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), now + ttl),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM cache_locks WHERE key = ? AND expires_at <= ?", (key, now))
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO cache_locks (key, token, expires_at) VALUES (?, ?, ?)",
+                    (key, token, now + ttl),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return token if cursor.rowcount == 1 else None
+
+    def release_lock(self, key: str, token: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_locks WHERE key = ? AND token = ?", (key, token))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.execute("DELETE FROM cache_locks")
+
+
+class RedisError(Exception):
+    pass
+
+
+RELEASE_LOCK_SCRIPT = 'if redis.call("GET", KEYS[1]) == ARGV[1] then return redis.call("DEL", KEYS[1]) end return 0'
+
+
+class RedisBackend(CacheBackend):
+    """
+    Minimal Redis-protocol (RESP2) client: GET, SET with PX/NX, DEL, and EVAL
+    for releasing locks.
+    One socket per process guarded by a lock; reconnects once on failure.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "garbhveda:", timeout: float = 2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connect()
+
+    def _connect(self):
+        self._close()
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._roundtrip("AUTH", self.password)
+        if self.db:
+            self._roundtrip("SELECT", str(self.db))
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def _roundtrip(self, *args):
+        self._sock.sendall(self._encode(args))
+        return self._read_reply()
+
+    def command(self, *args):
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                return self._roundtrip(*args)
+            except (ConnectionError, OSError):
+                # Stale connection (server restart, idle timeout): retry once
+                self._connect()
+                return self._roundtrip(*args)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.command("GET", self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.command("SET", self.prefix + key, value, "PX", max(1, int(ttl * 1000)))
+
+    def delete(self, key: str):
+        self.command("DEL", self.prefix + key)
+
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        reply = self.command("SET", self.prefix + "lock:" + key, token, "NX", "PX", max(1, int(ttl * 1000)))
+        return token if reply == "OK" else None
+
+    def release_lock(self, key: str, token: str):
+        # Compare-and-delete in one step: the lock may have expired and been taken by another worker
+        self.command("EVAL", RELEASE_LOCK_SCRIPT, 1, self.prefix + "lock:" + key, token)
+
+    def clear(self):
+        # Only our own keys; never FLUSHDB a shared server
+        cursor = "0"
+        while True:
+            cursor, keys = self.command("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500)
+            if keys:
+                self.command("DEL", *keys)
+            cursor = cursor.decode("utf-8") if isinstance(cursor, bytes) else str(cursor)
+            if cursor == "0":
+                break
+
+
+def encode_payload(data: bytes) -> bytes:
+    if len(data) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return _ZLIB + compressed
+    return _RAW + data
+
+
+def decode_payload(payload: bytes) -> bytes:
+    header, body = payload[:1], payload[1:]
+    if header == _ZLIB:
+        return zlib.decompress(body)
+    return body
+
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def build_backend(kind: Optional[str] = None) -> CacheBackend:
+    load_env()
+    kind = (kind or os.getenv("GARBHVEDA_CACHE_BACKEND", "memory")).lower()
+    try:
+        if kind == "sqlite":
+            return SQLiteBackend(os.getenv("GARBHVEDA_CACHE_PATH") or DEFAULT_SQLITE_PATH)
+        if kind == "redis":
+            return RedisBackend(os.getenv("GARBHVEDA_REDIS_URL", "redis://localhost:6379/0"))
+    except Exception as e:
+        # A missing volume or unreachable Redis shouldn't stop the app serving
+        print(f"[Cache] Could not open {kind} cache ({e}); using in-memory cache")
+        return MemoryBackend()
+    if kind != "memory":
+        print(f"[Cache] Unknown cache backend '{kind}'; using in-memory cache")
+    return MemoryBackend()
+
+
+def get_backend() -> CacheBackend:
+    """Return the process-wide cache backend, opening it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = build_backend()
+                print(f"[Cache] Using {_backend.name} cache backend")
+    return _backend
+
+
+def set_backend(backend: CacheBackend):
+    """Swap the process-wide backend (tests, benchmarks)."""
+    global _backend
+    _backend = backend
+
+
+_namespaces: Dict[str, "TypedCache"] = {}
+
+
+class TypedCache(Generic[T]):
+    """
+    A namespace of the shared cache holding values of one type.
+
+        curriculum_cache = TypedCache("curriculum", DailyCurriculum, ttl=6 * 3600)
+        value = await curriculum_cache.aget_or_set(key, build)
+
+    Values are validated on the way out, so a stale entry written by an older
+    model version is treated as a miss rather than returned half-parsed.
+    `ttl` may be a number or a function of the value (e.g. to keep negative
+    results for less time). A factory returning None is not cached.
+    `persist=False` leaves the namespace out of warm-restart snapshots.
+    """
+
+    def __init__(self, namespace: str, value_type: Type[T], ttl: Union[float, Callable[[T], float]],
+                 backend: Optional[CacheBackend] = None, persist: bool = True):
+        from pydantic import TypeAdapter
+
+        self.namespace = namespace
+        self.adapter = TypeAdapter(value_type)
+        self.ttl = ttl
+        self.persist = persist
+        self._backend = backend
+        # Keyed per event loop: a task can't be awaited from another thread's loop
+        self._inflight: Dict[Tuple[int, str], "asyncio.Task"] = {}
+        self._inflight_waiters: Dict[Tuple[int, str], int] = {}
+        self._thread_locks: Dict[str, threading.Lock] = {}
+        self._thread_locks_guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        _namespaces[namespace] = self
+
+    @property
+    def backend(self) -> CacheBackend:
+        return self._backend or get_backend()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _ttl_for(self, value: T) -> float:
+        return self.ttl(value) if callable(self.ttl) else self.ttl
+
+    def _dump(self, value: T) -> bytes:
+        # exclude_defaults keeps entries small; defaults are restored on load
+        return encode_payload(self.adapter.dump_json(value, exclude_defaults=True))
+
+    def _load(self, payload: bytes) -> Optional[T]:
+        try:
+            return self.adapter.validate_json(decode_payload(payload))
+        except Exception as e:
+            print(f"[Cache] Dropping unreadable {self.namespace} entry: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[T]:
+        try:
+            payload = self.backend.get(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] {self.namespace} get failed: {e}")
+            return None
+        value = self._load(payload) if payload is not None else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: T):
+        try:
+            self.backend.set(self._key(key), self._dump(value), self._ttl_for(value))
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] {self.namespace} set failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            self.backend.delete(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] {self.namespace} delete failed: {e}")
+
+    def _try_lock(self, key: str) -> Optional[str]:
+        try:
+            return self.backend.acquire_lock(self._key(key), LOCK_TTL_SECONDS)
+        except Exception as e:
+            # If the lock can't be taken at all, compute without it
+            self.errors += 1
+            print(f"[Cache] {self.namespace} lock failed: {e}")
+            return ""
+
+    def _unlock(self, key: str, token: str):
+        if not token:
+            return
+        try:
+            self.backend.release_lock(self._key(key), token)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] {self.namespace} unlock failed: {e}")
+
+    async def _off_loop(self, operation: Callable[..., Any], *args) -> Any:
+        """Run a cache operation from async code, in a thread if the backend can block."""
+        if self.backend.blocking:
+            return await asyncio.to_thread(operation, *args)
+        return operation(*args)
+
+    async def aget(self, key: str) -> Optional[T]:
+        return await self._off_loop(self.get, key)
+
+    async def aset(self, key: str, value: T):
+        await self._off_loop(self.set, key, value)
+
+    def get_or_set(self, key: str, factory: Callable[[], Optional[T]]) -> Optional[T]:
+        """
+        Synchronous get-or-set for blocking callers (runs `factory` at most once
+        per key across workers). It can sleep for a while waiting on another
+        worker's lock, so never call it on the event loop; use aget_or_set there.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._thread_locks_guard:
+            thread_lock = self._thread_locks.setdefault(key, threading.Lock())
+        with thread_lock:
+            deadline = time.monotonic() + LOCK_TTL_SECONDS
+            waited = False
+            while True:
+                token = self._try_lock(key)
+                if token is not None or time.monotonic() >= deadline:
+                    break
+                waited = True
+                time.sleep(LOCK_POLL_SECONDS)
+                value = self.get(key)
+                if value is not None:
+                    return value
+            if waited:
+                # Another worker held the lock; it has probably stored the value by now
+                value = self.get(key)
+                if value is not None:
+                    self._unlock(key, token)
+                    return value
+            try:
+                value = factory()
+                if value is not None:
+                    self.set(key, value)
+                return value
+            finally:
+                self._unlock(key, token)
+                with self._thread_locks_guard:
+                    self._thread_locks.pop(key, None)
+
+    async def aget_or_set(self, key: str, factory: Callable[[], Awaitable[Optional[T]]]) -> Optional[T]:
+        """
+        Async get-or-set. Concurrent callers in this process share one
+        in-flight computation; callers in other workers wait on the backend
+        lock and then read the stored value.
+
+        The computation runs in its own task (in the first caller's context),
+        so a caller that is cancelled (a shed prefetch, a dropped client) only
+        stops it if nobody else is waiting on the result. Backend calls run in
+        a thread unless the backend never blocks (memory).
+        """
+        value = await self.aget(key)
+        if value is not None:
+            return value
+
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = loop.create_task(self._compute(key, factory, inflight_key))
+            self._inflight[inflight_key] = task
+        self._inflight_waiters[inflight_key] = self._inflight_waiters.get(inflight_key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._inflight_waiters[inflight_key] == 1:
+                # Last one waiting: stop the work, and let the next caller start afresh
+                task.cancel()
+                if self._inflight.get(inflight_key) is task:
+                    del self._inflight[inflight_key]
+            raise
+        finally:
+            waiters = self._inflight_waiters.pop(inflight_key) - 1
+            if waiters:
+                self._inflight_waiters[inflight_key] = waiters
+
+    async def _compute(self, key: str, factory: Callable[[], Awaitable[Optional[T]]],
+                       inflight_key: Tuple[int, str]) -> Optional[T]:
+        token = None
+        value = None
+        try:
+            deadline = time.monotonic() + LOCK_TTL_SECONDS
+            waited = False
+            while True:
+                token = await self._off_loop(self._try_lock, key)
+                if token is not None:
+                    break
+                waited = True
+                await asyncio.sleep(LOCK_POLL_SECONDS)
+                value = await self.aget(key)
+                if value is not None or time.monotonic() >= deadline:
+                    break
+
+            if value is None and token is not None and waited:
+                # The other worker released its lock; it has probably stored the value
+                value = await self.aget(key)
+            if value is None:
+                value = await factory()
+                if value is not None:
+                    await self.aset(key, value)
+            return value
+        finally:
+            if self._inflight.get(inflight_key) is asyncio.current_task():
+                del self._inflight[inflight_key]
+            if token:
+                await self._off_loop(self._unlock, key, token)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Backend name plus hit/miss counters for every cache namespace in this process."""
+    backend = get_backend()
+    stats = {
+        "backend": backend.name,
+        "namespaces": {name: cache.stats() for name, cache in _namespaces.items()},
+    }
+    if isinstance(backend, MemoryBackend) and backend.snapshot is not None:
+        stats["snapshot"] = backend.snapshot.stats()
+    return stats
+
+
+def inflight_computations() -> List["asyncio.Task"]:
+    """Tasks of the aget_or_set computations still running on this event loop."""
+    loop_id = id(asyncio.get_running_loop())
+    return [task for cache in _namespaces.values() for (owner, _), task in list(cache._inflight.items())
+            if owner == loop_id and not task.done()]
+
+
+def save_snapshot(path: Union[str, Path], meta: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    """Write the memory backend's persisted namespaces to `path`; the entry count, or None for other backends."""
+    backend = get_backend()
+    if not isinstance(backend, MemoryBackend):
+        return None
+    prefixes = tuple(f"{name}:" for name, cache in _namespaces.items() if cache.persist and cache._backend is None)
+    count = write_snapshot(path, backend.export(prefixes), meta)
+    print(f"[Cache] Snapshot of {count} entries written to {path}")
+    return count
+
+
+def restore_snapshot(path: Union[str, Path]) -> Optional[Snapshot]:
+    """Attach the snapshot at `path` to the memory backend; its entries come back on first access."""
+    backend = get_backend()
+    if not isinstance(backend, MemoryBackend):
+        return None
+    snapshot = open_snapshot(path)
+    if snapshot is not None:
+        backend.attach_snapshot(snapshot)
+        print(f"[Cache] Warm snapshot with {len(snapshot)} live entries mapped from {path}")
+    return snapshot
@@ -0,0 +1,90 @@
+"""
+Request deadlines
+
+A per-request time budget carried in a context variable, so every stage of a
+pipeline (LLM calls, grounded searches, URL validation, repair loops, ReAct
+fallbacks) can see how much time is left without threading it through every
+signature. Routes set it once:
+
+    with deadline(25):
+        curriculum = await generate_daily_curriculum(week, mood)
+
+and stages use it to cap their own timeouts and to skip optional work:
+
+    response = await client.get(url, timeout=deadline_timeout(5.0))
+    if not has_budget(REPAIR_SECONDS):
+        ...  # return what we have
+
+Outside any deadline everything behaves as before: `remaining()` is None,
+`has_budget()` is True and `deadline_timeout(x)` is x.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+# Never hand out a timeout so small that the call can't possibly succeed
+MIN_TIMEOUT_SECONDS = 0.5
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def deadline(seconds: float, inherit: bool = True):
+    """
+    Run the block with `seconds` of budget. Nested deadlines can only shorten
+    the enclosing one, unless `inherit=False` (e.g. a background job that
+    outlives the request that queued it).
+    """
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if inherit and current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield expires_at
+    finally:
+        _deadline.reset(token)
+
+
+def set_deadline(seconds: Optional[float]):
+    """Set (or clear, with None) the deadline for the rest of the current context."""
+    _deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left, or None when no deadline is set."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def has_budget(seconds: float) -> bool:
+    """Whether a stage expected to take `seconds` still fits."""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def deadline_timeout(default: float) -> float:
+    """`default`, shortened to the time left (but not below MIN_TIMEOUT_SECONDS)."""
+    left = remaining()
+    if left is None:
+        return default
+    return max(MIN_TIMEOUT_SECONDS, min(default, left))
+
+
+def check(stage: str):
+    """Raise DeadlineExceeded if the budget is spent (for stages with nothing useful to return early)."""
+    if expired():
+        raise DeadlineExceeded(f"Deadline exceeded before {stage}")
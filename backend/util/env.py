@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+
+# backend/util/env.py -> backend/util -> backend -> root
+ENV_LOCAL_PATH = Path(__file__).resolve().parent.parent.parent / ".env.local"
+
+_loaded = False
+
+def load_env():
+    """
+    Load environment variables once per process.
+
+    Reads `.env` from the working directory, then `.env.local` from the project
+    root. Neither overrides variables that are already set. Safe to call from
+    every module that needs configuration; only the first call does any work.
+    """
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    if ENV_LOCAL_PATH.exists():
+        load_dotenv(dotenv_path=ENV_LOCAL_PATH)
+    elif not os.getenv("VITE_GEMINI_API_KEY"):
+        print(f"[Env] No .env.local found at: {ENV_LOCAL_PATH}")
@@ -0,0 +1,57 @@
+"""
+Fast JSON
+
+One JSON module for the backend: orjson when installed, the stdlib
+otherwise, with the same compact output either way.
+
+    fastjson.dumps(obj)       -> bytes
+    fastjson.dumps_str(obj)   -> str (log lines, SSE/NDJSON frames)
+    fastjson.loads(data)      -> accepts bytes or str, no decode step needed
+
+Pydantic models are serialized by pydantic-core directly to bytes (see
+util.responses.ORJSONResponse for routes returning a model). Parse errors are always
+JSONDecodeError (orjson's subclasses the stdlib one), so existing
+`except json.JSONDecodeError` handlers keep working.
+"""
+
+import json
+from typing import Any, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+JSONDecodeError = orjson.JSONDecodeError if HAS_ORJSON else json.JSONDecodeError
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    if isinstance(obj, BaseModel):
+        return obj.__pydantic_serializer__.to_json(obj, indent=2 if indent else None)
+    if HAS_ORJSON:
+        option = orjson.OPT_INDENT_2 if indent else None
+        return orjson.dumps(obj, default=_default, option=option)
+    if indent:
+        return json.dumps(obj, default=_default, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    return dumps(obj, indent).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
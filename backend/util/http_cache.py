@@ -0,0 +1,169 @@
+"""
+HTTP response optimization
+
+ASGI middleware that, for buffered (non-streaming) responses:
+
+- sets a Cache-Control policy per route prefix (unless the route set one)
+- adds a strong ETag computed from the body (unless the route set one, e.g.
+  from its cache entry version) and answers GET requests whose
+  If-None-Match matches with 304 and no body
+- compresses bodies above `minimum_size` with brotli or gzip, per
+  Accept-Encoding; compressed variants get their own ETag suffix, as strong
+  validators must differ per representation
+
+Streaming responses (NDJSON/SSE, anything sent in several body messages)
+are passed through untouched so events aren't held back.
+"""
+
+import gzip
+import hashlib
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml", "application/x-ndjson")
+# Bodies larger than this are compressed off the event loop
+THREAD_THRESHOLD = 256 * 1024
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def body_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires; encoding suffixes are ignored."""
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(","))
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class HTTPOptimizationMiddleware:
+    def __init__(self, app, policies: List[Tuple[str, str]] = (), default_policy: str = "no-cache",
+                 minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.policies = list(policies)
+        self.default_policy = default_policy
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def policy(self, path: str) -> str:
+        for prefix, policy in self.policies:
+            if path.startswith(prefix):
+                return policy
+        return self.default_policy
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        start = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def buffered_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            if not chunks and message.get("more_body", False):
+                # Streaming: forward as it comes
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await self._respond(scope, request_headers, start, b"".join(chunks), send)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def _respond(self, scope, request_headers: Headers, start, body: bytes, send):
+        status = start["status"]
+        headers = MutableHeaders(raw=list(start["headers"]))
+        method = scope["method"]
+
+        etag = None
+        if method in ("GET", "HEAD") and status == 200:
+            if "cache-control" not in headers:
+                headers["cache-control"] = self.policy(scope["path"])
+            etag = headers.get("etag") or body_etag(body)
+            headers["etag"] = etag
+            if_none_match = request_headers.get("if-none-match")
+            if if_none_match and etag_matches(if_none_match, etag):
+                not_modified = MutableHeaders()
+                for name in ("etag", "cache-control", "vary"):
+                    if name in headers:
+                        not_modified[name] = headers[name]
+                await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        content_type = headers.get("content-type", "")
+        if (len(body) >= self.minimum_size and "content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)):
+            headers.add_vary_header("Accept-Encoding")
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+            if encoding:
+                if len(body) > THREAD_THRESHOLD:
+                    import anyio
+
+                    compressed = await anyio.to_thread.run_sync(self.compress, body, encoding)
+                else:
+                    compressed = self.compress(body, encoding)
+                if len(compressed) < len(body):
+                    body = compressed
+                    headers["content-encoding"] = encoding
+                    if etag:
+                        headers["etag"] = f'{etag[:-1]}-{encoding}"'
+
+        headers["content-length"] = str(len(body))
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body if method != "HEAD" else b""})
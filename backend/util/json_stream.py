@@ -0,0 +1,155 @@
+from . import fastjson
+from typing import Any, List, Optional, Tuple
+
+# (path, value) where path is ("field",) for a top-level field of the root
+# object, or ("field", index) for an element of a top-level array field.
+JSONEvent = Tuple[tuple, Any]
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Feed it text chunks as they arrive from the model; it returns each
+    top-level field as soon as its value closes, and each element of a
+    top-level array field as soon as that element closes. Anything before
+    the root "{" (e.g. a markdown fence) is ignored.
+
+        parser = IncrementalJSONParser()
+        for chunk in chunks:
+            for path, value in parser.feed(chunk):
+                ...
+        data = parser.result()
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._index = 0
+        # Open value per nesting level we report on: level -> (start offset, kind)
+        self._open = {}
+
+    @property
+    def done(self) -> bool:
+        return self._root_end is not None
+
+    def feed(self, chunk: str) -> List[JSONEvent]:
+        self._text += chunk
+        events: List[JSONEvent] = []
+        text = self._text
+        i = self._pos
+
+        while i < len(text) and self._root_end is None:
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._close_string(i, events)
+                i += 1
+                continue
+
+            if self._root_start is None:
+                if c == "{":
+                    self._root_start = i
+                    self._stack.append("{")
+                    self._expect_key = True
+                i += 1
+                continue
+
+            depth = len(self._stack)
+            if c in _WHITESPACE:
+                pass
+            elif c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = depth == 1 and self._expect_key
+                if not self._string_is_key:
+                    self._begin(depth, i, "string")
+            elif c in "{[":
+                self._begin(depth, i, "container")
+                self._stack.append(c)
+                if depth == 1 and c == "[":
+                    self._index = 0
+            elif c in "}]":
+                self._finish_scalar(depth, i, events)
+                self._stack.pop()
+                if not self._stack:
+                    self._root_end = i + 1
+                else:
+                    level = len(self._stack)
+                    opened = self._open.get(level)
+                    if opened and opened[1] == "container":
+                        self._finish(level, i + 1, events)
+            elif c == ",":
+                self._finish_scalar(depth, i, events)
+                if depth == 1:
+                    self._expect_key = True
+            elif c == ":":
+                if depth == 1:
+                    self._expect_key = False
+            else:
+                self._begin(depth, i, "scalar")
+            i += 1
+
+        self._pos = i
+        return events
+
+    def result(self) -> Any:
+        """Parse the complete object (raises ValueError if it never closed)."""
+        if self._root_start is None or self._root_end is None:
+            raise ValueError("Incomplete JSON object")
+        return fastjson.loads(self._text[self._root_start:self._root_end])
+
+    def _reports(self, level: int) -> bool:
+        # Root field values, and elements of root-level array fields
+        if level == 1:
+            return not self._expect_key
+        return level == 2 and self._stack[1] == "["
+
+    def _begin(self, level: int, start: int, kind: str):
+        if self._reports(level) and level not in self._open:
+            self._open[level] = (start, kind)
+
+    def _close_string(self, end: int, events: List[JSONEvent]):
+        level = len(self._stack)
+        if self._string_is_key:
+            self._key = fastjson.loads(self._text[self._string_start:end + 1])
+            return
+        opened = self._open.get(level)
+        if opened and opened[1] == "string" and opened[0] == self._string_start:
+            self._finish(level, end + 1, events)
+
+    def _finish_scalar(self, level: int, end: int, events: List[JSONEvent]):
+        opened = self._open.get(level)
+        if opened and opened[1] == "scalar":
+            self._finish(level, end, events)
+
+    def _finish(self, level: int, end: int, events: List[JSONEvent]):
+        start, _ = self._open.pop(level)
+        try:
+            value = fastjson.loads(self._text[start:end].strip())
+        except ValueError:
+            return
+        if level == 1:
+            # Array fields were already reported element by element
+            if not isinstance(value, list):
+                events.append(((self._key,), value))
+        else:
+            events.append(((self._key, self._index), value))
+            self._index += 1
@@ -1,9 +1,10 @@
 import logging
-import json
 import datetime
 import os
 import sys
 
+from . import fastjson
+
 class JSONFormatter(logging.Formatter):
     def format(self, record):
         log_obj = {
@@ -19,7 +20,7 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_obj["exception"] = self.formatException(record.exc_info)
             
-        return json.dumps(log_obj)
+        return fastjson.dumps_str(log_obj)
 
 def setup_logger(name: str = "app", log_file: str = "app.log", level: int = logging.INFO):
     """
@@ -0,0 +1,184 @@
+"""
+Event loop stall watchdog
+
+Finds synchronous work that blocks the event loop (a provider SDK call, a
+`requests.get`, a big regex scan) in production:
+
+- a heartbeat task on the loop sleeps `interval` seconds at a time and
+  records how late it wakes up (the loop lag)
+- a side thread checks that heartbeat; once it is more than `threshold`
+  seconds overdue, the thread grabs the loop thread's current stack, so the
+  blocking call is caught while it is still running
+- when the heartbeat runs again, the stall's full duration is recorded in a
+  histogram and credited to the call site that was caught
+
+A call site is the innermost frame in backend code (what to fix), reported
+with the innermost frame overall (what it was blocked in, e.g. ssl.read)
+and one sample stack. stats() has the stall count, the duration histogram,
+recent lag percentiles and the top offending sites.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Upper bounds (seconds) of the stall duration histogram buckets
+STALL_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+LAG_SAMPLES = 1200
+MAX_SITES = 50
+
+
+def _frame_label(frame: traceback.FrameSummary) -> str:
+    filename = frame.filename
+    if filename.startswith(BACKEND_DIR):
+        filename = "backend" + filename[len(BACKEND_DIR):]
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{frame.lineno} in {frame.name}"
+
+
+class LoopWatchdog:
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        # The heartbeat whose overdue stall has been captured, and where
+        self._captured_beat: Optional[float] = None
+        self._captured_site: Optional[str] = None
+        self._lags: Deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._sites: Dict[str, Dict[str, Any]] = {}
+        self.stalls = 0
+        self.stall_seconds = 0.0
+        self.max_stall = 0.0
+        self.histogram = [0] * len(STALL_BUCKETS)
+
+    def start(self):
+        """Start the heartbeat on the running loop and the watching thread (called from the app lifespan)."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        print(f"[Watchdog] Watching the event loop for stalls over {self.threshold * 1000:.0f} ms")
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - before - self.interval)
+            self._lags.append(lag)
+            if lag > self.threshold:
+                self._record_stall(lag, self._beat)
+            self._beat = now
+
+    def _record_stall(self, duration: float, beat: float):
+        with self._lock:
+            self.stalls += 1
+            self.stall_seconds += duration
+            self.max_stall = max(self.max_stall, duration)
+            for i, bound in enumerate(STALL_BUCKETS):
+                if duration <= bound:
+                    self.histogram[i] += 1
+                    break
+            site = self._sites.get(self._captured_site) if self._captured_beat == beat else None
+            if site is not None:
+                site["seconds"] += duration
+                site["max_seconds"] = max(site["max_seconds"], duration)
+        if site is not None:
+            where = self._captured_site
+            if site["blocked_in"] != where:
+                where += f" (in {site['blocked_in']})"
+            print(f"[Watchdog] Event loop blocked for {duration * 1000:.0f} ms at {where}")
+
+    def _watch(self):
+        check_every = max(self.threshold / 4, 0.005)
+        while not self._stopping.wait(check_every):
+            beat = self._beat
+            if self._captured_beat == beat:
+                continue
+            if time.monotonic() - beat > self.interval + self.threshold:
+                self._capture(beat)
+
+    def _capture(self, beat: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        if beat != self._beat:
+            return  # the loop woke up while we were looking
+        ours = [f for f in stack if f.filename.startswith(BACKEND_DIR) and f.filename != __file__]
+        site_label = _frame_label(ours[-1]) if ours else _frame_label(stack[-1])
+        with self._lock:
+            site = self._sites.get(site_label)
+            if site is None:
+                if len(self._sites) >= MAX_SITES:
+                    # Make room by forgetting the least costly site
+                    del self._sites[min(self._sites, key=lambda key: self._sites[key]["seconds"])]
+                site = self._sites[site_label] = {"count": 0, "seconds": 0.0, "max_seconds": 0.0}
+            site["count"] += 1
+            site["blocked_in"] = _frame_label(stack[-1])
+            site["stack"] = [_frame_label(f) for f in stack[-25:]]
+            self._captured_site = site_label
+            self._captured_beat = beat
+
+    def lag_percentiles(self) -> Dict[str, float]:
+        # Call from the loop thread: the heartbeat appends to the samples
+        lags = sorted(self._lags)
+        if not lags:
+            return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+        def pick(q: float) -> float:
+            return round(lags[min(len(lags) - 1, int(q * len(lags)))] * 1000, 2)
+
+        return {"p50_ms": pick(0.5), "p99_ms": pick(0.99), "max_ms": round(lags[-1] * 1000, 2)}
+
+    def top_sites(self, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            sites = [{"site": label, **dict(site, seconds=round(site["seconds"], 3),
+                                             max_seconds=round(site["max_seconds"], 3))}
+                     for label, site in self._sites.items()]
+        sites.sort(key=lambda site: site["seconds"], reverse=True)
+        return sites[:limit]
+
+    def stats(self, limit: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            histogram = {(f"le_{bound:g}s" if bound != float("inf") else "le_inf"): count
+                         for bound, count in zip(STALL_BUCKETS, self.histogram)}
+            totals = {
+                "stalls": self.stalls,
+                "stall_seconds": round(self.stall_seconds, 3),
+                "max_stall_seconds": round(self.max_stall, 3),
+            }
+        return {
+            "running": self._task is not None,
+            "threshold_ms": self.threshold * 1000,
+            **totals,
+            "histogram": histogram,
+            "lag": self.lag_percentiles(),
+            "top_sites": self.top_sites(limit),
+        }
@@ -0,0 +1,178 @@
+"""
+Per-request profiling
+
+ProfilingMiddleware runs cProfile around a single request when an admin
+sends `X-Profile: 1`, or for a random `sample_rate` fraction of requests.
+Each profile is written to `backend/logs/profiles/` as a pstats file
+(`<id>.prof`, load it with `python -m pstats` or snakeviz) plus a JSON
+summary (`<id>.json`) with:
+
+- wall_ms: time from request start to the end of the response
+- cpu_ms: CPU time of the event loop thread over the same span
+- off_cpu_ms: the difference, i.e. time spent awaiting I/O or providers
+- overlapping: how many other requests were in flight meanwhile
+- top: the functions with the most cumulative time
+
+cProfile sees one thread, so work the request runs in a thread pool (sync
+routes, asyncio.to_thread) appears only as the time spent waiting for it.
+It also can't tell coroutines apart, so calls from overlapping requests on
+the same loop show up in the profile too. Only one request is profiled at a
+time, and others go through unprofiled. A profiled request gets an
+`X-Profile-Id` response header.
+
+Without the header and with sampling off, a request costs one header lookup.
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from . import fastjson
+
+PROFILE_DIR = Path(__file__).resolve().parent.parent / "logs" / "profiles"
+TOP_FUNCTIONS = 25
+_PROFILE_ID = re.compile(r"^[0-9a-z-]+$")
+
+
+def _function_label(func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-in
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def summarize(profile: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+    """The `limit` functions with the most cumulative time."""
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    rows = []
+    for func, (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": _function_label(func),
+            "calls": ncalls,
+            "self_ms": round(tottime * 1000, 3),
+            "cumulative_ms": round(cumtime * 1000, 3),
+        })
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:limit]
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, is_admin: Callable[[Headers], bool], sample_rate: float = 0.0,
+                 directory: Path = PROFILE_DIR, keep: int = 200):
+        self.app = app
+        self.is_admin = is_admin
+        self.sample_rate = sample_rate
+        self.directory = Path(directory)
+        self.keep = keep
+        self.in_flight = 0
+        self._busy = False
+        self._overlapping = 0
+
+    def _wanted(self, scope) -> bool:
+        headers = Headers(scope=scope)
+        if headers.get("x-profile") == "1":
+            return self.is_admin(headers)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        if self._busy:
+            self._overlapping += 1
+        try:
+            if self._busy or not self._wanted(scope):
+                await self.app(scope, receive, send)
+            else:
+                await self._profile(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def _profile(self, scope, receive, send):
+        self._busy = True
+        self._overlapping = self.in_flight - 1
+        now = time.time()
+        # Sorts by creation time (to the microsecond), which listing and pruning rely on
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        profile_id = f"{stamp}-{int(now * 1e6) % 1000000:06d}-{uuid.uuid4().hex[:4]}"
+        status = None
+
+        async def tagged_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(raw=list(message["headers"]))
+                headers["x-profile-id"] = profile_id
+                message = {**message, "headers": headers.raw}
+            await send(message)
+
+        profile = cProfile.Profile()
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        profile.enable()
+        try:
+            await self.app(scope, receive, tagged_send)
+        finally:
+            profile.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            self._busy = False
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status,
+                "created_at": time.time(),
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": round(cpu * 1000, 3),
+                "off_cpu_ms": round(max(0.0, wall - cpu) * 1000, 3),
+                "overlapping": self._overlapping,
+            }
+            try:
+                await asyncio.to_thread(self._save, profile, summary)
+            except Exception as e:
+                print(f"[Profile] Could not save profile {profile_id}: {e}")
+
+    def _save(self, profile: cProfile.Profile, summary: Dict[str, Any]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        summary["top"] = summarize(profile)
+        profile.dump_stats(str(self.directory / f"{summary['id']}.prof"))
+        (self.directory / f"{summary['id']}.json").write_bytes(fastjson.dumps(summary, indent=True))
+        print(f"[Profile] {summary['method']} {summary['path']}: wall {summary['wall_ms']:.1f} ms, "
+              f"cpu {summary['cpu_ms']:.1f} ms -> {summary['id']}")
+        for stale in sorted(self.directory.glob("*.json"))[:-self.keep]:
+            stale.unlink(missing_ok=True)
+            stale.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def list_profiles(directory: Path = PROFILE_DIR, limit: int = 50) -> List[Dict[str, Any]]:
+    """Stored profile summaries, newest first (without the per-function breakdown)."""
+    profiles = []
+    for path in sorted(Path(directory).glob("*.json"), reverse=True)[:limit]:
+        try:
+            summary = fastjson.loads(path.read_bytes())
+        except (OSError, ValueError):
+            continue
+        summary.pop("top", None)
+        profiles.append(summary)
+    return profiles
+
+
+def profile_path(profile_id: str, suffix: str, directory: Path = PROFILE_DIR) -> Optional[Path]:
+    """Path of a stored profile file, or None if the id is malformed or unknown."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = Path(directory) / f"{profile_id}{suffix}"
+    return path if path.exists() else None
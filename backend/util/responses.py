@@ -0,0 +1,20 @@
+"""
+JSON responses
+
+ORJSONResponse renders with fastjson, so routes returning a model go
+straight from pydantic-core to bytes. Kept apart from fastjson, which the
+logger imports everywhere, so only the app pays for importing FastAPI.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from . import fastjson
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with fastjson; models go straight from pydantic-core to bytes."""
+
+    def render(self, content: Any) -> bytes:
+        return fastjson.dumps(content)
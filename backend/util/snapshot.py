@@ -0,0 +1,163 @@
+"""
+Warm-restart snapshots
+
+With the in-memory cache backend, a deploy or a `reload=True` restart throws
+away every cached curriculum, verified video and resolved search. On graceful
+shutdown the app writes the live entries of every persisted TypedCache
+namespace to one compact file; the next process maps that file and restores
+entries lazily, the first time each key is asked for, so startup stays cheap
+however big the snapshot is.
+
+File layout (little-endian), version-checked on open:
+
+    header   magic "GVSNAP", version, written_at, entry count, meta length
+    meta     JSON (e.g. which LLM wrappers were warm)
+    index    per entry: key length, expires_at (wall clock), offset, length, key
+    payloads the cache's own encoded bytes (already compressed JSON)
+
+Expiry is stored as wall-clock time, since monotonic clocks don't survive a
+restart; entries that expired while the app was down are skipped, and the
+rest come back with only their remaining TTL. Values are re-validated by
+TypedCache when read, so entries from an older model version are just misses.
+The sqlite and redis backends outlive the process already and aren't
+snapshotted.
+"""
+
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from . import fastjson
+
+MAGIC = b"GVSNAP"
+VERSION = 1
+HEADER = struct.Struct("<6sHdII")  # magic, version, written_at, entry count, meta length
+ENTRY = struct.Struct("<HdQI")  # key length, expires_at, payload offset, payload length
+# Entries with less TTL than this left aren't worth writing out
+MIN_REMAINING_SECONDS = 5.0
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / "data" / "warm_snapshot.bin"
+
+SnapshotEntry = Tuple[str, float, bytes]  # key, expires_at (wall clock), payload
+
+
+def write_snapshot(path: Union[str, Path], entries: Iterable[SnapshotEntry], meta: Optional[Dict[str, Any]] = None) -> int:
+    """Write entries that still have time left; returns how many were written."""
+    path = Path(path)
+    cutoff = time.time() + MIN_REMAINING_SECONDS
+    entries = [(key.encode("utf-8"), expires_at, payload) for key, expires_at, payload in entries
+               if expires_at > cutoff]
+    meta_bytes = fastjson.dumps(meta or {})
+
+    offset = HEADER.size + len(meta_bytes) + sum(ENTRY.size + len(key) for key, _, _ in entries)
+    index = []
+    for key, expires_at, payload in entries:
+        index.append(ENTRY.pack(len(key), expires_at, offset, len(payload)) + key)
+        offset += len(payload)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per-process temp file: every worker writes its own snapshot on shutdown, the last one wins
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, time.time(), len(entries), len(meta_bytes)))
+        f.write(meta_bytes)
+        f.writelines(index)
+        f.writelines(payload for _, _, payload in entries)
+    tmp_path.replace(path)
+    return len(entries)
+
+
+class Snapshot:
+    """A memory-mapped snapshot file: the index is read up front, payloads only when popped."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._index: Dict[str, Tuple[float, int, int]] = {}
+        self._map: Optional[mmap.mmap] = None
+        self.meta: Dict[str, Any] = {}
+        self.written_at = 0.0
+        self.expired = 0
+        self.restored = 0
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self):
+        magic, version, self.written_at, count, meta_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} snapshot")
+        position = HEADER.size
+        self.meta = fastjson.loads(self._map[position:position + meta_length]) if meta_length else {}
+        position += meta_length
+        now = time.time()
+        for _ in range(count):
+            key_length, expires_at, offset, length = ENTRY.unpack_from(self._map, position)
+            position += ENTRY.size
+            key = self._map[position:position + key_length].decode("utf-8")
+            position += key_length
+            if offset + length > len(self._map):
+                raise ValueError("truncated snapshot")
+            if expires_at <= now:
+                self.expired += 1
+                continue
+            self._index[key] = (expires_at, offset, length)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def pop(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """Remaining TTL and payload for `key`, once; None if absent or expired by now."""
+        entry = self._index.pop(key, None)
+        if entry is None or self._map is None:
+            return None
+        expires_at, offset, length = entry
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            self.expired += 1
+            return None
+        self.restored += 1
+        return remaining, bytes(self._map[offset:offset + length])
+
+    def discard(self, key: str):
+        """Forget `key` (it was overwritten or deleted since the snapshot was taken)."""
+        self._index.pop(key, None)
+
+    def entries(self) -> List[SnapshotEntry]:
+        """Entries never asked for, so a new snapshot keeps them."""
+        if self._map is None:
+            return []
+        return [(key, expires_at, bytes(self._map[offset:offset + length]))
+                for key, (expires_at, offset, length) in self._index.items()]
+
+    def close(self):
+        self._index.clear()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "written_at": self.written_at,
+            "restored": self.restored,
+            "pending": len(self._index),
+            "expired": self.expired,
+        }
+
+
+def open_snapshot(path: Union[str, Path] = DEFAULT_SNAPSHOT_PATH) -> Optional[Snapshot]:
+    """The snapshot at `path`, or None if there is none or it can't be used."""
+    if not Path(path).exists():
+        return None
+    try:
+        return Snapshot(path)
+    except Exception as e:
+        print(f"[Snapshot] Ignoring unreadable snapshot {path}: {e}")
+        return None